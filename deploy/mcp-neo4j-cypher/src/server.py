@@ -12,7 +12,9 @@ from mcp.server.fastmcp import FastMCP, Context
 from dotenv import load_dotenv
 from typing import Any, Dict, List, Optional
 import re
-from neo4j import GraphDatabase
+import neo4j
+
+from driver import PoolConfig, create_driver, pool_stats, warm_up_sync
 
 # 加载.env文件
 load_dotenv()
@@ -50,17 +52,36 @@ def is_write_query(query: str) -> bool:
 
 class Neo4jDatabase:
     def __init__(self, neo4j_uri: str, neo4j_username: str, neo4j_password: str):
-        """初始化Neo4j数据库连接"""
+        """初始化Neo4j数据库连接, 连接池由NEO4J_*环境变量配置"""
         logger.debug(f"Initializing database connection to {neo4j_uri}")
-        d = GraphDatabase.driver(neo4j_uri, auth=(neo4j_username, neo4j_password))
+        pool = PoolConfig.from_env()
+        d = create_driver(neo4j_uri, (neo4j_username, neo4j_password), pool, sync=True)
         d.verify_connectivity()
+        # 预先建立连接, 避免首批工具调用承担握手延迟
+        warm_up_sync(d, pool.warm_connections)
         self.driver = d
+        # 按访问模式和集群成员统计的查询数
+        self.routing = {"read": 0, "write": 0}
+        self.servers: Dict[str, Dict[str, int]] = {}
+
+    def routing_stats(self) -> Dict[str, Any]:
+        return {"queries": dict(self.routing), "servers": {address: dict(counts) for address, counts in self.servers.items()}}
+
+    def _execute_query(self, query: str, params: Dict[str, Any] | None = None, read: bool = False) -> List[Dict[str, Any]]:
+        """执行Cypher查询并返回结果
 
-    def _execute_query(self, query: str, params: Dict[str, Any] | None = None) -> List[Dict[str, Any]]:
-        """执行Cypher查询并返回结果"""
+        读查询路由到follower和只读副本，驱动的bookmark保证能读到之前的写入。
+        """
         logger.debug(f"Executing query: {query}")
+        mode = "read" if read else "write"
         try:
-            result = self.driver.execute_query(query, params)
+            result = self.driver.execute_query(
+                query,
+                params,
+                routing_=neo4j.RoutingControl.READ if read else neo4j.RoutingControl.WRITE
+            )
+            self.routing[mode] += 1
+            self.servers.setdefault(str(result.summary.server.address), {"read": 0, "write": 0})[mode] += 1
             counters = vars(result.summary.counters)
             if is_write_query(query):
                 logger.debug(f"Write query affected {counters}")
@@ -99,7 +120,7 @@ async def read_neo4j_cypher(ctx: Context, query: str):
         return {"error": "Only MATCH queries are allowed for read-query"}
     
     try:
-        results = db._execute_query(query)
+        results = db._execute_query(query, read=True)
         return {"results": results}
     except Exception as e:
         logger.error(f"Error executing read query: {e}")
@@ -134,7 +155,8 @@ async def get_neo4j_schema(ctx: Context):
                 collect(case when type <> 'RELATIONSHIP' then [property, type + case when unique then " unique" else "" end + case when index then " indexed" else "" end] end) as attributes,
                 collect(case when type = 'RELATIONSHIP' then [property, head(other)] end) as relationships
             RETURN label, apoc.map.fromPairs(attributes) as attributes, apoc.map.fromPairs(relationships) as relationships
-            """
+            """,
+            read=True
         )
         return {"schema": results}
     except Exception as e:
@@ -151,7 +173,9 @@ def index():
     return {
         "status": "ok",
         "service": "mcp-neo4j-cypher",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "routing": db.routing_stats() if db is not None else None,
+        "pool": pool_stats(db.driver) if db is not None else None
     }
 
 # 挂载MCP服务器
@@ -0,0 +1,181 @@
+"""
+Neo4j driver factory shared by every entry point.
+
+This is the original: the cypher server and the deploy directories hold
+copies of it, which tests/test_driver.py keeps identical.
+
+Builds the async or blocking driver with connection pool settings taken from
+the environment and the command line, opens a number of connections up front
+so the first tool calls don't pay for the TCP, TLS and Bolt handshakes, and
+reports what the pool holds.
+
+Environment variables (command line flags override them):
+
+* ``NEO4J_MAX_CONNECTION_POOL_SIZE`` - connections per server (driver default 100)
+* ``NEO4J_CONNECTION_ACQUISITION_TIMEOUT`` - seconds to wait for a free connection (driver default 60)
+* ``NEO4J_MAX_CONNECTION_LIFETIME`` - seconds before a connection is replaced (driver default 3600)
+* ``NEO4J_KEEP_ALIVE`` - TCP keep-alive, ``true`` or ``false`` (driver default true)
+* ``NEO4J_WARM_CONNECTIONS`` - connections opened at startup (default 0)
+"""
+import os
+import asyncio
+import argparse
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import neo4j
+from neo4j import AsyncGraphDatabase, GraphDatabase
+from pydantic import BaseModel
+
+# Logs under the package that loaded the module (mcp_neo4j_memory, mcp_neo4j_cypher)
+logger = logging.getLogger(__name__)
+
+# PoolConfig field, environment variable
+POOL_SETTINGS = (
+    ("max_connection_pool_size", "NEO4J_MAX_CONNECTION_POOL_SIZE"),
+    ("connection_acquisition_timeout", "NEO4J_CONNECTION_ACQUISITION_TIMEOUT"),
+    ("max_connection_lifetime", "NEO4J_MAX_CONNECTION_LIFETIME"),
+    ("keep_alive", "NEO4J_KEEP_ALIVE"),
+    ("warm_connections", "NEO4J_WARM_CONNECTIONS"),
+)
+
+
+class PoolConfig(BaseModel):
+    """Connection pool settings; unset ones keep the driver defaults."""
+    max_connection_pool_size: Optional[int] = None
+    connection_acquisition_timeout: Optional[float] = None
+    max_connection_lifetime: Optional[float] = None
+    keep_alive: Optional[bool] = None
+    warm_connections: int = 0
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "PoolConfig":
+        environ = os.environ if environ is None else environ
+        values = {field: environ[variable] for field, variable in POOL_SETTINGS if environ.get(variable)}
+        return cls(**values)
+
+    @classmethod
+    def from_args(cls, args, environ: Optional[Mapping[str, str]] = None) -> "PoolConfig":
+        """The environment settings overridden by the flags of ``add_pool_arguments``."""
+        config = cls.from_env(environ)
+        overrides = {field: getattr(args, field) for field, _ in POOL_SETTINGS if getattr(args, field, None) is not None}
+        return config.model_copy(update=overrides)
+
+    def driver_options(self) -> Dict[str, Any]:
+        return self.model_dump(exclude={"warm_connections"}, exclude_none=True)
+
+
+def add_pool_arguments(parser):
+    """Add the connection pool flags to an ``argparse`` parser."""
+    parser.add_argument('--max-connection-pool-size',
+                       type=int,
+                       default=None,
+                       help='Maximum connections per Neo4j server (env NEO4J_MAX_CONNECTION_POOL_SIZE)')
+    parser.add_argument('--connection-acquisition-timeout',
+                       type=float,
+                       default=None,
+                       help='Seconds to wait for a free pooled connection (env NEO4J_CONNECTION_ACQUISITION_TIMEOUT)')
+    parser.add_argument('--max-connection-lifetime',
+                       type=float,
+                       default=None,
+                       help='Seconds before a pooled connection is replaced (env NEO4J_MAX_CONNECTION_LIFETIME)')
+    parser.add_argument('--keep-alive',
+                       action=argparse.BooleanOptionalAction,
+                       default=None,
+                       help='TCP keep-alive on pooled connections (env NEO4J_KEEP_ALIVE)')
+    parser.add_argument('--warm-connections',
+                       type=int,
+                       default=None,
+                       help='Connections opened at startup (env NEO4J_WARM_CONNECTIONS)')
+
+
+def create_driver(uri: str, auth: Tuple[str, str], pool: Optional[PoolConfig] = None, sync: bool = False):
+    """An ``AsyncDriver``, or a blocking ``Driver`` with ``sync``, configured with ``pool``."""
+    pool = pool or PoolConfig()
+    factory = GraphDatabase if sync else AsyncGraphDatabase
+    options = pool.driver_options()
+    logger.info(f"Creating {'blocking' if sync else 'async'} Neo4j driver for {uri} with pool settings {options or 'default'}")
+    return factory.driver(uri, auth=auth, **options)
+
+
+async def warm_up(driver: neo4j.AsyncDriver, connections: int):
+    """Open ``connections`` pooled connections by holding that many transactions at once."""
+    if connections <= 0:
+        return
+    ready = 0
+    all_ready = asyncio.Event()
+
+    async def hold():
+        nonlocal ready
+        async with driver.session() as session:
+            tx = None
+            try:
+                tx = await session.begin_transaction()
+                await (await tx.run("RETURN 1")).consume()
+                ready += 1
+                if ready == connections:
+                    all_ready.set()
+                await all_ready.wait()
+            except BaseException:
+                # Don't leave the other transactions waiting
+                all_ready.set()
+                raise
+            finally:
+                if tx is not None:
+                    await tx.close()
+
+    await asyncio.gather(*(hold() for _ in range(connections)))
+    logger.info(f"Warmed up {connections} Neo4j connections")
+
+
+def warm_up_sync(driver: neo4j.Driver, connections: int):
+    """``warm_up`` for a blocking driver, holding the transactions on threads."""
+    if connections <= 0:
+        return
+    barrier = threading.Barrier(connections)
+
+    def hold():
+        try:
+            with driver.session() as session:
+                with session.begin_transaction() as tx:
+                    tx.run("RETURN 1").consume()
+                    barrier.wait()
+        except BaseException:
+            barrier.abort()
+            raise
+
+    with ThreadPoolExecutor(max_workers=connections, thread_name_prefix="neo4j-warm-up") as executor:
+        for future in [executor.submit(hold) for _ in range(connections)]:
+            future.result()
+    logger.info(f"Warmed up {connections} Neo4j connections")
+
+
+def pool_stats(driver) -> Optional[Dict[str, Any]]:
+    """Open, in-use and idle connections per server, None if the driver doesn't expose its pool.
+
+    The driver has no public API for this, so it reads the pool's internals
+    (``driver._pool``) as laid out by the 5.x drivers, checked against 5.28.
+    Another layout returns None rather than failing the caller.
+    """
+    pool = getattr(driver, "_pool", None)
+    if pool is None:
+        return None
+    try:
+        config = pool.pool_config
+        servers = {}
+        for address, connections in list(pool.connections.items()):
+            connections = list(connections)
+            in_use = sum(1 for connection in connections if connection.in_use)
+            servers[str(address)] = {"open": len(connections), "inUse": in_use, "idle": len(connections) - in_use}
+        return {
+            "maxConnectionPoolSize": config.max_connection_pool_size,
+            "connectionAcquisitionTimeout": pool.workspace_config.connection_acquisition_timeout,
+            "maxConnectionLifetime": config.max_connection_lifetime,
+            "keepAlive": config.keep_alive,
+            "servers": servers
+        }
+    except (AttributeError, TypeError):
+        logger.debug("The Neo4j driver's pool has an unknown layout, no pool statistics")
+        return None
@@ -7,6 +7,10 @@ import sys
 import logging
 import uvicorn
 import json
+import asyncio
+import functools
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 from logging.handlers import RotatingFileHandler
 from fastapi import FastAPI
 from mcp.server.fastmcp import FastMCP, Context
@@ -15,7 +19,8 @@ from typing import Any, Dict, List, Optional
 from pydantic import BaseModel
 
 import neo4j
-from neo4j import GraphDatabase
+
+from driver import PoolConfig, create_driver, pool_stats, warm_up
 
 # 加载.env文件
 load_dotenv()
@@ -71,23 +76,69 @@ class ObservationDeletion(BaseModel):
     observations: List[str]
 
 class Neo4jMemory:
-    def __init__(self, neo4j_driver):
-        self.neo4j_driver = neo4j_driver
-        self.create_fulltext_index()
+    def __init__(self, neo4j_driver, executor: Optional[ThreadPoolExecutor] = None, max_workers: int = 8):
+        """Wrap a Neo4j driver.
 
-    def create_fulltext_index(self):
+        An ``AsyncDriver`` is awaited directly on the event loop. A synchronous
+        ``Driver`` is still accepted (e.g. for the Flask/WSGI entry points) and
+        its blocking calls are pushed onto a thread pool so that concurrent
+        tool calls keep overlapping.
+        """
+        self.neo4j_driver = neo4j_driver
+        self.is_async = isinstance(neo4j_driver, neo4j.AsyncDriver)
+        self._owns_executor = False
+        self._executor = executor
+        if not self.is_async and self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="neo4j-memory")
+            self._owns_executor = True
+        self._schema_ready = False
+        # 按访问模式和处理查询的集群成员统计查询次数
+        self.routing = {"read": 0, "write": 0}
+        self.servers: Dict[str, Dict[str, int]] = {}
+
+    def routing_stats(self) -> Dict[str, Any]:
+        return {"queries": dict(self.routing), "servers": {address: dict(counts) for address, counts in self.servers.items()}}
+
+    async def _run_query(self, query: str, params: Optional[Dict[str, Any]] = None, read: bool = False):
+        """读查询路由到follower和只读副本，驱动的bookmark保证能读到之前的写入。"""
+        routing = neo4j.RoutingControl.READ if read else neo4j.RoutingControl.WRITE
+        if self.is_async:
+            result = await self.neo4j_driver.execute_query(query, params, routing_=routing)
+        else:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._executor,
+                functools.partial(self.neo4j_driver.execute_query, query, params, routing_=routing)
+            )
+        mode = "read" if read else "write"
+        self.routing[mode] += 1
+        self.servers.setdefault(str(result.summary.server.address), {"read": 0, "write": 0})[mode] += 1
+        return result
+
+    async def _execute_query(self, query: str, params: Optional[Dict[str, Any]] = None, read: bool = False):
+        # Schema bootstrap is idempotent, so a race between concurrent first calls is harmless
+        if not self._schema_ready:
+            await self.create_fulltext_index()
+        return await self._run_query(query, params, read)
+
+    async def create_fulltext_index(self):
         try:
             # 创建全文搜索索引
             query = """
             CREATE FULLTEXT INDEX search IF NOT EXISTS FOR (m:Memory) ON EACH [m.name, m.type, m.observations];
             """
-            self.neo4j_driver.execute_query(query)
+            await self._run_query(query)
             logger.info("Created fulltext search index")
         except neo4j.exceptions.ClientError as e:
             if "An index with this name already exists" in str(e):
                 logger.info("Fulltext search index already exists")
             else:
                 raise e
+        self._schema_ready = True
+
+    async def close(self):
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
 
     async def load_graph(self, filter_query="*"):
         query = """
@@ -105,7 +156,8 @@ class Neo4jMemory:
             }) as relations
         """
         
-        result = self.neo4j_driver.execute_query(query, {"filter": filter_query})
+        # read_graph, search_nodes和find_nodes都经过这里, 路由到follower和只读副本
+        result = await self._execute_query(query, {"filter": filter_query}, read=True)
         
         if not result.records:
             return KnowledgeGraph(entities=[], relations=[])
@@ -146,7 +198,7 @@ class Neo4jMemory:
         """
         
         entities_data = [entity.model_dump() for entity in entities]
-        self.neo4j_driver.execute_query(query, {"entities": entities_data})
+        await self._execute_query(query, {"entities": entities_data})
         return entities
 
     async def create_relations(self, relations: List[Relation]) -> List[Relation]:
@@ -159,7 +211,7 @@ class Neo4jMemory:
             MERGE (from)-[r:$(relation.relationType)]->(to)
             """
             
-            self.neo4j_driver.execute_query(
+            await self._execute_query(
                 query, 
                 {"relations": [relation.model_dump() for relation in relations]}
             )
@@ -175,7 +227,7 @@ class Neo4jMemory:
         RETURN e.name as name, new
         """
             
-        result = self.neo4j_driver.execute_query(
+        result = await self._execute_query(
             query, 
             {"observations": [obs.model_dump() for obs in observations]}
         )
@@ -190,7 +242,7 @@ class Neo4jMemory:
         DETACH DELETE e
         """
         
-        self.neo4j_driver.execute_query(query, {"entities": entity_names})
+        await self._execute_query(query, {"entities": entity_names})
 
     async def delete_observations(self, deletions: List[ObservationDeletion]) -> None:
         query = """
@@ -198,7 +250,7 @@ class Neo4jMemory:
         MATCH (e:Memory { name: d.entityName })
         SET e.observations = [o in coalesce(e.observations,[]) WHERE NOT o IN d.observations]
         """
-        self.neo4j_driver.execute_query(
+        await self._execute_query(
             query, 
             {
                 "deletions": [deletion.model_dump() for deletion in deletions]
@@ -213,7 +265,7 @@ class Neo4jMemory:
         AND target.name = relation.target
         DELETE r
         """
-        self.neo4j_driver.execute_query(
+        await self._execute_query(
             query, 
             {"relations": [relation.model_dump() for relation in relations]}
         )
@@ -227,26 +279,10 @@ class Neo4jMemory:
     async def find_nodes(self, names: List[str]) -> KnowledgeGraph:
         return await self.load_graph("name: (" + " ".join(names) + ")")
 
-# 初始化Neo4j数据库连接
-try:
-    logger.info(f"Connecting to Neo4j at {NEO4J_URI}")
-    neo4j_driver = GraphDatabase.driver(
-        NEO4J_URI,
-        auth=(NEO4J_USER, NEO4J_PASSWORD)
-    )
-    neo4j_driver.verify_connectivity()
-    logger.info(f"Connected to Neo4j at {NEO4J_URI}")
-    
-    # 初始化内存
-    memory = Neo4jMemory(neo4j_driver)
-except Exception as e:
-    logger.error(f"Failed to connect to Neo4j: {e}")
-    if not DEBUG:
-        sys.exit(1)
-    else:
-        logger.warning("Using mock database for local development")
-        neo4j_driver = None
-        memory = None
+# Neo4j数据库连接与内存在应用启动时创建 (见lifespan), 连接池由NEO4J_*环境变量配置
+POOL = PoolConfig.from_env()
+neo4j_driver = None
+memory: Optional[Neo4jMemory] = None
 
 # 创建FastMCP实例
 mcp = FastMCP("neo4j-memory")
@@ -365,8 +401,37 @@ async def find_nodes_tool(ctx: Context, names: List[str]):
         logger.error(f"Error finding nodes: {e}")
         return {"error": str(e)}
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """创建并验证Neo4j连接, 应用关闭时释放"""
+    global neo4j_driver, memory
+    logger.info(f"Connecting to Neo4j at {NEO4J_URI}")
+    neo4j_driver = create_driver(NEO4J_URI, (NEO4J_USER, NEO4J_PASSWORD), POOL)
+    try:
+        await neo4j_driver.verify_connectivity()
+        logger.info(f"Connected to Neo4j at {NEO4J_URI}")
+        # 预先建立连接, 避免首批工具调用承担握手延迟
+        await warm_up(neo4j_driver, POOL.warm_connections)
+        memory = Neo4jMemory(neo4j_driver)
+    except Exception as e:
+        logger.error(f"Failed to connect to Neo4j: {e}")
+        await neo4j_driver.close()
+        neo4j_driver = None
+        if not DEBUG:
+            raise
+        logger.warning("Using mock database for local development")
+    try:
+        yield
+    finally:
+        if memory is not None:
+            await memory.close()
+            memory = None
+        if neo4j_driver is not None:
+            await neo4j_driver.close()
+            neo4j_driver = None
+
 # 创建FastAPI应用
-app = FastAPI(title="Neo4j Memory MCP Server")
+app = FastAPI(title="Neo4j Memory MCP Server", lifespan=lifespan)
 
 # 主页路由
 @app.get("/")
@@ -375,7 +440,9 @@ def index():
     return {
         "status": "ok",
         "service": "mcp-neo4j-memory",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "routing": memory.routing_stats() if memory is not None else None,
+        "pool": pool_stats(neo4j_driver) if neo4j_driver is not None else None
     }
 
 # 挂载MCP服务器
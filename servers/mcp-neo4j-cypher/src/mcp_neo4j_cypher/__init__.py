@@ -1,4 +1,5 @@
 from . import server
+from . import driver
 import asyncio
 import argparse
 import os
@@ -16,10 +17,11 @@ def main():
     parser.add_argument('--password', 
                        default="password",
                        help='Neo4j password')
+    driver.add_pool_arguments(parser)
     
     args = parser.parse_args()
-    asyncio.run(server.main(args.db_url, args.username, args.password))
+    asyncio.run(server.main(args.db_url, args.username, args.password, pool=driver.PoolConfig.from_args(args)))
 
 
 # Optionally expose other important items at package level
-__all__ = ["main", "server"]
+__all__ = ["main", "server", "driver"]
@@ -1,4 +1,6 @@
 import neo4j
+import asyncio
+import functools
 import logging
 from logging.handlers import RotatingFileHandler
 from contextlib import closing
@@ -8,12 +10,13 @@ import mcp.types as types
 from mcp.server import NotificationOptions, Server
 import mcp.server.stdio
 from pydantic import AnyUrl
-from typing import Any, Dict, List
-from neo4j import GraphDatabase
+from typing import Any, Dict, List, Optional
 import re
 import os
 from flask import Flask, request, jsonify
 
+from .driver import PoolConfig, create_driver, pool_stats, warm_up_sync
+
 logger = logging.getLogger('mcp_neo4j_cypher')
 logger.setLevel(logging.INFO)
 logger.info("Starting MCP neo4j Server")
@@ -22,18 +25,55 @@ def is_write_query(query: str) -> bool:
     return re.search(r"\b(MERGE|CREATE|SET|DELETE|REMOVE|ADD)\b", query, re.IGNORECASE) is not None
 
 class neo4jDatabase:
-    def __init__(self, neo4j_uri: str, neo4j_username: str, neo4j_password: str):
-        """Initialize connection to the neo4j database"""
+    def __init__(
+        self,
+        neo4j_uri: str,
+        neo4j_username: str,
+        neo4j_password: str,
+        driver: neo4j.Driver | None = None,
+        pool: Optional[PoolConfig] = None
+    ):
+        """Initialize connection to the neo4j database
+
+        The driver's pool is configured by ``pool``, by default from the NEO4J_*
+        environment variables, and warmed up. A ``driver`` built elsewhere is
+        used as it is instead.
+        """
         logger.debug(f"Initializing database connection to {neo4j_uri}")
-        d = GraphDatabase.driver(neo4j_uri, auth=(neo4j_username, neo4j_password))
-        d.verify_connectivity()
-        self.driver = d
+        if driver is None:
+            pool = pool or PoolConfig.from_env()
+            driver = create_driver(neo4j_uri, (neo4j_username, neo4j_password), pool, sync=True)
+            driver.verify_connectivity()
+            warm_up_sync(driver, pool.warm_connections)
+        else:
+            driver.verify_connectivity()
+        self.driver = driver
+        # Queries per access mode, overall and per cluster member that served them
+        self.routing = {"read": 0, "write": 0}
+        self.servers: Dict[str, Dict[str, int]] = {}
+
+    def routing_stats(self) -> Dict[str, Any]:
+        return {"queries": dict(self.routing), "servers": {address: dict(counts) for address, counts in self.servers.items()}}
+
+    def pool_stats(self) -> Dict[str, Any] | None:
+        return pool_stats(self.driver)
+
+    def _execute_query(self, query: str, params: Dict[str, Any] | None = None, read: bool = False) -> List[Dict[str, Any]]:
+        """Execute a Cypher query and return results as a list of dictionaries
 
-    def _execute_query(self, query: str, params: Dict[str, Any] | None = None) -> List[Dict[str, Any]]:
-        """Execute a Cypher query and return results as a list of dictionaries"""
+        Read queries are routed to followers and read replicas; the driver's
+        bookmarks make them wait for the writes this server made before.
+        """
         logger.debug(f"Executing query: {query}")
+        mode = "read" if read else "write"
         try:
-            result = self.driver.execute_query(query, params)
+            result = self.driver.execute_query(
+                query,
+                params,
+                routing_=neo4j.RoutingControl.READ if read else neo4j.RoutingControl.WRITE
+            )
+            self.routing[mode] += 1
+            self.servers.setdefault(str(result.summary.server.address), {"read": 0, "write": 0})[mode] += 1
             counters = vars(result.summary.counters)
             if is_write_query(query):
                 logger.debug(f"Write query affected {counters}")
@@ -50,6 +90,17 @@ class neo4jDatabase:
 app = Flask(__name__)
 server = Server("neo4j-manager")
 
+# Health check with the routing of the queries so far
+@app.route("/", methods=["GET"])
+def health_check():
+    """Health check endpoint"""
+    return jsonify({
+        "status": "ok",
+        "service": "mcp-neo4j-cypher",
+        "routing": db.routing_stats() if db is not None else None,
+        "pool": db.pool_stats() if db is not None else None
+    })
+
 # Register handlers
 @server.list_tools()
 async def handle_list_tools() -> List[types.Tool]:
@@ -102,14 +153,15 @@ with label,
     collect(case when type <> 'RELATIONSHIP' then [property, type + case when unique then " unique" else "" end + case when index then " indexed" else "" end] end) as attributes,
     collect(case when type = 'RELATIONSHIP' then [property, head(other)] end) as relationships
 RETURN label, apoc.map.fromPairs(attributes) as attributes, apoc.map.fromPairs(relationships) as relationships
-                    """
+                    """,
+                read=True
             )
             return [types.TextContent(type="text", text=str(results))]
 
         elif name == "read-neo4j-cypher":
             if is_write_query(arguments["query"]):
                 raise ValueError("Only MATCH queries are allowed for read-query")
-            results = db._execute_query(arguments["query"])
+            results = db._execute_query(arguments["query"], read=True)
             return [types.TextContent(type="text", text=str(results))]
 
         elif name == "write-neo4j-cypher":
@@ -150,15 +202,21 @@ async def mcp_endpoint():
 db = None
 
 # Main function to be called from __init__.py
-async def main(neo4j_uri, neo4j_username, neo4j_password):
-    """Main entry point for the server."""
+async def main(neo4j_uri, neo4j_username, neo4j_password, pool: Optional[PoolConfig] = None):
+    """Main entry point for the server.
+
+    ``pool`` defaults to the pool settings of the NEO4J_* environment variables.
+    """
     global db
     
     logger.info(f"Starting Neo4j Cypher MCP Server with URI: {neo4j_uri}")
     
-    # Connect to Neo4j
+    # Connect to Neo4j; connecting and warming up the pool block, so they run off the event loop
     try:
-        db = neo4jDatabase(neo4j_uri, neo4j_username, neo4j_password)
+        db = await asyncio.get_running_loop().run_in_executor(
+            None,
+            functools.partial(neo4jDatabase, neo4j_uri, neo4j_username, neo4j_password, pool=pool)
+        )
         logger.info(f"Connected to Neo4j at {neo4j_uri}")
     except Exception as e:
         logger.error(f"Failed to connect to Neo4j: {e}")
@@ -0,0 +1,86 @@
+"""
+Concurrency benchmark for Neo4jMemory.
+
+Seeds a small memory graph and runs N parallel clients issuing tool calls,
+reporting throughput per concurrency level for the async driver and for the
+thread-pool fallback around the sync driver.
+
+    NEO4J_URI=neo4j://localhost:7687 python benchmarks/bench_concurrency.py --entities 1000
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+from neo4j import AsyncGraphDatabase, GraphDatabase
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from mcp_neo4j_memory.server import Neo4jMemory, Entity, Relation
+
+
+async def seed(memory: Neo4jMemory, entities: int):
+    await memory.create_entities([
+        Entity(name=f"bench-{i}", type="Bench", observations=[f"benchmark observation {i}"])
+        for i in range(entities)
+    ])
+    await memory.create_relations([
+        Relation(source=f"bench-{i}", target=f"bench-{(i + 1) % entities}", relationType="NEXT")
+        for i in range(entities)
+    ])
+
+
+async def run_clients(memory: Neo4jMemory, clients: int, calls: int, entities: int) -> float:
+    async def client(offset: int):
+        for i in range(calls):
+            await memory.find_nodes([f"bench-{(offset * calls + i) % entities}"])
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client(c) for c in range(clients)])
+    return time.perf_counter() - start
+
+
+async def bench(memory: Neo4jMemory, label: str, levels, calls: int, entities: int):
+    # Warm up the connection pool and query plans
+    await run_clients(memory, max(levels), 1, entities)
+
+    print(f"\n{label}")
+    print(f"{'clients':>8} {'calls':>8} {'seconds':>10} {'calls/s':>10}")
+    for clients in levels:
+        elapsed = await run_clients(memory, clients, calls, entities)
+        total = clients * calls
+        print(f"{clients:>8} {total:>8} {elapsed:>10.3f} {total / elapsed:>10.1f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Neo4jMemory concurrency benchmark")
+    parser.add_argument("--entities", type=int, default=1000)
+    parser.add_argument("--calls", type=int, default=50, help="Tool calls per client")
+    parser.add_argument("--levels", default="1,2,4,8,16,32", help="Comma separated client counts")
+    args = parser.parse_args()
+
+    uri = os.environ.get("NEO4J_URI", "neo4j://localhost:7687")
+    auth = (os.environ.get("NEO4J_USERNAME", "neo4j"), os.environ.get("NEO4J_PASSWORD", "password"))
+    levels = [int(level) for level in args.levels.split(",")]
+
+    async_driver = AsyncGraphDatabase.driver(uri, auth=auth)
+    sync_driver = GraphDatabase.driver(uri, auth=auth)
+    try:
+        async_memory = Neo4jMemory(async_driver)
+        await async_driver.execute_query("MATCH (n:Bench) DETACH DELETE n")
+        await seed(async_memory, args.entities)
+
+        await bench(async_memory, "async driver", levels, args.calls, args.entities)
+
+        threaded_memory = Neo4jMemory(sync_driver, max_workers=max(levels))
+        await bench(threaded_memory, "sync driver on thread pool", levels, args.calls, args.entities)
+        await threaded_memory.close()
+    finally:
+        await async_driver.execute_query("MATCH (n:Bench) DETACH DELETE n")
+        await async_driver.close()
+        sync_driver.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""
+Encoding benchmark for tool results.
+
+Builds a synthetic read_graph result in memory and reports encode time and
+payload size for every installed encoder, with and without indentation, in
+the row and columnar formats. No database is needed.
+
+    python benchmarks/bench_encoding.py --entities 20000 --degree 3
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from mcp_neo4j_memory.encoding import ResultEncoder, to_columnar
+from mcp_neo4j_memory.server import Entity, KnowledgeGraph, Relation
+
+
+def synthetic_graph(entities: int, degree: int, observations: int) -> KnowledgeGraph:
+    return KnowledgeGraph(
+        entities=[
+            Entity(
+                name=f"entity-{i}",
+                type=f"Type{i % 10}",
+                observations=[f"observation {j} about entity {i}" for j in range(observations)]
+            )
+            for i in range(entities)
+        ],
+        relations=[
+            Relation(source=f"entity-{i}", target=f"entity-{(i * 7 + d + 1) % entities}", relationType=f"REL_{d}")
+            for i in range(entities)
+            for d in range(degree)
+        ]
+    )
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tool result encoding benchmark")
+    parser.add_argument("--entities", type=int, default=20000)
+    parser.add_argument("--degree", type=int, default=3, help="Outgoing relations per entity")
+    parser.add_argument("--observations", type=int, default=3, help="Observations per entity")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    graph = synthetic_graph(args.entities, args.degree, args.observations).model_dump()
+    payloads = {"rows": graph, "columnar": to_columnar(graph)}
+
+    print(f"{'encoder':>8} {'compact':>8} {'format':>9} {'ms':>10} {'bytes':>12}")
+    for backend in ("json", "orjson", "msgspec"):
+        for compact in (False, True):
+            try:
+                encoder = ResultEncoder(backend, compact)
+            except ImportError:
+                continue
+            for fmt, payload in payloads.items():
+                elapsed = best_of(args.repeat, lambda: encoder.encode(payload))
+                size = len(encoder.encode(payload).encode("utf-8"))
+                print(f"{backend:>8} {str(compact):>8} {fmt:>9} {elapsed * 1000:>10.1f} {size:>12}")
+
+    # Columnar conversion is paid on top of encoding
+    elapsed = best_of(args.repeat, lambda: to_columnar(graph))
+    print(f"\nto_columnar: {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
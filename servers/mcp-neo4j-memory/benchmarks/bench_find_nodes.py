@@ -0,0 +1,75 @@
+"""
+find_nodes benchmark: fulltext Lucene lookup versus exact name lookup.
+
+Seeds graphs of increasing size and times looking up a batch of names
+through the fulltext index (the former find_nodes path) and through the
+Memory.name uniqueness constraint with UNWIND $names.
+
+    NEO4J_URI=neo4j://localhost:7687 python benchmarks/bench_find_nodes.py --sizes 10000,100000
+"""
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+
+from neo4j import AsyncGraphDatabase
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from mcp_neo4j_memory.server import Neo4jMemory, Entity
+
+
+async def seed(memory: Neo4jMemory, start: int, end: int, batch: int = 10000):
+    for offset in range(start, end, batch):
+        await memory.create_entities([
+            Entity(name=f"bench person {i}", type="Bench", observations=[f"benchmark observation {i}"])
+            for i in range(offset, min(offset + batch, end))
+        ])
+
+
+async def timed(lookup, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await lookup()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="find_nodes lookup benchmark")
+    parser.add_argument("--sizes", default="10000,100000", help="Comma separated graph sizes")
+    parser.add_argument("--names", type=int, default=20, help="Names per lookup")
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    uri = os.environ.get("NEO4J_URI", "neo4j://localhost:7687")
+    auth = (os.environ.get("NEO4J_USERNAME", "neo4j"), os.environ.get("NEO4J_PASSWORD", "password"))
+
+    driver = AsyncGraphDatabase.driver(uri, auth=auth)
+    memory = Neo4jMemory(driver)
+    try:
+        await driver.execute_query("MATCH (n:Bench) DETACH DELETE n")
+        print(f"{'nodes':>8} {'fulltext ms':>12} {'exact ms':>10} {'fulltext hits':>14} {'exact hits':>11}")
+
+        seeded = 0
+        for size in [int(size) for size in args.sizes.split(",")]:
+            await seed(memory, seeded, size)
+            seeded = size
+
+            names = [f"bench person {i}" for i in random.sample(range(size), args.names)]
+            fulltext = lambda: memory.load_graph("name: (" + " ".join(names) + ")")
+            exact = lambda: memory.load_graph(names=names)
+
+            fulltext_hits = len((await fulltext()).entities)
+            exact_hits = len((await exact()).entities)
+            fulltext_ms = await timed(fulltext, args.rounds)
+            exact_ms = await timed(exact, args.rounds)
+            print(f"{size:>8} {fulltext_ms:>12.2f} {exact_ms:>10.2f} {fulltext_hits:>14} {exact_hits:>11}")
+    finally:
+        await driver.execute_query("MATCH (n:Bench) DETACH DELETE n")
+        await driver.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+"""
+Observation append and delete benchmark.
+
+Grows the observation list of a single entity and times appending and
+deleting a small batch at increasing observation counts, for list-property
+storage, for Observation node storage, and for the former list-property
+queries that test every observation with ``IN`` against the whole list
+(``list scan``), which are quadratic in the list size.
+
+    NEO4J_URI=neo4j://localhost:7687 python benchmarks/bench_observations.py --counts 1000,5000,10000
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+from neo4j import AsyncGraphDatabase
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from mcp_neo4j_memory.server import Neo4jMemory, Entity, ObservationAddition, ObservationDeletion
+
+ENTITY = "bench observations"
+
+LIST_SCAN_ADD = """
+UNWIND $observations as obs
+MATCH (e:Memory { name: obs.entityName })
+WITH e, [o in obs.contents WHERE NOT o IN e.observations] as new
+SET e.observations = coalesce(e.observations,[]) + new
+RETURN e.name as name, new
+"""
+
+LIST_SCAN_DELETE = """
+UNWIND $deletions as d
+MATCH (e:Memory { name: d.entityName })
+SET e.observations = [o in coalesce(e.observations,[]) WHERE NOT o IN d.observations]
+"""
+
+
+class ListScanMemory:
+    """The former list-property queries, as a baseline."""
+
+    observation_storage = "list scan"
+
+    def __init__(self, memory: Neo4jMemory):
+        self.memory = memory
+
+    async def create_entities(self, entities):
+        return await self.memory.create_entities(entities)
+
+    async def add_observations(self, observations):
+        await self.memory.neo4j_driver.execute_query(LIST_SCAN_ADD, {"observations": [o.model_dump() for o in observations]})
+
+    async def delete_observations(self, deletions):
+        await self.memory.neo4j_driver.execute_query(LIST_SCAN_DELETE, {"deletions": [d.model_dump() for d in deletions]})
+
+
+def contents(start: int, end: int):
+    return [f"observation {i} about the benchmark entity" for i in range(start, end)]
+
+
+async def grow(memory, start: int, end: int, batch: int = 1000):
+    for offset in range(start, end, batch):
+        await memory.add_observations([ObservationAddition(entityName=ENTITY, contents=contents(offset, min(offset + batch, end)))])
+
+
+async def bench(memory, counts, rounds: int, batch: int):
+    await memory.create_entities([Entity(name=ENTITY, type="Bench", observations=[])])
+    grown = 0
+    for count in counts:
+        await grow(memory, grown, count)
+        grown = count
+
+        append = 0.0
+        delete = 0.0
+        for round_no in range(rounds):
+            # Every round appends new observations that are deleted again, so the list keeps its size
+            batch_contents = [f"appended {count} {round_no} {i}" for i in range(batch)]
+            start = time.perf_counter()
+            await memory.add_observations([ObservationAddition(entityName=ENTITY, contents=batch_contents)])
+            append += time.perf_counter() - start
+            start = time.perf_counter()
+            await memory.delete_observations([ObservationDeletion(entityName=ENTITY, observations=batch_contents)])
+            delete += time.perf_counter() - start
+        print(f"{memory.observation_storage:>10} {count:>8} {append / rounds * 1000:>12.2f} {delete / rounds * 1000:>12.2f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Observation append and delete benchmark")
+    parser.add_argument("--counts", default="1000,2000,5000,10000", help="Comma separated observation counts")
+    parser.add_argument("--rounds", type=int, default=20, help="Timed appends and deletes per count")
+    parser.add_argument("--batch", type=int, default=50, help="Observations per append and delete")
+    args = parser.parse_args()
+
+    uri = os.environ.get("NEO4J_URI", "neo4j://localhost:7687")
+    auth = (os.environ.get("NEO4J_USERNAME", "neo4j"), os.environ.get("NEO4J_PASSWORD", "password"))
+    counts = [int(count) for count in args.counts.split(",")]
+
+    driver = AsyncGraphDatabase.driver(uri, auth=auth)
+    cleanup = "MATCH (n:Bench) OPTIONAL MATCH (n)-[:HAS_OBSERVATION]->(o) DETACH DELETE n, o"
+    try:
+        print(f"{'storage':>10} {'count':>8} {'append ms':>12} {'delete ms':>12}")
+        memories = [
+            ListScanMemory(Neo4jMemory(driver)),
+            Neo4jMemory(driver, observation_storage="property"),
+            Neo4jMemory(driver, observation_storage="node")
+        ]
+        for memory in memories:
+            await driver.execute_query(cleanup)
+            await bench(memory, counts, args.rounds, args.batch)
+    finally:
+        await driver.execute_query(cleanup)
+        await driver.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
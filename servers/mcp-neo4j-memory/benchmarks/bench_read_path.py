@@ -0,0 +1,78 @@
+"""
+Per-entity overhead of turning database rows into a tool result.
+
+Compares the validated path (``Entity(...)`` per row, then ``model_dump``)
+with the trusted path used for reads (``_trusted`` construction, then
+``dump_result``), each followed by JSON encoding. No database is needed.
+
+    python benchmarks/bench_read_path.py --entities 20000 --degree 3
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from mcp_neo4j_memory.encoding import ResultEncoder
+from mcp_neo4j_memory.server import Entity, KnowledgeGraph, Relation, _trusted, dump_result
+
+
+def rows(entities: int, degree: int, observations: int):
+    return [
+        {
+            "name": f"entity-{i}",
+            "type": f"Type{i % 10}",
+            "observations": [f"observation {j} about entity {i}" for j in range(observations)],
+            "relations": [
+                {"source": f"entity-{i}", "target": f"entity-{(i * 7 + d + 1) % entities}", "relationType": f"REL_{d}"}
+                for d in range(degree)
+            ]
+        }
+        for i in range(entities)
+    ]
+
+
+def validated(records):
+    entities = [Entity(name=r["name"], type=r["type"], observations=r["observations"]) for r in records]
+    relations = [Relation(**rel) for r in records for rel in r["relations"]]
+    return KnowledgeGraph(entities=entities, relations=relations).model_dump()
+
+
+def trusted(records):
+    entities = [_trusted(Entity, name=r["name"], type=r["type"], observations=r["observations"]) for r in records]
+    relations = [_trusted(Relation, **rel) for r in records for rel in r["relations"]]
+    return dump_result(_trusted(KnowledgeGraph, entities=entities, relations=relations, nextCursor=None, truncated=None))
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read result construction benchmark")
+    parser.add_argument("--entities", type=int, default=20000)
+    parser.add_argument("--degree", type=int, default=3, help="Relations per entity")
+    parser.add_argument("--observations", type=int, default=3, help="Observations per entity")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--encoder", default="auto")
+    args = parser.parse_args()
+
+    records = rows(args.entities, args.degree, args.observations)
+    encoder = ResultEncoder(args.encoder, compact=True)
+    assert validated(records) == trusted(records)
+
+    print(f"{'path':>10} {'build+dump us/entity':>22} {'with encode us/entity':>22}")
+    for label, build in (("validated", validated), ("trusted", trusted)):
+        built = best_of(args.repeat, lambda: build(records))
+        encoded = best_of(args.repeat, lambda: encoder.encode(build(records)))
+        print(f"{label:>10} {built / args.entities * 1e6:>22.2f} {encoded / args.entities * 1e6:>22.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+End-to-end benchmark of every MCP tool.
+
+Seeds a synthetic graph of configurable size and degree, then times each
+tool through ``handle_call_tool``, so argument validation, the backend and
+result encoding are all measured. Runs against Neo4j (``NEO4J_URI``,
+``NEO4J_USERNAME``, ``NEO4J_PASSWORD``) or the in-memory backend, and writes
+JSON results that a later run can be compared against.
+
+    python benchmarks/bench_tools.py --backend memory --entities 10000 --degree 3 --output before.json
+    python benchmarks/bench_tools.py --backend memory --entities 10000 --degree 3 --compare before.json
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from mcp_neo4j_memory import server
+from mcp_neo4j_memory.embedding import HashingEmbedder
+from mcp_neo4j_memory.encoding import ResultEncoder
+from mcp_neo4j_memory.inmemory import InMemoryGraphMemory
+from mcp_neo4j_memory.server import Entity, Neo4jMemory, Relation
+
+PREFIX = "bench-"
+WORDS = ["coffee", "tea", "chess", "anvil", "river", "violin", "garden", "rocket", "harbor", "lantern"]
+
+
+def name(i: int) -> str:
+    return f"{PREFIX}{i}"
+
+
+def synthetic_entities(entities: int, observations: int) -> List[Entity]:
+    return [
+        Entity(
+            name=name(i),
+            type=f"Type{i % 10}",
+            observations=[f"{WORDS[(i + j) % len(WORDS)]} observation {j} about entity {i}" for j in range(observations)]
+        )
+        for i in range(entities)
+    ]
+
+
+def synthetic_relations(entities: int, degree: int) -> List[Relation]:
+    return [
+        Relation(source=name(i), target=name((i * 7 + d + 1) % entities), relationType=f"REL_{d % 3}")
+        for i in range(entities)
+        for d in range(degree)
+    ]
+
+
+async def seed(memory, args):
+    chunk = 1000
+    graph = synthetic_entities(args.entities, args.observations)
+    for start in range(0, len(graph), chunk):
+        await memory.create_entities(graph[start:start + chunk])
+    relations = synthetic_relations(args.entities, args.degree)
+    for start in range(0, len(relations), chunk):
+        await memory.write_relations(relations[start:start + chunk])
+
+
+def tool_calls(args, workdir: str, version: int) -> Dict[str, Callable[[int], Dict[str, Any]]]:
+    """Arguments of the i-th call of each tool, in the order the tools are run.
+
+    Write tools work on their own ``bench-new-*`` entities so every call
+    does the same amount of work and the seeded graph is left as it was.
+    """
+    n = args.entities
+
+    def new(i: int) -> str:
+        return f"{PREFIX}new-{i}"
+
+    import_path = os.path.join(workdir, "import.ndjson")
+    with open(import_path, "w", encoding="utf-8") as f:
+        for i in range(100):
+            f.write(json.dumps({"type": "entity", "name": f"{PREFIX}import-{i}", "entityType": "Imported", "observations": [f"imported {i}"]}) + "\n")
+
+    calls = {
+        "create_entities": lambda i: {"entities": [
+            {"name": new(i), "type": "New", "observations": [f"{WORDS[i % len(WORDS)]} new observation {i}"]}
+        ]},
+        "create_relations": lambda i: {"relations": [
+            {"source": new(i), "target": name(i % n), "relationType": "MENTIONS"}
+        ]},
+        "add_observations": lambda i: {"observations": [
+            {"entityName": name(i % n), "contents": [f"extra observation {i}"]}
+        ]},
+        "delete_observations": lambda i: {"deletions": [
+            {"entityName": name(i % n), "observations": [f"extra observation {i}"]}
+        ]},
+        "read_graph": lambda i: {"limit": args.page_size},
+        "search_nodes": lambda i: {"query": WORDS[i % len(WORDS)], "topK": args.page_size},
+        "find_nodes": lambda i: {"names": [name((i * 13 + k) % n) for k in range(10)]},
+        "expand_nodes": lambda i: {"names": [name(i % n)], "maxDepth": 2},
+        "read_changes_since": lambda i: {"version": version},
+        "export_graph": lambda i: {"path": os.path.join(workdir, "export.ndjson")},
+        "import_graph": lambda i: {"path": import_path, "resume": False},
+        "delete_relations": lambda i: {"relations": [
+            {"source": new(i), "target": name(i % n), "relationType": "MENTIONS"}
+        ]},
+        "delete_entities": lambda i: {"entityNames": [new(i)]},
+    }
+    if args.embedder:
+        calls["semantic_search"] = lambda i: {"query": f"{WORDS[i % len(WORDS)]} observation", "topK": 10}
+    return calls
+
+
+def summarize(tool: str, timings: List[float], errors: int) -> Dict[str, Any]:
+    timings = sorted(timings)
+
+    def percentile(p: float) -> float:
+        return timings[min(len(timings) - 1, int(p * len(timings)))] * 1000
+
+    return {
+        "tool": tool,
+        "calls": len(timings),
+        "errors": errors,
+        "mean_ms": sum(timings) / len(timings) * 1000,
+        "min_ms": timings[0] * 1000,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": timings[-1] * 1000,
+        "calls_per_s": len(timings) / sum(timings) if sum(timings) else None
+    }
+
+
+async def bench(args) -> List[Dict[str, Any]]:
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        version = (await server.memory.read_changes_since(0)).version
+        for tool, arguments in tool_calls(args, workdir, version).items():
+            if args.tools and tool not in args.tools:
+                continue
+            iterations = args.heavy_iterations if tool in ("export_graph", "import_graph") else args.iterations
+            for i in range(args.warmup):
+                await server.handle_call_tool(tool, arguments(iterations + i))
+            timings = []
+            errors = 0
+            for i in range(iterations):
+                call = arguments(i)
+                start = time.perf_counter()
+                [content] = await server.handle_call_tool(tool, call)
+                timings.append(time.perf_counter() - start)
+                if content.text.startswith("Error:") or content.text.startswith('{"error"'):
+                    errors += 1
+            results.append(summarize(tool, timings, errors))
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_table(results: List[Dict[str, Any]], baseline: Dict[str, Dict[str, Any]]):
+    header = f"{'tool':>20} {'calls':>6} {'errors':>6} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    if baseline:
+        header += f" {'p50 vs base':>12}"
+    print(header, file=sys.stderr)
+    for r in results:
+        line = (
+            f"{r['tool']:>20} {r['calls']:>6} {r['errors']:>6} {r['mean_ms']:>9.3f}"
+            f" {r['p50_ms']:>9.3f} {r['p95_ms']:>9.3f} {r['p99_ms']:>9.3f}"
+        )
+        base = baseline.get(r["tool"])
+        if base:
+            line += f" {r['p50_ms'] / base['p50_ms']:>11.2f}x" if base["p50_ms"] else f" {'-':>12}"
+        print(line, file=sys.stderr)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="End-to-end MCP tool benchmark")
+    parser.add_argument("--backend", choices=server.MEMORY_BACKENDS, default="neo4j")
+    parser.add_argument("--entities", type=int, default=10000)
+    parser.add_argument("--degree", type=int, default=3, help="Outgoing relations per entity")
+    parser.add_argument("--observations", type=int, default=3, help="Observations per entity")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed calls per tool")
+    parser.add_argument("--heavy-iterations", type=int, default=5, help="Timed calls of export_graph and import_graph")
+    parser.add_argument("--warmup", type=int, default=5, help="Untimed calls per tool")
+    parser.add_argument("--page-size", type=int, default=100, help="limit of read_graph and topK of search_nodes")
+    parser.add_argument("--embedder", action="store_true", help="Enable the hashing embedder and time semantic_search")
+    parser.add_argument("--encoder", default="auto", help="Result encoder")
+    parser.add_argument("--tools", default=None, help="Comma separated tools to run (default: all)")
+    parser.add_argument("--output", default=None, help="Write JSON results to this file instead of stdout")
+    parser.add_argument("--compare", default=None, help="Earlier JSON results to compare p50 latencies against")
+    args = parser.parse_args()
+    args.tools = set(args.tools.split(",")) if args.tools else None
+
+    embedder = HashingEmbedder() if args.embedder else None
+    driver = None
+    if args.backend == "memory":
+        memory = InMemoryGraphMemory(embedder=embedder)
+    else:
+        from neo4j import AsyncGraphDatabase
+        uri = os.environ.get("NEO4J_URI", "neo4j://localhost:7687")
+        auth = (os.environ.get("NEO4J_USERNAME", "neo4j"), os.environ.get("NEO4J_PASSWORD", "password"))
+        driver = AsyncGraphDatabase.driver(uri, auth=auth)
+        memory = Neo4jMemory(driver, embedder=embedder)
+
+    async def clean():
+        if driver is not None:
+            await driver.execute_query(
+                "MATCH (n) WHERE (n:Memory OR n:MemoryTombstone) AND n.name STARTS WITH $prefix DETACH DELETE n",
+                prefix=PREFIX
+            )
+
+    server.memory = memory
+    server.encoder = ResultEncoder(args.encoder)
+    try:
+        await clean()
+        start = time.perf_counter()
+        await seed(memory, args)
+        seed_seconds = time.perf_counter() - start
+        results = await bench(args)
+    finally:
+        await clean()
+        await memory.close()
+        if driver is not None:
+            await driver.close()
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "backend": args.backend,
+            "encoder": server.encoder.backend,
+            "entities": args.entities,
+            "degree": args.degree,
+            "observations": args.observations,
+            "iterations": args.iterations,
+            "page_size": args.page_size,
+            "seed_seconds": seed_seconds
+        },
+        "results": results
+    }
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = {r["tool"]: r for r in json.load(f)["results"]}
+    print_table(results, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,9 +1,61 @@
 from . import server
+from . import bulk
+from . import encoding
+from . import embedding
+from . import inmemory
+from . import journal
+from . import driver
 import asyncio
 import argparse
+import json
 import os
 
 
+async def run_command(args):
+    """Run a maintenance subcommand against the database."""
+    if args.backend == "memory":
+        neo4j_driver = None
+        memory = inmemory.InMemoryGraphMemory(args.snapshot, embedder=load_embedder(args))
+    else:
+        neo4j_driver = driver.create_driver(args.db_url, (args.username, args.password), driver.PoolConfig.from_args(args))
+        memory = server.Neo4jMemory(
+            neo4j_driver,
+            observation_storage=args.observation_storage,
+            embedder=load_embedder(args),
+            namespace=args.namespace
+        )
+    try:
+        if neo4j_driver is not None:
+            await neo4j_driver.verify_connectivity()
+        if args.command == 'import':
+            result = await bulk.import_graph(memory, args.path, args.chunk_size, not args.no_resume)
+        elif args.command == 'export':
+            result = await bulk.export_graph(memory, args.path)
+        elif args.command == 'backfill-embeddings':
+            result = {"embeddedEntities": await memory.backfill_embeddings(args.batch_size)}
+        else:
+            result = {"migratedEntities": await memory.migrate_observations(args.batch_size)}
+        print(json.dumps(result))
+    finally:
+        await memory.close()
+        if neo4j_driver is not None:
+            await neo4j_driver.close()
+
+
+def parse_tool_timeout(value):
+    tool, _, seconds = value.partition('=')
+    try:
+        return tool, float(seconds)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected TOOL=SECONDS, got {value}")
+
+
+def load_embedder(args):
+    if args.embedder is None:
+        return None
+    return embedding.load_embedder(args.embedder, args.embedding_dimensions)
+
+
 def main():
     """Main entry point for the package."""
     parser = argparse.ArgumentParser(description='Neo4j Cypher MCP Server')
@@ -16,10 +68,162 @@ def main():
     parser.add_argument('--password', 
                        default="password",
                        help='Neo4j password')
+    parser.add_argument('--backend',
+                       choices=server.MEMORY_BACKENDS,
+                       default="neo4j",
+                       help='Store the graph in Neo4j or in process memory (no database needed)')
+    parser.add_argument('--snapshot',
+                       default=None,
+                       help='JSON snapshot the in-memory backend loads on start and saves on shutdown')
+    parser.add_argument('--sync-driver',
+                       action='store_true',
+                       help='Use the blocking Neo4j driver on a thread pool instead of the async driver')
+    parser.add_argument('--cache-entries',
+                       type=int,
+                       default=0,
+                       help='Cache up to this many read results in memory (0 disables the cache)')
+    parser.add_argument('--cache-bytes',
+                       type=int,
+                       default=64 * 1024 * 1024,
+                       help='Approximate memory bound of the read cache in bytes')
+    parser.add_argument('--cache-ttl',
+                       type=float,
+                       default=300.0,
+                       help='Seconds before a cached read result expires, 0 disables the cache')
+    parser.add_argument('--observation-storage',
+                       choices=server.OBSERVATION_STORAGE_MODES,
+                       default="property",
+                       help='Store observations as a list property on the entity or as individual Observation nodes')
+    parser.add_argument('--encoder',
+                       choices=encoding.ENCODER_BACKENDS,
+                       default="auto",
+                       help='JSON encoder for tool results; auto prefers orjson, then msgspec')
+    parser.add_argument('--compact',
+                       action='store_true',
+                       help='Encode tool results without indentation')
+    parser.add_argument('--embedder',
+                       default=None,
+                       help="Enable semantic search with 'hashing' (offline, deterministic) or a 'module:factory' embedder")
+    parser.add_argument('--embedding-dimensions',
+                       type=int,
+                       default=256,
+                       help='Dimensions of the embedding vector index')
+    parser.add_argument('--batch-window-ms',
+                       type=float,
+                       default=0.0,
+                       help='Merge create_entities and add_observations calls arriving within this window into one transaction (0 disables batching)')
+    parser.add_argument('--batch-max-items',
+                       type=int,
+                       default=1000,
+                       help='Commit a write batch early once it holds this many entities or observations')
+    parser.add_argument('--namespace',
+                       default=None,
+                       help='Enable multi-tenant namespaces with this default tenant; tools accept a namespace argument')
+    parser.add_argument('--query-timeout',
+                       type=float,
+                       default=None,
+                       help='Transaction timeout in seconds for the queries of every tool call')
+    parser.add_argument('--tool-timeout',
+                       type=parse_tool_timeout,
+                       action='append',
+                       default=[],
+                       metavar='TOOL=SECONDS',
+                       help='Transaction timeout for one tool, overriding --query-timeout (repeatable)')
+    parser.add_argument('--max-nodes',
+                       type=int,
+                       default=None,
+                       help='Maximum entities returned by one read; longer results are truncated with a continuation cursor')
+    parser.add_argument('--max-relations',
+                       type=int,
+                       default=None,
+                       help='Maximum relations returned by one read')
+    parser.add_argument('--max-bytes',
+                       type=int,
+                       default=None,
+                       help='Approximate maximum size of one read result in bytes')
+    parser.add_argument('--delete-chunk-size',
+                       type=int,
+                       default=server.DELETE_CHUNK_SIZE,
+                       help='Relationships or entities removed per transaction by delete_entities')
+    driver.add_pool_arguments(parser)
+    parser.add_argument('--journal',
+                       default=None,
+                       help='Acknowledge writes once they are in this local SQLite journal and replay them to Neo4j in the background')
+    parser.add_argument('--journal-batch-size',
+                       type=int,
+                       default=500,
+                       help='Journaled writes replayed per round')
+    parser.add_argument('--bulk-dir',
+                       default=None,
+                       help='Directory the import_graph and export_graph tools may read and write; the tools are disabled without it')
+
+    commands = parser.add_subparsers(dest='command')
+    import_parser = commands.add_parser('import', help='Import an NDJSON memory file')
+    import_parser.add_argument('path', help='NDJSON file with entity and relation lines')
+    import_parser.add_argument('--chunk-size',
+                       type=int,
+                       default=1000,
+                       help='Lines written per transaction')
+    import_parser.add_argument('--no-resume',
+                       action='store_true',
+                       help='Ignore an existing checkpoint and start from the beginning')
+    export_parser = commands.add_parser('export', help='Export the memory graph to an NDJSON file')
+    export_parser.add_argument('path', help='Output NDJSON file')
+    migrate_parser = commands.add_parser('migrate-observations',
+                       help='Move list-property observations onto Observation nodes')
+    migrate_parser.add_argument('--batch-size',
+                       type=int,
+                       default=1000,
+                       help='Entities migrated per transaction')
+    backfill_parser = commands.add_parser('backfill-embeddings',
+                       help='Embed every entity that has no embedding yet')
+    backfill_parser.add_argument('--batch-size',
+                       type=int,
+                       default=500,
+                       help='Entities embedded per transaction')
     
     args = parser.parse_args()
-    asyncio.run(server.main(args.db_url, args.username, args.password))
+    if args.backend == "memory" and args.namespace is not None:
+        parser.error('--namespace is not supported by the in-memory backend')
+    if args.command is not None:
+        if args.command == 'migrate-observations' and args.backend == "memory":
+            parser.error('migrate-observations requires the neo4j backend')
+        if args.command == 'migrate-observations':
+            args.observation_storage = "node"
+        if args.command == 'backfill-embeddings' and args.embedder is None:
+            parser.error('backfill-embeddings requires --embedder')
+        asyncio.run(run_command(args))
+        return
+
+    asyncio.run(server.main(
+        args.db_url,
+        args.username,
+        args.password,
+        sync_driver=args.sync_driver,
+        cache_entries=args.cache_entries,
+        cache_bytes=args.cache_bytes,
+        cache_ttl=args.cache_ttl,
+        observation_storage=args.observation_storage,
+        encoder_backend=args.encoder,
+        compact=args.compact,
+        embedder=load_embedder(args),
+        batch_window=args.batch_window_ms / 1000,
+        batch_max_items=args.batch_max_items,
+        namespace=args.namespace,
+        query_timeout=args.query_timeout,
+        tool_timeouts=dict(args.tool_timeout),
+        max_nodes=args.max_nodes,
+        max_relations=args.max_relations,
+        max_bytes=args.max_bytes,
+        backend=args.backend,
+        snapshot_path=args.snapshot,
+        delete_chunk_size=args.delete_chunk_size,
+        journal_path=args.journal,
+        journal_batch_size=args.journal_batch_size,
+        pool=driver.PoolConfig.from_args(args),
+        bulk_dir=args.bulk_dir
+    ))
 
 
 # Optionally expose other important items at package level
-__all__ = ["main", "server"]
+__all__ = ["main", "server", "bulk", "encoding", "embedding", "inmemory", "journal", "driver"]
@@ -0,0 +1,215 @@
+"""
+Write coalescing in front of Neo4jMemory.
+
+Concurrent ``create_entities`` and ``add_observations`` calls that arrive
+within a short window are merged into one call, i.e. one UNWIND transaction,
+instead of one transaction and commit each.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Set
+
+logger = logging.getLogger('mcp_neo4j_memory')
+
+BATCHED_WRITES = ("write_entities", "add_observations")
+
+
+class _Pending:
+    __slots__ = ("items", "future")
+
+    def __init__(self, items: List[Any], future: asyncio.Future):
+        self.items = items
+        self.future = future
+
+
+class WriteBatcher:
+    """Micro-batch concurrent writes to a ``Neo4jMemory``.
+
+    A batch is committed ``window`` seconds after its first request, or as
+    soon as it holds ``max_items`` entities/observations. Every caller still
+    gets its own result; if the merged transaction fails, its requests are
+    replayed one by one so each caller gets its own result or error.
+
+    All other methods are passed through to the wrapped memory. The batcher
+    must be used from a single event loop.
+    """
+
+    def __init__(self, memory, window: float = 0.005, max_items: int = 1000):
+        self.memory = memory
+        self.window = window
+        self.max_items = max_items
+        self._queues: Dict[str, List[_Pending]] = {op: [] for op in BATCHED_WRITES}
+        self._sizes: Dict[str, int] = {op: 0 for op in BATCHED_WRITES}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._tasks = set()
+        self._scoped: Dict[str, "WriteBatcher"] = {}
+        self.requests = 0
+        self.batches = 0
+        self.fallbacks = 0
+
+    def __getattr__(self, name: str):
+        return getattr(self.memory, name)
+
+    async def create_entities(self, entities):
+        return (await self.write_entities(entities)).entities
+
+    async def write_entities(self, entities):
+        return await self._submit("write_entities", entities)
+
+    async def add_observations(self, observations):
+        return await self._submit("add_observations", observations)
+
+    def scoped(self, namespace: str) -> "WriteBatcher":
+        # Writes of different tenants never share a batch
+        memory = self.memory.scoped(namespace)
+        if memory is self.memory:
+            return self
+        if namespace not in self._scoped:
+            self._scoped[namespace] = WriteBatcher(memory, self.window, self.max_items)
+        return self._scoped[namespace]
+
+    def limited(self, budget, metadata=None) -> "_LimitedBatcher":
+        return _LimitedBatcher(self, self.memory.limited(budget, metadata))
+
+    def batch_stats(self) -> Dict[str, int]:
+        return {"requests": self.requests, "batches": self.batches, "fallbacks": self.fallbacks}
+
+    async def flush(self):
+        """Commit everything queued so far and wait for it."""
+        for batcher in self._scoped.values():
+            await batcher.flush()
+        for op in BATCHED_WRITES:
+            self._start_flush(op)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def close(self):
+        await self.flush()
+        await self.memory.close()
+
+    async def _submit(self, op: str, items: List[Any]):
+        if not items:
+            return await getattr(self.memory, op)(items)
+
+        loop = asyncio.get_running_loop()
+        pending = _Pending(list(items), loop.create_future())
+        self._queues[op].append(pending)
+        self._sizes[op] += len(pending.items)
+        self.requests += 1
+
+        if self._sizes[op] >= self.max_items:
+            self._start_flush(op)
+        elif op not in self._timers:
+            self._timers[op] = loop.call_later(self.window, self._start_flush, op)
+        return await pending.future
+
+    def _start_flush(self, op: str):
+        timer = self._timers.pop(op, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._queues[op]
+        if not batch:
+            return
+        self._queues[op] = []
+        self._sizes[op] = 0
+        task = asyncio.ensure_future(self._flush(op, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, op: str, batch: List[_Pending]):
+        method = getattr(self.memory, op)
+        self.batches += 1
+        items = [item for pending in batch for item in pending.items]
+        try:
+            if op == "add_observations":
+                result = await method(items, indexed=True)
+            else:
+                result = await method(items)
+        except Exception as e:
+            if len(batch) == 1:
+                _resolve(batch[0], exception=e)
+                return
+            # Isolate the failing request: replay each one in its own transaction
+            self.fallbacks += 1
+            logger.warning(f"Batched {op} of {len(batch)} requests failed, retrying them one by one: {e}")
+            for pending in batch:
+                try:
+                    _resolve(pending, await method(pending.items))
+                except Exception as single_error:
+                    _resolve(pending, exception=single_error)
+            return
+
+        if op == "write_entities":
+            # The last write of a name wins; earlier requests writing it are superseded
+            written_later = set()
+            for pending in reversed(batch):
+                _resolve(pending, _own_entity_summary(pending, result, written_later))
+                written_later.update(entity.name for entity in pending.items)
+        else:
+            for pending, results in zip(batch, _split_observation_results(batch, result)):
+                _resolve(pending, results)
+
+
+class _LimitedBatcher:
+    """Batched writes go through the batcher, everything else runs under a call's budget.
+
+    A batch is shared by several calls, so it keeps the limits of the wrapped memory.
+    """
+
+    def __init__(self, batcher: WriteBatcher, memory):
+        self._batcher = batcher
+        self._memory = memory
+
+    def __getattr__(self, name: str):
+        if name == "create_entities" or name in BATCHED_WRITES:
+            return getattr(self._batcher, name)
+        return getattr(self._memory, name)
+
+
+def _own_entity_summary(pending: _Pending, summary, written_later: Set[str]):
+    """The part of a merged ``write_entities`` summary that covers one request.
+
+    Names in ``written_later`` were written again by a later request of the
+    batch, so this request's version of them did not take effect.
+    """
+    names = list(dict.fromkeys(entity.name for entity in pending.items))
+    superseded = [name for name in names if name in written_later]
+    names = [name for name in names if name not in written_later]
+    created_names = set(summary.created_names)
+    updated_names = set(summary.updated_names)
+    created = [name for name in names if name in created_names]
+    updated = [name for name in names if name in updated_names]
+    return summary.model_copy(update={
+        "entities": pending.items,
+        "created": len(created),
+        "updated": len(updated),
+        "unchanged": len(names) - len(created) - len(updated),
+        "superseded": len(superseded) or None,
+        "created_names": created,
+        "updated_names": updated
+    })
+
+
+def _split_observation_results(batch: List[_Pending], results: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """Hand the rows of a merged ``add_observations`` back to the requests.
+
+    Each row carries the ``index`` of its input in the merged list, which
+    falls in exactly one request's range; rows for missing entities are
+    simply absent.
+    """
+    owners = [position for position, pending in enumerate(batch) for _ in pending.items]
+    split = [[] for _ in batch]
+    for row in sorted(results, key=lambda row: row["index"]):
+        row = dict(row)
+        split[owners[row.pop("index")]].append(row)
+    return split
+
+
+def _resolve(pending: _Pending, result: Any = None, exception: Optional[BaseException] = None):
+    # The caller may have been cancelled while the batch was in flight
+    if pending.future.done():
+        return
+    if exception is not None:
+        pending.future.set_exception(exception)
+    else:
+        pending.future.set_result(result)
@@ -0,0 +1,231 @@
+"""
+NDJSON import and export of the memory graph.
+
+The line format is the one used by mcp-json-memory:
+
+    {"type": "entity", "name": "Alice", "entityType": "Person", "observations": ["..."]}
+    {"type": "relation", "from": "Alice", "to": "Bob", "relationType": "KNOWS"}
+
+``source``/``target`` are accepted in place of ``from``/``to`` on import.
+"""
+import os
+import json
+import asyncio
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .server import Entity, Relation, Neo4jMemory
+
+logger = logging.getLogger('mcp_neo4j_memory')
+
+
+def _field(item: Dict[str, Any], *keys: str) -> str:
+    """The first of ``keys`` present in ``item``, which must be a non-empty string."""
+    for key in keys:
+        value = item.get(key)
+        if value is not None:
+            if not isinstance(value, str) or not value:
+                raise ValueError(f"'{key}' must be a non-empty string")
+            return value
+    raise ValueError(f"missing '{keys[0]}'")
+
+
+def parse_line(line: str) -> Optional[Union[Entity, Relation]]:
+    line = line.strip()
+    if not line:
+        return None
+    item = json.loads(line)
+    if not isinstance(item, dict):
+        raise ValueError(f"expected a JSON object, got {type(item).__name__}")
+    if item.get("type") == "entity":
+        return Entity(
+            name=_field(item, "name"),
+            type=_field(item, "entityType"),
+            observations=item.get("observations", [])
+        )
+    if item.get("type") == "relation":
+        return Relation(
+            source=_field(item, "from", "source"),
+            target=_field(item, "to", "target"),
+            relationType=_field(item, "relationType")
+        )
+    raise ValueError(f"Unknown line type: {item.get('type')}")
+
+
+def entity_line(entity: Entity) -> str:
+    return json.dumps({
+        "type": "entity",
+        "name": entity.name,
+        "entityType": entity.type,
+        "observations": entity.observations
+    }, ensure_ascii=False)
+
+
+def relation_line(relation: Relation) -> str:
+    return json.dumps({
+        "type": "relation",
+        "from": relation.source,
+        "to": relation.target,
+        "relationType": relation.relationType
+    }, ensure_ascii=False)
+
+
+def read_ndjson(path: str, offset: int = 0) -> Iterator[Tuple[int, Union[Entity, Relation]]]:
+    """Yield ``(end_offset, item)`` for every line after byte ``offset``."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        line_no = 0
+        for line in f:
+            offset += len(line)
+            line_no += 1
+            try:
+                item = parse_line(line.decode("utf-8"))
+            except (ValueError, KeyError) as e:
+                raise ValueError(f"{path}: invalid line {line_no} after resume point: {e}")
+            if item is not None:
+                yield offset, item
+
+
+def _checkpoint_path(path: str) -> str:
+    return path + ".checkpoint"
+
+
+def _deferred_path(path: str) -> str:
+    return path + ".deferred"
+
+
+def _new_checkpoint() -> Dict[str, Any]:
+    return {"offset": 0, "entities": 0, "relations": 0, "dropped": 0, "deferredBytes": 0}
+
+
+def load_checkpoint(path: str) -> Dict[str, Any]:
+    try:
+        with open(_checkpoint_path(path)) as f:
+            return {**_new_checkpoint(), **json.load(f)}
+    except FileNotFoundError:
+        return _new_checkpoint()
+
+
+def save_checkpoint(path: str, checkpoint: Dict[str, Any]):
+    tmp = _checkpoint_path(path) + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, _checkpoint_path(path))
+
+
+def _defer(path: str, relations: List[Relation], size: int) -> int:
+    """Append ``relations`` to ``<path>.deferred`` after its first ``size`` bytes, returning the new size.
+
+    Bytes past ``size`` were written after the last checkpoint by an
+    interrupted import, whose chunk is replayed, so they are cut off first.
+    """
+    with open(_deferred_path(path), "ab") as f:
+        f.truncate(size)
+        f.write("".join(relation_line(relation) + "\n" for relation in relations).encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+        return f.tell()
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def import_graph(memory: Neo4jMemory, path: str, chunk_size: int = 1000, resume: bool = True) -> Dict[str, Any]:
+    """Import an NDJSON file in chunks of ``chunk_size`` lines.
+
+    Each chunk writes its entities and then its relations, one transaction
+    each, and records the byte offset it reached in ``<path>.checkpoint``.
+    An interrupted import continues from that offset; the checkpoint is
+    removed once the whole file has been imported.
+
+    Relations whose endpoints don't exist yet are kept in ``<path>.deferred``
+    and written again once every entity line has been imported, so a file
+    doesn't need its entities first. The ones still missing an endpoint
+    then are counted as ``dropped`` and logged.
+    """
+    checkpoint = load_checkpoint(path) if resume else _new_checkpoint()
+    if checkpoint["offset"]:
+        logger.info(f"Resuming import of {path} at byte {checkpoint['offset']}")
+
+    entities = []
+    relations = []
+    offset = checkpoint["offset"]
+
+    async def flush():
+        if entities:
+            await memory.create_entities(entities)
+            checkpoint["entities"] += len(entities)
+        if relations:
+            summary = await memory.write_relations(relations, chunk_size)
+            checkpoint["relations"] += len(summary.relations)
+            if summary.dropped:
+                checkpoint["deferredBytes"] = await asyncio.to_thread(_defer, path, summary.dropped, checkpoint["deferredBytes"])
+        checkpoint["offset"] = offset
+        await asyncio.to_thread(save_checkpoint, path, checkpoint)
+        entities.clear()
+        relations.clear()
+
+    for offset, item in read_ndjson(path, checkpoint["offset"]):
+        if isinstance(item, Entity):
+            entities.append(item)
+        else:
+            relations.append(item)
+        if len(entities) + len(relations) >= chunk_size:
+            await flush()
+    await flush()
+
+    if checkpoint["deferredBytes"]:
+        # Every entity exists now; writing the relations again is idempotent if this pass is interrupted
+        deferred = [relation for _, relation in read_ndjson(_deferred_path(path))]
+        dropped = []
+        for start in range(0, len(deferred), chunk_size):
+            summary = await memory.write_relations(deferred[start:start + chunk_size], chunk_size)
+            checkpoint["relations"] += len(summary.relations)
+            dropped.extend(summary.dropped)
+        checkpoint["dropped"] += len(dropped)
+        if dropped:
+            sample = ", ".join(f"{r.source}-[{r.relationType}]->{r.target}" for r in dropped[:5])
+            logger.warning(f"Dropped {len(dropped)} relations of {path} whose endpoints don't exist, e.g. {sample}")
+
+    _remove(_deferred_path(path))
+    os.remove(_checkpoint_path(path))
+    del checkpoint["offset"]
+    del checkpoint["deferredBytes"]
+    logger.info(f"Imported {path}: {checkpoint}")
+    return checkpoint
+
+
+async def export_graph(memory: Neo4jMemory, path: str, batch_size: int = 1000) -> Dict[str, Any]:
+    """Stream every entity, then every relation, to an NDJSON file.
+
+    Lines are written ``batch_size`` at a time on a worker thread so the
+    event loop never waits for the disk.
+    """
+    counts = {"entities": 0, "relations": 0}
+    f = await asyncio.to_thread(open, path, "w", encoding="utf-8")
+    try:
+        lines = []
+
+        async def write(line: str):
+            lines.append(line + "\n")
+            if len(lines) >= batch_size:
+                await asyncio.to_thread(f.write, "".join(lines))
+                lines.clear()
+
+        async for entity in memory.iter_entities():
+            await write(entity_line(entity))
+            counts["entities"] += 1
+        async for relation in memory.iter_relations():
+            await write(relation_line(relation))
+            counts["relations"] += 1
+        await asyncio.to_thread(f.write, "".join(lines))
+    finally:
+        await asyncio.to_thread(f.close)
+    logger.info(f"Exported {path}: {counts}")
+    return counts
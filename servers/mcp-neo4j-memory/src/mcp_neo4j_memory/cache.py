@@ -0,0 +1,125 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Set
+
+logger = logging.getLogger('mcp_neo4j_memory')
+
+
+class _CacheEntry:
+    __slots__ = ("value", "names", "by_name", "size", "expires")
+
+    def __init__(self, value: Any, names: Set[str], by_name: bool, size: int, expires: float):
+        self.value = value
+        self.names = names
+        self.by_name = by_name
+        self.size = size
+        self.expires = expires
+
+
+class GraphCache:
+    """LRU cache for graph reads, bounded by entry count, bytes and age.
+
+    Every entry records the entity names it touches so writes can invalidate
+    exactly the entries that mention a changed entity. Entries that were not
+    looked up by name (fulltext searches, full reads) can also gain new
+    matches when entity content changes, so such writes drop them as well.
+
+    ``ttl`` is in seconds; ``None`` keeps entries until they are evicted or
+    invalidated and ``0`` or less stores nothing.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024, ttl: Optional[float] = 300.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.size = 0
+        # Bumped by every invalidation so reads racing a write don't store stale results
+        self.generation = 0
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._keys_by_name: Dict[str, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires < time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(self, key: Hashable, value: Any, names: Iterable[str], size: int, by_name: bool = False, generation: Optional[int] = None):
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if size > self.max_bytes or (self.ttl is not None and self.ttl <= 0):
+                return
+            if key in self._entries:
+                self._remove(key)
+
+            expires = float("inf") if self.ttl is None else time.monotonic() + self.ttl
+            entry = _CacheEntry(value, set(names), by_name, size, expires)
+            self._entries[key] = entry
+            self.size += size
+            for name in entry.names:
+                self._keys_by_name.setdefault(name, set()).add(key)
+
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, names: Iterable[str], content_changed: bool = False):
+        """Drop the entries touching ``names``.
+
+        ``content_changed`` marks writes that can add new matches to queries
+        that were not keyed by name (new entities or observations).
+        """
+        with self._lock:
+            self.generation += 1
+            keys = set()
+            for name in names:
+                keys.update(self._keys_by_name.get(name, ()))
+            if content_changed:
+                keys.update(key for key, entry in self._entries.items() if not entry.by_name)
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._keys_by_name.clear()
+            self.size = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key)
+        self.size -= entry.size
+        for name in entry.names:
+            keys = self._keys_by_name.get(name)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_name[name]
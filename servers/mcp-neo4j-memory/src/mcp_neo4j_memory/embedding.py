@@ -0,0 +1,69 @@
+"""
+Text embedders for semantic search.
+
+An embedder is any object with a ``dimensions`` attribute and an
+``embed(texts)`` method returning one vector per text. The default
+``HashingEmbedder`` needs no model or network and always maps the same text
+to the same vector.
+"""
+import re
+import math
+import hashlib
+import importlib
+from typing import List, Optional
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+class HashingEmbedder:
+    """Hashing vectorizer over words and character trigrams.
+
+    Each feature is hashed into one of ``dimensions`` buckets with a hashed
+    sign, and the vector is L2-normalized so cosine similarity is a dot
+    product. Trigrams let inflections and compounds ("coffee"/"coffees")
+    share most of their features.
+    """
+
+    def __init__(self, dimensions: int = 256, ngram: int = 3):
+        self.dimensions = dimensions
+        self.ngram = ngram
+
+    def features(self, text: str) -> List[str]:
+        features = []
+        for word in _TOKEN.findall(text.lower()):
+            features.append(word)
+            padded = f"<{word}>"
+            features.extend(padded[i:i + self.ngram] for i in range(len(padded) - self.ngram + 1))
+        return features
+
+    def embed_one(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        for feature in self.features(text):
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dimensions
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm:
+            vector = [v / norm for v in vector]
+        return vector
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_one(text) for text in texts]
+
+
+def entity_text(name: str, entity_type: Optional[str], observations: Optional[List[str]]) -> str:
+    return "\n".join([name, entity_type or "", *(observations or [])])
+
+
+def load_embedder(spec: str, dimensions: int = 256):
+    """Build an embedder from ``hashing`` or a ``package.module:factory`` path.
+
+    The factory is called with ``dimensions`` and must return an embedder.
+    """
+    if spec == "hashing":
+        return HashingEmbedder(dimensions)
+    module_name, _, attr = spec.partition(":")
+    if not attr:
+        raise ValueError(f"Embedder must be 'hashing' or 'module:factory', got {spec}")
+    factory = getattr(importlib.import_module(module_name), attr)
+    return factory(dimensions)
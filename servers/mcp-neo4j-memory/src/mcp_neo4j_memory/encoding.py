@@ -0,0 +1,125 @@
+"""
+Encoders for tool results.
+
+orjson and msgspec are optional; ``ResultEncoder("auto")`` picks the first
+one that is installed and falls back to the standard library.
+"""
+import json
+from typing import Any, Dict, List
+
+ENCODER_BACKENDS = ("auto", "orjson", "msgspec", "json")
+GRAPH_FORMATS = ("rows", "columnar")
+
+
+class ResultEncoder:
+    """Serialize tool results to JSON text.
+
+    ``compact`` drops the two-space indentation, which is a large share of
+    the payload for big graphs.
+    """
+
+    def __init__(self, backend: str = "auto", compact: bool = False):
+        if backend not in ENCODER_BACKENDS:
+            raise ValueError(f"Unknown encoder: {backend}")
+        if backend == "auto":
+            backend = "json"
+            for candidate in ("orjson", "msgspec"):
+                try:
+                    __import__(candidate)
+                    backend = candidate
+                    break
+                except ImportError:
+                    continue
+        self.backend = backend
+        self.compact = compact
+
+        if backend == "orjson":
+            import orjson
+            option = 0 if compact else orjson.OPT_INDENT_2
+            self._encode = lambda value: orjson.dumps(value, option=option).decode()
+        elif backend == "msgspec":
+            import msgspec
+            encoder = msgspec.json.Encoder()
+            if compact:
+                self._encode = lambda value: encoder.encode(value).decode()
+            else:
+                self._encode = lambda value: msgspec.json.format(encoder.encode(value), indent=2).decode()
+        elif compact:
+            self._encode = lambda value: json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+        else:
+            self._encode = lambda value: json.dumps(value, indent=2)
+
+    def encode(self, value: Any) -> str:
+        return self._encode(value)
+
+
+def to_columnar(graph: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a dumped graph into columns over interned name and type tables.
+
+    Entity names, entity types and relation types are stored once in
+    ``names``, ``types`` and ``relationTypes``; the columns hold indexes
+    into those tables.
+    """
+    names: Dict[str, int] = {}
+    types: Dict[str, int] = {}
+    relation_types: Dict[str, int] = {}
+
+    def intern(table: Dict[str, int], value: str) -> int:
+        index = table.get(value)
+        if index is None:
+            index = table[value] = len(table)
+        return index
+
+    entities = graph.get("entities", [])
+    relations = graph.get("relations", [])
+    columnar = {
+        "format": "columnar",
+        "entities": {
+            "name": [intern(names, e["name"]) for e in entities],
+            "type": [intern(types, e["type"]) for e in entities],
+            "observations": [e["observations"] for e in entities]
+        },
+        "relations": {
+            "source": [intern(names, r["source"]) for r in relations],
+            "target": [intern(names, r["target"]) for r in relations],
+            "relationType": [intern(relation_types, r["relationType"]) for r in relations]
+        }
+    }
+    if any("score" in e for e in entities):
+        columnar["entities"]["score"] = [e.get("score") for e in entities]
+    columnar["names"] = list(names)
+    columnar["types"] = list(types)
+    columnar["relationTypes"] = list(relation_types)
+    for marker in ("nextCursor", "truncated"):
+        if graph.get(marker) is not None:
+            columnar[marker] = graph[marker]
+    return columnar
+
+
+def from_columnar(columnar: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of ``to_columnar``."""
+    names: List[str] = columnar["names"]
+    types: List[str] = columnar["types"]
+    relation_types: List[str] = columnar["relationTypes"]
+    columns = columnar["entities"]
+
+    entities = []
+    for i, name in enumerate(columns["name"]):
+        entity = {"name": names[name], "type": types[columns["type"][i]], "observations": columns["observations"][i]}
+        if "score" in columns:
+            entity["score"] = columns["score"][i]
+        entities.append(entity)
+    relations = [
+        {"source": names[source], "target": names[target], "relationType": relation_types[relation_type]}
+        for source, target, relation_type in zip(
+            columnar["relations"]["source"],
+            columnar["relations"]["target"],
+            columnar["relations"]["relationType"]
+        )
+    ]
+    return {
+        "entities": entities,
+        "relations": relations,
+        "nextCursor": columnar.get("nextCursor"),
+        "truncated": columnar.get("truncated")
+    }
@@ -0,0 +1,643 @@
+"""
+Pure-Python memory backend with the interface of ``Neo4jMemory``.
+
+Used where no Neo4j is available: tests, CI, small edge deployments and as a
+local stand-in for performance runs. Everything lives in process memory and
+can be snapshotted to a JSON file.
+"""
+import os
+import re
+import copy
+import json
+import math
+import bisect
+import logging
+from collections import Counter
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .server import (
+    MAX_EXPAND_DEPTH,
+    ChangeSet,
+    Entity,
+    EntityWriteSummary,
+    KnowledgeGraph,
+    ObservationAddition,
+    ObservationDeletion,
+    QueryBudget,
+    Relation,
+    RelationWriteSummary,
+    ScoredEntity,
+    SearchResult,
+    Tombstone,
+    VersionedEntity,
+    VersionedRelation,
+    _add_entity,
+    _ResultMeter,
+    _scored_result,
+    _trusted,
+    content_hash,
+    decode_cursor,
+    encode_cursor,
+    fuse_rankings,
+)
+from .embedding import entity_text
+
+logger = logging.getLogger('mcp_neo4j_memory')
+
+# Words of a query; a trailing * makes a prefix query as in Lucene
+_QUERY_TERM = re.compile(r"(\w+)(\*?)")
+_TOKEN = re.compile(r"\w+")
+_OPERATORS = {"AND", "OR", "NOT", "TO"}
+
+RelationKey = Tuple[str, str, str]
+
+
+class _Node:
+    __slots__ = ("name", "type", "observations", "observation_set", "hash", "version", "tokens", "embedding")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.type = ""
+        self.observations: List[str] = []
+        self.observation_set: Set[str] = set()
+        self.hash: Optional[str] = None
+        self.version: Optional[int] = None
+        self.tokens: Counter = Counter()
+        self.embedding: Optional[List[float]] = None
+
+
+class InMemoryGraphMemory:
+    """Knowledge graph held in dictionaries.
+
+    Entities are found by name in a dict and by type in a type index,
+    searches go through an inverted token index scored with tf-idf, and
+    relations are kept in outgoing and incoming adjacency maps, so reads and
+    writes cost in proportion to the entities and relations they touch
+    rather than the graph size. Prefix terms are looked up by binary search
+    in the sorted vocabulary of the token index.
+
+    Search queries are a list of words, matched case-insensitively against
+    name, type and observations; ``word*`` matches a prefix. Lucene operators
+    are ignored and there is no field syntax: in ``name:Alice`` both ``name``
+    and ``Alice`` are plain words.
+
+    With ``snapshot_path`` the graph is loaded from that file when it exists
+    and written back atomically by ``save_snapshot`` and ``close``,
+    embeddings included.
+    """
+
+    namespace = None
+    observation_storage = "property"
+
+    def __init__(self, snapshot_path: Optional[str] = None, embedder=None, budget: Optional[QueryBudget] = None):
+        self.snapshot_path = snapshot_path
+        self.embedder = embedder
+        self.budget = budget
+        self._nodes: Dict[str, _Node] = {}
+        self._by_type: Dict[str, Set[str]] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        # Tokens of _postings in sorted order, for prefix terms
+        self._vocabulary: List[str] = []
+        self._out: Dict[str, Dict[RelationKey, int]] = {}
+        self._in: Dict[str, Set[RelationKey]] = {}
+        self._tombstones: List[Dict[str, Any]] = []
+        self._version = [0]
+        if snapshot_path is not None and os.path.exists(snapshot_path):
+            self.load_snapshot(snapshot_path)
+
+    def scoped(self, namespace: str):
+        raise ValueError("Namespaces are not supported by the in-memory backend")
+
+    def limited(self, budget: Optional[QueryBudget], metadata: Optional[Dict[str, Any]] = None) -> "InMemoryGraphMemory":
+        """A view sharing this graph whose reads are capped by ``budget``; timeouts do not apply."""
+        view = copy.copy(self)
+        view.budget = budget
+        return view
+
+    def cache_stats(self) -> Optional[Dict[str, int]]:
+        return None
+
+    async def close(self):
+        if self.snapshot_path is not None:
+            self.save_snapshot(self.snapshot_path)
+
+    # Indexes
+
+    def _next_version(self) -> int:
+        self._version[0] += 1
+        return self._version[0]
+
+    def _index(self, node: _Node):
+        tokens = Counter(token.lower() for token in _TOKEN.findall(" ".join([node.name, node.type, *node.observations])))
+        for token in node.tokens.keys() - tokens.keys():
+            self._remove_posting(token, node.name)
+        for token, count in tokens.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                bisect.insort(self._vocabulary, token)
+            postings[node.name] = count
+        node.tokens = tokens
+
+    def _remove_posting(self, token: str, name: str):
+        postings = self._postings[token]
+        del postings[name]
+        if not postings:
+            del self._postings[token]
+            del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+
+    def _prefixed(self, prefix: str) -> List[str]:
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = start
+        while end < len(self._vocabulary) and self._vocabulary[end].startswith(prefix):
+            end += 1
+        return self._vocabulary[start:end]
+
+    def _set_type(self, node: _Node, entity_type: Optional[str]):
+        """Keep the type index, the equivalent of the type labels, in step with ``node.type``."""
+        if node.name in self._by_type.get(node.type, ()):
+            names = self._by_type[node.type]
+            names.discard(node.name)
+            if not names:
+                del self._by_type[node.type]
+        if entity_type is not None:
+            node.type = entity_type
+            self._by_type.setdefault(entity_type, set()).add(node.name)
+
+    def _set_observations(self, node: _Node, observations: List[str]):
+        node.observations = observations
+        node.observation_set = set(observations)
+        self._index(node)
+
+    def _relations_of(self, name: str) -> Iterable[RelationKey]:
+        yield from self._out.get(name, {})
+        yield from self._in.get(name, ())
+
+    def _remove_relation(self, key: RelationKey) -> bool:
+        source, target, _ = key
+        outgoing = self._out.get(source)
+        if outgoing is None or key not in outgoing:
+            return False
+        del outgoing[key]
+        self._in[target].discard(key)
+        return True
+
+    # Writes
+
+    async def create_entities(self, entities: List[Entity]) -> List[Entity]:
+        return (await self.write_entities(entities)).entities
+
+    async def write_entities(self, entities: List[Entity]) -> EntityWriteSummary:
+        latest = {entity.name: entity for entity in entities}
+        changed = [
+            entity for entity in latest.values()
+            if entity.name not in self._nodes or self._nodes[entity.name].hash != content_hash(entity)
+        ]
+        created = [entity.name for entity in changed if entity.name not in self._nodes]
+        if changed:
+            version = self._next_version()
+            for entity in changed:
+                node = self._nodes.get(entity.name) or self._nodes.setdefault(entity.name, _Node(entity.name))
+                self._set_type(node, entity.type)
+                node.hash = content_hash(entity)
+                node.version = version
+                self._set_observations(node, list(entity.observations))
+            await self._embed_nodes([self._nodes[entity.name] for entity in changed])
+
+        created_set = set(created)
+        updated = [entity.name for entity in changed if entity.name not in created_set]
+        return EntityWriteSummary(
+            entities=entities,
+            created=len(created),
+            updated=len(updated),
+            unchanged=len(latest) - len(changed),
+            created_names=created,
+            updated_names=updated
+        )
+
+    async def create_relations(self, relations: List[Relation]) -> List[Relation]:
+        return (await self.write_relations(relations)).relations
+
+    async def write_relations(self, relations: List[Relation], chunk_size: Optional[int] = None) -> RelationWriteSummary:
+        written = []
+        dropped = []
+        created = 0
+        version = None
+        for relation in relations:
+            if relation.source not in self._nodes or relation.target not in self._nodes:
+                dropped.append(relation)
+                continue
+            key = (relation.source, relation.target, relation.relationType)
+            outgoing = self._out.setdefault(relation.source, {})
+            if key not in outgoing:
+                version = version or self._next_version()
+                outgoing[key] = version
+                self._in.setdefault(relation.target, set()).add(key)
+                created += 1
+            written.append(relation)
+        return RelationWriteSummary(relations=written, created=created, matched=len(written) - created, dropped=dropped)
+
+    async def add_observations(self, observations: List[ObservationAddition], indexed: bool = False) -> List[Dict[str, Any]]:
+        results = []
+        touched = []
+        version = None
+        for index, addition in enumerate(observations):
+            node = self._nodes.get(addition.entityName)
+            if node is None:
+                continue
+            new = [content for content in dict.fromkeys(addition.contents) if content not in node.observation_set]
+            if new:
+                version = version or self._next_version()
+                node.version = version
+                node.hash = None
+                self._set_observations(node, node.observations + new)
+                touched.append(node)
+            results.append({"entityName": node.name, "addedObservations": new})
+            if indexed:
+                results[-1]["index"] = index
+        await self._embed_nodes(touched)
+        return results
+
+    async def count_entity_deletion(self, entity_names: List[str]) -> Dict[str, int]:
+        names = [name for name in dict.fromkeys(entity_names) if name in self._nodes]
+        relations = {key for name in names for key in self._relations_of(name)}
+        return {"entities": len(names), "relationships": len(relations), "observations": 0}
+
+    async def delete_entities(
+        self,
+        entity_names: List[str],
+        chunk_size: Optional[int] = None,
+        dry_run: bool = False,
+        progress: Optional[Callable[[int, int], Awaitable[None]]] = None
+    ) -> Dict[str, int]:
+        """Same contract as ``Neo4jMemory.delete_entities``; everything happens in one step."""
+        counts = await self.count_entity_deletion(entity_names)
+        if dry_run:
+            return counts
+        version = None
+        for name in dict.fromkeys(entity_names):
+            node = self._nodes.pop(name, None)
+            if node is None:
+                continue
+            self._set_type(node, None)
+            version = version or self._next_version()
+            for key in list(self._relations_of(name)):
+                self._remove_relation(key)
+            self._out.pop(name, None)
+            self._in.pop(name, None)
+            for token in node.tokens:
+                self._remove_posting(token, name)
+            self._tombstones.append({"kind": "entity", "name": name, "version": version})
+        if progress is not None:
+            total = counts["entities"] + counts["relationships"]
+            await progress(total, total)
+        return counts
+
+    async def delete_observations(self, deletions: List[ObservationDeletion]) -> List[Dict[str, Any]]:
+        results = []
+        touched = []
+        version = None
+        for deletion in deletions:
+            node = self._nodes.get(deletion.entityName)
+            if node is None:
+                continue
+            deleted = set(deletion.observations) & node.observation_set
+            removed = [o for o in node.observations if o in deleted]
+            if removed:
+                version = version or self._next_version()
+                node.version = version
+                node.hash = None
+                self._set_observations(node, [o for o in node.observations if o not in deleted])
+                touched.append(node)
+            results.append({"entityName": node.name, "deletedObservations": removed})
+        await self._embed_nodes(touched)
+        return results
+
+    async def delete_relations(self, relations: List[Relation]) -> None:
+        version = None
+        for relation in relations:
+            key = (relation.source, relation.target, relation.relationType)
+            if key in self._out.get(relation.source, {}):
+                version = version or self._next_version()
+                self._remove_relation(key)
+                self._tombstones.append({
+                    "kind": "relation",
+                    "source": relation.source,
+                    "target": relation.target,
+                    "relationType": relation.relationType,
+                    "version": version
+                })
+
+    # Reads
+
+    def _entity(self, node: _Node) -> Entity:
+        return _trusted(Entity, name=node.name, type=node.type, observations=list(node.observations))
+
+    def _search(self, filter_query: str) -> Dict[str, float]:
+        """tf-idf scores of the entities matching any query term."""
+        total = max(len(self._nodes), 1)
+        scores: Dict[str, float] = {}
+        for word, prefix in _QUERY_TERM.findall(filter_query):
+            if word in _OPERATORS:
+                continue
+            word = word.lower()
+            tokens = self._prefixed(word) if prefix else [word]
+            for token in tokens:
+                postings = self._postings.get(token, {})
+                idf = math.log(1 + total / (1 + len(postings))) + 1
+                for name, count in postings.items():
+                    scores[name] = scores.get(name, 0.0) + math.sqrt(count) * idf
+        return scores
+
+    async def load_graph(
+        self,
+        filter_query="*",
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        names: Optional[List[str]] = None,
+        top_k: Optional[int] = None,
+        min_score: Optional[float] = None,
+        entity_types: Optional[List[str]] = None,
+        relation_types: Optional[List[str]] = None
+    ):
+        """Same contract as ``Neo4jMemory.load_graph``."""
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be a positive integer")
+        if top_k is not None and top_k < 1:
+            raise ValueError("top_k must be a positive integer")
+        if top_k is not None and cursor:
+            raise ValueError("top_k results are ordered by score and cannot be combined with a cursor")
+        after = decode_cursor(cursor) if cursor else None
+        search = names is None and filter_query != "*"
+
+        budget = self.budget if self.budget is not None and self.budget.caps_results else None
+        max_nodes = budget.max_nodes if budget is not None else None
+        if max_nodes is not None:
+            limit = min(limit, max_nodes) if limit is not None else None
+            top_k = min(top_k, max_nodes) if top_k is not None else None
+        # Reads with a node limit are ordered by name so a cut short result can
+        # be continued; without one they are not sorted, which would read the whole graph
+        capped_page = top_k is None and names is None and limit is None and max_nodes is not None
+        if capped_page:
+            limit = max_nodes
+        ordered = top_k is None and names is None and limit is not None
+
+        scores: Dict[str, Optional[float]]
+        if names is not None:
+            scores = {name: None for name in dict.fromkeys(names) if name in self._nodes}
+        elif filter_query == "*" and entity_types:
+            scores = dict.fromkeys(name for entity_type in dict.fromkeys(entity_types) for name in self._by_type.get(entity_type, ()))
+        elif filter_query == "*":
+            scores = dict.fromkeys(self._nodes)
+        else:
+            scores = self._search(filter_query)
+            if min_score is not None:
+                scores = {name: score for name, score in scores.items() if score >= min_score}
+        if entity_types and (names is not None or search):
+            allowed = set(entity_types)
+            scores = {name: score for name, score in scores.items() if self._nodes[name].type in allowed}
+        relation_filter = set(relation_types) if relation_types else None
+
+        candidates = list(scores)
+        if after is not None:
+            candidates = [name for name in candidates if name > after]
+        if top_k is not None:
+            candidates = sorted(candidates, key=lambda name: scores[name], reverse=True)[:top_k]
+        elif ordered:
+            candidates.sort()
+
+        entities = []
+        relations = []
+        seen_relations = set()
+        next_cursor = None
+        meter = _ResultMeter(budget)
+        for name in candidates:
+            if top_k is None and limit is not None and len(entities) == limit:
+                next_cursor = encode_cursor(entities[-1].name)
+                if capped_page:
+                    meter.exceeded = "nodes"
+                break
+            node = self._nodes[name]
+            entity = _trusted(ScoredEntity, **self._entity(node).__dict__, score=scores[name]) if search else self._entity(node)
+            rows = [
+                {"source": s, "target": t, "relationType": r}
+                for s, t, r in self._relations_of(name)
+                if relation_filter is None or r in relation_filter
+            ]
+            if not _add_entity(meter, entity, rows, entities, relations, seen_relations):
+                if ordered:
+                    next_cursor = encode_cursor(entities[-1].name)
+                break
+
+        if search:
+            return _trusted(SearchResult, entities=entities, relations=relations, nextCursor=next_cursor, truncated=meter.exceeded)
+        return _trusted(KnowledgeGraph, entities=entities, relations=relations, nextCursor=next_cursor, truncated=meter.exceeded)
+
+    async def read_graph(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        entity_types: Optional[List[str]] = None,
+        relation_types: Optional[List[str]] = None
+    ) -> KnowledgeGraph:
+        return await self.load_graph(limit=limit, cursor=cursor, entity_types=entity_types, relation_types=relation_types)
+
+    async def search_nodes(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        top_k: Optional[int] = None,
+        min_score: Optional[float] = None,
+        entity_types: Optional[List[str]] = None,
+        relation_types: Optional[List[str]] = None
+    ) -> SearchResult:
+        return await self.load_graph(
+            query,
+            limit=limit,
+            cursor=cursor,
+            top_k=top_k,
+            min_score=min_score,
+            entity_types=entity_types,
+            relation_types=relation_types
+        )
+
+    async def find_nodes(self, names: List[str]) -> KnowledgeGraph:
+        return await self.load_graph(names=names)
+
+    async def expand_nodes(
+        self,
+        names: List[str],
+        max_depth: int = 2,
+        fan_out: Union[int, List[int]] = 25,
+        relation_types: Optional[List[str]] = None,
+        max_nodes: int = 200,
+        entity_types: Optional[List[str]] = None
+    ) -> KnowledgeGraph:
+        """Same contract as ``Neo4jMemory.expand_nodes``; neighbors are visited in name order."""
+        if not 1 <= max_depth <= MAX_EXPAND_DEPTH:
+            raise ValueError(f"max_depth must be between 1 and {MAX_EXPAND_DEPTH}")
+        if max_nodes < 1:
+            raise ValueError("max_nodes must be a positive integer")
+        budget = self.budget if self.budget is not None and self.budget.caps_results else None
+        if budget is not None and budget.max_nodes is not None:
+            max_nodes = min(max_nodes, budget.max_nodes)
+        fan_outs = fan_out if isinstance(fan_out, list) else [fan_out] * max_depth
+        if len(fan_outs) != max_depth or any(f < 1 for f in fan_outs):
+            raise ValueError("fan_out must be a positive integer or one positive integer per hop")
+        types = set(relation_types) if relation_types else None
+        reachable = set(entity_types) if entity_types else None
+
+        visited = [name for name in dict.fromkeys(names) if name in self._nodes][:max_nodes]
+        seen = set(visited)
+        frontier = visited
+        for cap in fan_outs:
+            found = []
+            for name in frontier:
+                neighbors = sorted({
+                    target if source == name else source
+                    for source, target, relation_type in self._relations_of(name)
+                    if types is None or relation_type in types
+                } - seen)
+                if reachable is not None:
+                    neighbors = [neighbor for neighbor in neighbors if self._nodes[neighbor].type in reachable]
+                for neighbor in neighbors[:cap]:
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        found.append(neighbor)
+            found = found[:max_nodes - len(visited)]
+            visited += found
+            frontier = found
+
+        entities = []
+        relations = []
+        seen_relations = set()
+        meter = _ResultMeter(budget)
+        returned = set(visited)
+        for name in visited:
+            rows = [
+                {"source": s, "target": t, "relationType": r}
+                for s, t, r in self._relations_of(name)
+                if (types is None or r in types) and s in returned and t in returned
+            ]
+            if not _add_entity(meter, self._entity(self._nodes[name]), rows, entities, relations, seen_relations):
+                break
+        return _trusted(KnowledgeGraph, entities=entities, relations=relations, nextCursor=None, truncated=meter.exceeded)
+
+    async def read_changes_since(self, version: int = 0) -> ChangeSet:
+        """Same contract as ``Neo4jMemory.read_changes_since``."""
+        entities = [
+            _trusted(VersionedEntity, **self._entity(node).__dict__, version=node.version)
+            for node in self._nodes.values()
+            if version == 0 or (node.version or 0) > version
+        ]
+        relations = [
+            _trusted(VersionedRelation, source=s, target=t, relationType=r, version=relation_version)
+            for outgoing in self._out.values()
+            for (s, t, r), relation_version in outgoing.items()
+            if version == 0 or relation_version > version
+        ]
+        tombstones = [Tombstone(**tombstone) for tombstone in self._tombstones if version > 0 and tombstone["version"] > version]
+        return _trusted(ChangeSet, version=self._version[0], entities=entities, relations=relations, tombstones=tombstones)
+
+    async def prune_tombstones(self, before_version: int) -> int:
+        kept = [tombstone for tombstone in self._tombstones if tombstone["version"] > before_version]
+        pruned = len(self._tombstones) - len(kept)
+        self._tombstones[:] = kept
+        return pruned
+
+    async def iter_entities(self) -> AsyncIterator[Entity]:
+        for node in list(self._nodes.values()):
+            yield self._entity(node)
+
+    async def iter_relations(self) -> AsyncIterator[Relation]:
+        for outgoing in list(self._out.values()):
+            for source, target, relation_type in list(outgoing):
+                yield _trusted(Relation, source=source, target=target, relationType=relation_type)
+
+    # Semantic search
+
+    async def _embed_nodes(self, nodes: List[_Node]):
+        if self.embedder is None or not nodes:
+            return
+        vectors = self.embedder.embed([entity_text(node.name, node.type, node.observations) for node in nodes])
+        for node, vector in zip(nodes, vectors):
+            node.embedding = vector
+
+    async def backfill_embeddings(self, batch_size: int = 500) -> int:
+        if self.embedder is None:
+            raise ValueError("No embedder configured")
+        missing = [node for node in self._nodes.values() if node.embedding is None]
+        for start in range(0, len(missing), batch_size):
+            await self._embed_nodes(missing[start:start + batch_size])
+        return len(missing)
+
+    async def semantic_search(
+        self,
+        query: str,
+        top_k: int = 10,
+        min_score: Optional[float] = None,
+        fuse: bool = False
+    ) -> SearchResult:
+        """Same contract as ``Neo4jMemory.semantic_search``, by exact cosine over all embeddings."""
+        if self.embedder is None:
+            raise ValueError("Semantic search is not enabled, start the server with --embedder")
+        [embedding] = self.embedder.embed([query])
+        similarities = (
+            (node.name, sum(a * b for a, b in zip(embedding, node.embedding)))
+            for node in self._nodes.values() if node.embedding is not None
+        )
+        ranked = sorted(
+            ((name, score) for name, score in similarities if min_score is None or score >= min_score),
+            key=lambda item: item[1],
+            reverse=True
+        )[:top_k]
+        scores = dict(ranked)
+        if fuse:
+            keyword = await self.search_nodes(query, top_k=top_k)
+            scores = fuse_rankings([list(scores), [entity.name for entity in keyword.entities]], top_k)
+        return _scored_result(await self.load_graph(names=list(scores)), scores)
+
+    # Snapshots
+
+    def save_snapshot(self, path: str):
+        """Write the whole graph, versions, embeddings and tombstones included, atomically to ``path``."""
+        snapshot = {
+            "version": self._version[0],
+            "entities": [
+                {"name": n.name, "type": n.type, "observations": n.observations, "hash": n.hash, "version": n.version,
+                 "embedding": n.embedding}
+                for n in self._nodes.values()
+            ],
+            "relations": [
+                [source, target, relation_type, version]
+                for outgoing in self._out.values()
+                for (source, target, relation_type), version in outgoing.items()
+            ],
+            "tombstones": self._tombstones
+        }
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        logger.info(f"Saved snapshot of {len(self._nodes)} entities to {path}")
+
+    def load_snapshot(self, path: str):
+        with open(path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+        self._version[0] = snapshot["version"]
+        for item in snapshot["entities"]:
+            node = self._nodes[item["name"]] = _Node(item["name"])
+            self._set_type(node, item["type"])
+            node.hash = item["hash"]
+            node.version = item["version"]
+            self._set_observations(node, item["observations"])
+            node.embedding = item.get("embedding")
+        for source, target, relation_type, version in snapshot["relations"]:
+            key = (source, target, relation_type)
+            self._out.setdefault(source, {})[key] = version
+            self._in.setdefault(target, set()).add(key)
+        self._tombstones[:] = snapshot["tombstones"]
+        logger.info(f"Loaded snapshot of {len(self._nodes)} entities from {path}")
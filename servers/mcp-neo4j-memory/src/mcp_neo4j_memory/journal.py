@@ -0,0 +1,597 @@
+"""
+Durable local write journal in front of Neo4jMemory.
+
+Writes are appended to a SQLite journal and acknowledged as soon as the
+append is on disk. A background flusher replays them to Neo4j in journal
+order, in batches, and keeps retrying while the database is unavailable, so
+the latency and availability of Neo4j no longer reach the agent's writes.
+Reads merge the writes that have not reached the database yet.
+"""
+import re
+import copy
+import json
+import time
+import bisect
+import asyncio
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import neo4j
+
+from .server import (
+    Entity,
+    EntityWriteSummary,
+    KnowledgeGraph,
+    ObservationAddition,
+    ObservationDeletion,
+    Relation,
+    RelationWriteSummary,
+    ScoredEntity,
+)
+
+logger = logging.getLogger('mcp_neo4j_memory')
+
+# Journaled write methods and the model of their items (entity names are plain strings)
+JOURNALED_WRITES = {
+    "write_entities": Entity,
+    "write_relations": Relation,
+    "add_observations": ObservationAddition,
+    "delete_observations": ObservationDeletion,
+    "delete_entities": None,
+    "delete_relations": Relation,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    namespace TEXT,
+    op TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS failed (
+    seq INTEGER PRIMARY KEY,
+    namespace TEXT,
+    op TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created REAL NOT NULL,
+    error TEXT NOT NULL
+);
+"""
+
+_TOKEN = re.compile(r"\w+")
+
+RelationKey = Tuple[str, str, str]
+
+
+class _Entry:
+    __slots__ = ("seq", "namespace", "op", "items", "created")
+
+    def __init__(self, seq: int, namespace: Optional[str], op: str, items: List[Any], created: float):
+        self.seq = seq
+        self.namespace = namespace
+        self.op = op
+        self.items = items
+        self.created = created
+
+    def payload(self) -> str:
+        return json.dumps([item if isinstance(item, str) else item.model_dump() for item in self.items])
+
+    @classmethod
+    def from_row(cls, seq: int, namespace: Optional[str], op: str, payload: str, created: float) -> "_Entry":
+        model = JOURNALED_WRITES[op]
+        items = json.loads(payload)
+        if model is not None:
+            items = [model(**item) for item in items]
+        return cls(seq, namespace, op, items, created)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether a failed replay should be retried later rather than given up on."""
+    if isinstance(error, neo4j.exceptions.AuthError):
+        # The credentials are wrong for every entry alike and can be fixed while they wait
+        return True
+    if isinstance(error, (neo4j.exceptions.Neo4jError, neo4j.exceptions.DriverError)):
+        return error.is_retryable()
+    return isinstance(error, (OSError, asyncio.TimeoutError))
+
+
+class _Overlay:
+    """The state the pending writes of one namespace leave behind, relative to the database."""
+
+    def __init__(self):
+        # Entities written (or, as None, deleted) by a pending write
+        self.entities: Dict[str, Optional[Entity]] = {}
+        # Observation changes of entities the database still holds
+        self.added: Dict[str, Dict[str, None]] = {}
+        self.removed: Dict[str, Set[str]] = {}
+        # Pending relation writes (True) and deletions (False)
+        self.relations: Dict[RelationKey, bool] = {}
+        # Entities whose stored relations a pending delete_entities removes
+        self.detached: Set[str] = set()
+
+    def apply(self, op: str, items: List[Any]):
+        if op == "write_entities":
+            for entity in items:
+                self.entities[entity.name] = Entity(name=entity.name, type=entity.type, observations=list(entity.observations))
+                self.added.pop(entity.name, None)
+                self.removed.pop(entity.name, None)
+        elif op == "add_observations":
+            for addition in items:
+                name = addition.entityName
+                if name in self.entities:
+                    entity = self.entities[name]
+                    if entity is not None:
+                        entity.observations.extend(c for c in dict.fromkeys(addition.contents) if c not in entity.observations)
+                    continue
+                self.added.setdefault(name, {}).update(dict.fromkeys(addition.contents))
+                if name in self.removed:
+                    self.removed[name].difference_update(addition.contents)
+        elif op == "delete_observations":
+            for deletion in items:
+                name = deletion.entityName
+                if name in self.entities:
+                    entity = self.entities[name]
+                    if entity is not None:
+                        entity.observations = [o for o in entity.observations if o not in deletion.observations]
+                    continue
+                self.removed.setdefault(name, set()).update(deletion.observations)
+                for content in deletion.observations:
+                    self.added.get(name, {}).pop(content, None)
+        elif op == "delete_entities":
+            names = set(items)
+            for name in names:
+                self.entities[name] = None
+                self.added.pop(name, None)
+                self.removed.pop(name, None)
+            self.detached |= names
+            self.relations = {key: value for key, value in self.relations.items() if key[0] not in names and key[1] not in names}
+        elif op == "write_relations":
+            for relation in items:
+                self.relations[(relation.source, relation.target, relation.relationType)] = True
+        else:
+            for relation in items:
+                self.relations[(relation.source, relation.target, relation.relationType)] = False
+
+    def patch(self, entity: Entity) -> Optional[Entity]:
+        """``entity`` as read from the database with the pending writes applied, None if deleted."""
+        name = entity.name
+        if name in self.entities:
+            written = self.entities[name]
+            if written is None:
+                return None
+            return entity.model_copy(update={"type": written.type, "observations": list(written.observations)})
+        added = self.added.get(name)
+        removed = self.removed.get(name)
+        if not added and not removed:
+            return entity
+        observations = [o for o in entity.observations if not removed or o not in removed]
+        if added:
+            present = set(observations)
+            observations.extend(o for o in added if o not in present)
+        return entity.model_copy(update={"observations": observations})
+
+    def keeps(self, relation: Relation) -> bool:
+        pending = self.relations.get((relation.source, relation.target, relation.relationType))
+        if pending is not None:
+            return pending
+        return relation.source not in self.detached and relation.target not in self.detached
+
+    def merge(
+        self,
+        graph: KnowledgeGraph,
+        include: Optional[Callable[[Entity], bool]] = None,
+        entity_types: Optional[List[str]] = None,
+        relation_types: Optional[List[str]] = None,
+        score: Optional[float] = None,
+        limit: Optional[int] = None
+    ) -> KnowledgeGraph:
+        """Apply the pending writes to a read result.
+
+        Entities only written locally are added when ``include`` accepts
+        them, with ``score`` in search results, until the result holds
+        ``limit`` entities. Pending relations are added between entities of
+        the result.
+        """
+        entities = []
+        names = set()
+        for entity in graph.entities:
+            patched = self.patch(entity)
+            if patched is None or (entity_types and patched.type not in entity_types):
+                continue
+            entities.append(patched)
+            names.add(patched.name)
+        if include is not None:
+            for name, written in self.entities.items():
+                if limit is not None and len(entities) >= limit:
+                    break
+                if written is None or name in names or (entity_types and written.type not in entity_types):
+                    continue
+                if include(written):
+                    entity = written.model_copy(update={"observations": list(written.observations)})
+                    if score is not None:
+                        entity = ScoredEntity(**entity.model_dump(), score=score)
+                    entities.append(entity)
+                    names.add(name)
+
+        relations = [relation for relation in graph.relations if self.keeps(relation)]
+        present = {(r.source, r.target, r.relationType) for r in relations}
+        for key, written in self.relations.items():
+            source, target, relation_type = key
+            if not written or key in present or source not in names or target not in names:
+                continue
+            if relation_types and relation_type not in relation_types:
+                continue
+            relations.append(Relation(source=source, target=target, relationType=relation_type))
+        return graph.model_copy(update={"entities": entities, "relations": relations})
+
+
+def _matches(query: str) -> Callable[[Entity], bool]:
+    """Whether an entity contains a word of ``query``, or a word starting with a ``word*`` term."""
+    terms = [(term.lower().rstrip("*"), term.endswith("*")) for term in re.findall(r"\w+\*?", query)]
+
+    def match(entity: Entity) -> bool:
+        words = {word.lower() for text in (entity.name, entity.type, *entity.observations) for word in _TOKEN.findall(text)}
+        return any(
+            any(word.startswith(term) for word in words) if prefix else term in words
+            for term, prefix in terms
+        )
+    return match
+
+
+class _JournalStore:
+    """The SQLite journal file. Every call runs on one worker thread, in submission order."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-journal")
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        # WAL with synchronous=FULL fsyncs the log on every commit
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=FULL")
+        self.connection.executescript(SCHEMA)
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    def load(self) -> Tuple[List[_Entry], int]:
+        """Pending entries in order, and the sequence number the next entry gets."""
+        rows = self.connection.execute("SELECT seq, namespace, op, payload, created FROM journal ORDER BY seq").fetchall()
+        last = self.connection.execute("SELECT seq FROM sqlite_sequence WHERE name = 'journal'").fetchone()
+        entries = []
+        for seq, namespace, op, payload, created in rows:
+            try:
+                entries.append(_Entry.from_row(seq, namespace, op, payload, created))
+            except (KeyError, TypeError, ValueError) as e:
+                # Written by a version with other operations or item fields; keep it for inspection
+                error = f"unknown operation {op}" if op not in JOURNALED_WRITES else f"invalid payload: {e}"
+                logger.error(f"Journaled {op} #{seq} cannot be replayed and was moved to the failed table: {error}")
+                self._fail(seq, namespace, op, payload, created, error)
+        return entries, (last[0] if last else 0) + 1
+
+    def _append(self, entry: _Entry, payload: str):
+        self.connection.execute(
+            "INSERT INTO journal (seq, namespace, op, payload, created) VALUES (?, ?, ?, ?, ?)",
+            (entry.seq, entry.namespace, entry.op, payload, entry.created)
+        )
+
+    async def append(self, entry: _Entry):
+        await self._run(self._append, entry, entry.payload())
+
+    def _remove(self, seqs: List[int]):
+        with self.connection:
+            self.connection.executemany("DELETE FROM journal WHERE seq = ?", [(seq,) for seq in seqs])
+
+    async def remove(self, entries: List[_Entry]):
+        await self._run(self._remove, [entry.seq for entry in entries])
+
+    def _fail(self, seq: int, namespace: Optional[str], op: str, payload: str, created: float, error: str):
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO failed (seq, namespace, op, payload, created, error) VALUES (?, ?, ?, ?, ?, ?)",
+                (seq, namespace, op, payload, created, error)
+            )
+            self.connection.execute("DELETE FROM journal WHERE seq = ?", (seq,))
+
+    async def fail(self, entry: _Entry, error: str):
+        await self._run(self._fail, entry.seq, entry.namespace, entry.op, entry.payload(), entry.created, error)
+
+    def failed_count(self) -> int:
+        return self.connection.execute("SELECT count(*) FROM failed").fetchone()[0]
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.connection.close()
+
+
+class WriteJournal:
+    """Acknowledge writes once they are in a local journal and replay them in the background.
+
+    Consecutive writes of the same kind and namespace are replayed as one
+    call, at most ``batch_size`` journal entries per round, strictly in the
+    order they were acknowledged. A replay that fails because the database
+    is unavailable or rejects the credentials is retried with exponential
+    backoff from ``retry_delay`` up to ``max_retry_delay`` seconds; one that
+    fails for any other reason is moved to the journal's ``failed`` table so
+    it cannot block the writes behind it. Entries still pending at shutdown are replayed on the next
+    start.
+
+    Write results describe what was journaled (``journaled`` is the entry's
+    sequence number) since what the database will make of it is not known
+    yet. Reads merge the pending writes: changes to entities a read returns
+    always, and entities that only exist locally in ``find_nodes``, the last
+    page of ``read_graph`` and the first page of ``search_nodes`` (with a
+    score of 0). ``read_changes_since`` only reports replayed writes.
+
+    All other methods are passed through to the wrapped memory. The journal
+    must be used from a single event loop.
+    """
+
+    def __init__(self, memory, path: str, batch_size: int = 500, retry_delay: float = 0.5, max_retry_delay: float = 30.0):
+        self.memory = memory
+        self.path = path
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.namespace: Optional[str] = None
+        self._root = self
+        self._store = _JournalStore(path)
+        self._entries, self._next_seq = self._store.load()
+        self._overlays: Optional[Dict[Optional[str], _Overlay]] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self.acknowledged = 0
+        self.replayed = 0
+        self.batches = 0
+        self.retries = 0
+        self.failed = 0
+        self.last_error: Optional[str] = None
+        if self._entries:
+            logger.info(f"Journal {path} holds {len(self._entries)} writes that have not reached the database yet")
+        failed = self._store.failed_count()
+        if failed:
+            logger.warning(f"Journal {path} holds {failed} writes the database rejected, see its failed table")
+
+    def __getattr__(self, name: str):
+        # A copy looks up special methods before ``memory`` is set on it
+        if name == "memory" or name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.memory, name)
+
+    def scoped(self, namespace: str) -> "WriteJournal":
+        memory = self.memory.scoped(namespace)
+        if memory is self.memory:
+            return self
+        view = copy.copy(self)
+        view.memory = memory
+        view.namespace = namespace
+        return view
+
+    def limited(self, budget, metadata=None) -> "WriteJournal":
+        # Only reads run under the budget; replays keep the limits of the wrapped memory
+        view = copy.copy(self)
+        view.memory = self.memory.limited(budget, metadata)
+        return view
+
+    def journal_stats(self) -> Dict[str, Any]:
+        root = self._root
+        oldest = root._entries[0].created if root._entries else None
+        return {
+            "pending": len(root._entries),
+            "oldestPendingSeconds": time.time() - oldest if oldest is not None else None,
+            "acknowledged": root.acknowledged,
+            "replayed": root.replayed,
+            "batches": root.batches,
+            "retries": root.retries,
+            "failed": root.failed,
+            "lastError": root.last_error
+        }
+
+    # Writes
+
+    async def create_entities(self, entities: List[Entity]) -> List[Entity]:
+        return (await self.write_entities(entities)).entities
+
+    async def write_entities(self, entities: List[Entity]) -> EntityWriteSummary:
+        if not entities:
+            return await self.memory.write_entities(entities)
+        entry = await self._append("write_entities", entities)
+        return EntityWriteSummary(entities=entities, journaled=entry.seq)
+
+    async def create_relations(self, relations: List[Relation]) -> List[Relation]:
+        return (await self.write_relations(relations)).relations
+
+    async def write_relations(self, relations: List[Relation], chunk_size: Optional[int] = None) -> RelationWriteSummary:
+        if not relations:
+            return await self.memory.write_relations(relations)
+        entry = await self._append("write_relations", relations)
+        return RelationWriteSummary(relations=relations, journaled=entry.seq)
+
+    async def add_observations(self, observations: List[ObservationAddition]) -> List[Dict[str, Any]]:
+        if not observations:
+            return await self.memory.add_observations(observations)
+        entry = await self._append("add_observations", observations)
+        return [
+            {"entityName": o.entityName, "queuedObservations": list(dict.fromkeys(o.contents)), "journaled": entry.seq}
+            for o in observations
+        ]
+
+    async def delete_observations(self, deletions: List[ObservationDeletion]) -> List[Dict[str, Any]]:
+        if not deletions:
+            return await self.memory.delete_observations(deletions)
+        entry = await self._append("delete_observations", deletions)
+        return [
+            {"entityName": d.entityName, "queuedDeletions": list(dict.fromkeys(d.observations)), "journaled": entry.seq}
+            for d in deletions
+        ]
+
+    async def delete_entities(self, entity_names: List[str], chunk_size: Optional[int] = None, dry_run: bool = False, progress=None) -> Dict[str, int]:
+        if dry_run or not entity_names:
+            return await self.memory.delete_entities(entity_names, chunk_size, dry_run, progress)
+        entry = await self._append("delete_entities", list(dict.fromkeys(entity_names)))
+        return {"queuedEntities": len(entry.items), "journaled": entry.seq}
+
+    async def delete_relations(self, relations: List[Relation]) -> Optional[Dict[str, int]]:
+        if not relations:
+            return await self.memory.delete_relations(relations)
+        entry = await self._append("delete_relations", relations)
+        return {"queuedRelations": len(entry.items), "journaled": entry.seq}
+
+    # Reads
+
+    async def read_graph(self, limit=None, cursor=None, entity_types=None, relation_types=None) -> KnowledgeGraph:
+        graph = await self.memory.read_graph(limit, cursor, entity_types, relation_types)
+        overlay = self._overlay()
+        if overlay is None:
+            return graph
+        last_page = graph.nextCursor is None and graph.truncated is None
+        return overlay.merge(graph, (lambda entity: True) if last_page else None, entity_types, relation_types)
+
+    async def search_nodes(self, query, limit=None, cursor=None, top_k=None, min_score=None, entity_types=None, relation_types=None):
+        result = await self.memory.search_nodes(query, limit, cursor, top_k, min_score, entity_types, relation_types)
+        overlay = self._overlay()
+        if overlay is None:
+            return result
+        # Local entities have no score to compare with min_score
+        include = _matches(query) if cursor is None and min_score is None else None
+        return overlay.merge(result, include, entity_types, relation_types, score=0.0, limit=top_k)
+
+    async def find_nodes(self, names: List[str]) -> KnowledgeGraph:
+        graph = await self.memory.find_nodes(names)
+        overlay = self._overlay()
+        if overlay is None:
+            return graph
+        requested = set(names)
+        return overlay.merge(graph, lambda entity: entity.name in requested)
+
+    async def expand_nodes(self, names, max_depth=2, fan_out=25, relation_types=None, max_nodes=200, entity_types=None) -> KnowledgeGraph:
+        graph = await self.memory.expand_nodes(names, max_depth, fan_out, relation_types, max_nodes, entity_types)
+        overlay = self._overlay()
+        if overlay is None:
+            return graph
+        return overlay.merge(graph, entity_types=entity_types, relation_types=relation_types)
+
+    async def semantic_search(self, query, top_k=10, min_score=None, fuse=False):
+        result = await self.memory.semantic_search(query, top_k, min_score, fuse)
+        overlay = self._overlay()
+        return result if overlay is None else overlay.merge(result)
+
+    # Replay
+
+    def start(self):
+        """Start the background flusher; writes start it on their own."""
+        root = self._root
+        if root._flusher is None:
+            root._lock = asyncio.Lock()
+            root._wakeup = asyncio.Event()
+            root._flusher = asyncio.ensure_future(root._run())
+            if root._entries:
+                root._wakeup.set()
+
+    async def flush(self):
+        """Replay every pending write now; raises if the database is still unavailable."""
+        root = self._root
+        root.start()
+        async with root._lock:
+            while root._entries:
+                await root._replay_batch(root._entries[:root.batch_size])
+
+    async def close(self):
+        root = self._root
+        try:
+            await root.flush()
+        except Exception as e:
+            logger.warning(f"Closing with {len(root._entries)} writes left in journal {root.path}, they are replayed on the next start: {e}")
+        if root._flusher is not None:
+            root._flusher.cancel()
+            await asyncio.gather(root._flusher, return_exceptions=True)
+        root._store.close()
+        await root.memory.close()
+
+    def _overlay(self) -> Optional[_Overlay]:
+        root = self._root
+        if not root._entries:
+            return None
+        if root._overlays is None:
+            overlays: Dict[Optional[str], _Overlay] = {}
+            for entry in root._entries:
+                overlays.setdefault(entry.namespace, _Overlay()).apply(entry.op, entry.items)
+            root._overlays = overlays
+        return root._overlays.get(self.namespace)
+
+    async def _append(self, op: str, items: List[Any]) -> _Entry:
+        root = self._root
+        root.start()
+        entry = _Entry(root._next_seq, self.namespace, op, list(items), time.time())
+        root._next_seq += 1
+        await root._store.append(entry)
+        # The store runs appends in order, so this is almost always the end of the list
+        bisect.insort(root._entries, entry, key=lambda e: e.seq)
+        if root._overlays is not None:
+            root._overlays.setdefault(entry.namespace, _Overlay()).apply(op, entry.items)
+        root.acknowledged += 1
+        root._wakeup.set()
+        return entry
+
+    async def _run(self):
+        delay = self.retry_delay
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            try:
+                await self.flush()
+                delay = self.retry_delay
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.retries += 1
+                self.last_error = str(e)
+                logger.warning(f"Replaying the journal failed, retrying in {delay:.1f}s with {len(self._entries)} writes pending: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+                self._wakeup.set()
+
+    def _target(self, namespace: Optional[str]):
+        return self.memory if namespace is None else self.memory.scoped(namespace)
+
+    async def _replay_batch(self, batch: List[_Entry]):
+        self.batches += 1
+        groups: List[List[_Entry]] = []
+        for entry in batch:
+            if groups and groups[-1][0].op == entry.op and groups[-1][0].namespace == entry.namespace:
+                groups[-1].append(entry)
+            else:
+                groups.append([entry])
+        for group in groups:
+            await self._replay_group(group)
+
+    async def _replay_group(self, group: List[_Entry]):
+        try:
+            # A backend without the operation rejects the entry like the database would
+            method = getattr(self._target(group[0].namespace), group[0].op)
+            await method([item for entry in group for item in entry.items])
+        except Exception as e:
+            if is_retryable(e):
+                raise
+            if len(group) > 1:
+                # Isolate the failing entry: replay each one on its own
+                for entry in group:
+                    await self._replay_group([entry])
+                return
+            [entry] = group
+            logger.error(f"Journaled {entry.op} #{entry.seq} was rejected by the database and moved to the failed table: {e}")
+            await self._store.fail(entry, str(e))
+            self.failed += 1
+            self._done(group)
+            return
+        await self._store.remove(group)
+        self.replayed += len(group)
+        self._done(group)
+
+    def _done(self, group: List[_Entry]):
+        finished = {entry.seq for entry in group}
+        self._entries = [entry for entry in self._entries if entry.seq not in finished]
+        self._overlays = None
@@ -1,13 +1,18 @@
 import os
+import re
+import base64
+import hashlib
 import logging
 import json
 import asyncio
-from typing import Any, Dict, List, Optional
-from contextlib import asynccontextmanager
+import functools
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Union
+from contextlib import aclosing, asynccontextmanager
 
 import neo4j
-from neo4j import GraphDatabase
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 import mcp.types as types
 from mcp.server import NotificationOptions, Server
@@ -16,6 +21,12 @@ import mcp.server.stdio
 
 from flask import Flask, request, jsonify
 
+from .cache import GraphCache
+from .encoding import GRAPH_FORMATS, ResultEncoder, to_columnar
+from .embedding import entity_text
+from .batching import WriteBatcher
+from .driver import PoolConfig, create_driver, pool_stats, warm_up, warm_up_sync
+
 # Set up logging
 logger = logging.getLogger('mcp_neo4j_memory')
 logger.setLevel(logging.INFO)
@@ -34,6 +45,77 @@ class Relation(BaseModel):
 class KnowledgeGraph(BaseModel):
     entities: List[Entity]
     relations: List[Relation]
+    nextCursor: Optional[str] = None
+    # Set to the exhausted budget ("nodes", "relations" or "bytes") when the result was cut short
+    truncated: Optional[str] = None
+
+class ScoredEntity(Entity):
+    score: float
+
+class SearchResult(KnowledgeGraph):
+    entities: List[ScoredEntity]
+
+class RelationWriteSummary(BaseModel):
+    relations: List[Relation]
+    created: int = 0
+    matched: int = 0
+    dropped: List[Relation] = []
+    # Sequence number of the local journal entry when the write was acknowledged before reaching Neo4j
+    journaled: Optional[int] = None
+
+class EntityWriteSummary(BaseModel):
+    entities: List[Entity]
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    # Entities overwritten by a later call merged into the same batch
+    superseded: Optional[int] = None
+    journaled: Optional[int] = None
+    # Names behind the counts, kept out of tool results
+    created_names: List[str] = Field(default_factory=list, exclude=True)
+    updated_names: List[str] = Field(default_factory=list, exclude=True)
+
+class VersionedEntity(Entity):
+    version: Optional[int] = None
+
+class VersionedRelation(Relation):
+    version: Optional[int] = None
+
+class Tombstone(BaseModel):
+    kind: str
+    version: int
+    name: Optional[str] = None
+    source: Optional[str] = None
+    target: Optional[str] = None
+    relationType: Optional[str] = None
+
+class ChangeSet(BaseModel):
+    version: int
+    entities: List[VersionedEntity]
+    relations: List[VersionedRelation]
+    tombstones: List[Tombstone]
+
+class QueryBudget(BaseModel):
+    """Limits of one tool call: a transaction timeout in seconds and result caps."""
+    timeout: Optional[float] = None
+    max_nodes: Optional[int] = None
+    max_relations: Optional[int] = None
+    max_bytes: Optional[int] = None
+
+    @property
+    def caps_results(self) -> bool:
+        return any(cap is not None for cap in (self.max_nodes, self.max_relations, self.max_bytes))
+
+class BudgetExceeded(Exception):
+    """A tool call ran out of its ``QueryBudget``."""
+
+    def __init__(self, reason: str, limit: Optional[float]):
+        super().__init__(f"Budget exceeded: {reason} (limit {limit})")
+        self.reason = reason
+        self.limit = limit
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"error": {"type": "budget_exceeded", "reason": self.reason, "limit": self.limit}}
 
 class ObservationAddition(BaseModel):
     entityName: str
@@ -43,18 +125,549 @@ class ObservationDeletion(BaseModel):
     entityName: str
     observations: List[str]
 
+def encode_cursor(name: str) -> str:
+    """Encode the last entity name of a page as an opaque keyset cursor."""
+    return base64.urlsafe_b64encode(json.dumps({"name": name}).encode()).decode()
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        name = json.loads(base64.urlsafe_b64decode(cursor.encode()))["name"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    if not isinstance(name, str):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return name
+
+_set_attribute = object.__setattr__
+
+def _trusted(model_class, **fields):
+    """Build a model from values read back from our own database, without validation.
+
+    Every field must be given. ``model_construct`` would also skip validation
+    but is slower than validating on pydantic 2; tool input still goes
+    through the validating constructors.
+    """
+    model = model_class.__new__(model_class)
+    _set_attribute(model, "__dict__", fields)
+    _set_attribute(model, "__pydantic_fields_set__", set(fields))
+    _set_attribute(model, "__pydantic_extra__", None)
+    _set_attribute(model, "__pydantic_private__", None)
+    return model
+
+def dump_result(result: BaseModel) -> Dict[str, Any]:
+    """``model_dump`` of a read result taken straight from the instance dicts.
+
+    For graph results and change sets, whose list fields hold flat models
+    without excluded fields. The dicts are shared with the result and must
+    not be modified.
+    """
+    return {
+        key: [item.__dict__ for item in value] if isinstance(value, list) else value
+        for key, value in result.__dict__.items()
+    }
+
+OBSERVATION_STORAGE_MODES = ("property", "node")
+MEMORY_BACKENDS = ("neo4j", "memory")
+MAX_EXPAND_DEPTH = 6
+# Relationships or entities deleted per transaction by delete_entities
+DELETE_CHUNK_SIZE = 10000
+# Rank constant of reciprocal rank fusion in semantic_search
+RRF_K = 60
+
+# Nearest neighbours fetched per requested result when semantic search is limited to a namespace
+NAMESPACE_VECTOR_OVERFETCH = 10
+# Namespaces are also matched as a single fulltext token, so keep them to word characters
+NAMESPACE_PATTERN = re.compile(r"^[a-z0-9_]{1,64}$")
+# Queries are written for the whole graph; in a namespace every Memory
+# and MemoryTombstone pattern is pinned to it
+_NAMESPACE_SCOPES = [
+    (re.compile(r"(\(\w*:Memory(?:Tombstone)?) \{"), r"\1 { namespace: $namespace,"),
+    (re.compile(r"(\(\w*:Memory(?:Tombstone)?)\)"), r"\1 { namespace: $namespace })")
+]
+
+# Version of a write transaction: its start time in microseconds, the last
+# three digits a random tie-breaker. Unlike a shared counter node this takes
+# no lock, so concurrent writes do not serialize on it.
+TRANSACTION_VERSION = "timestamp() * 1000 + toInteger(rand() * 1000)"
+# Prefix of every write statement: takes the transaction version as `v`
+NEXT_VERSION = f"""
+WITH {TRANSACTION_VERSION} as v
+"""
+# read_changes_since trails the clock by this much, so transactions that
+# started earlier but commit after the read are still reported next time
+CHANGE_FEED_LAG_MS = 10000
+
+def observation_key(entity_name: str, content: str, namespace: Optional[str] = None) -> str:
+    """Stable identity of an observation node, unique per entity and content."""
+    if namespace is not None:
+        entity_name = f"{namespace}\x00{entity_name}"
+    return hashlib.sha1(f"{entity_name}\x00{content}".encode()).hexdigest()
+
+def content_hash(entity: Entity) -> str:
+    """Hash of everything create_entities writes besides the name."""
+    return hashlib.sha1(json.dumps([entity.type, entity.observations]).encode()).hexdigest()
+
+def _observation_items(entity_name: str, contents: List[str], namespace: Optional[str] = None) -> List[Dict[str, Any]]:
+    # Duplicate contents within one call would collide on the key constraint
+    return [
+        {"key": observation_key(entity_name, content, namespace), "content": content, "pos": pos}
+        for pos, content in enumerate(dict.fromkeys(contents))
+    ]
+
+def _add_relations(rows: List[Dict[str, Any]], seen: Set[tuple], relations: List[Relation]):
+    for rel in rows:
+        key = (rel.get('source'), rel.get('target'), rel.get('relationType'))
+        # A relation between two returned entities is read from both ends
+        if not all(key) or key in seen:
+            continue
+        seen.add(key)
+        relations.append(_trusted(Relation, source=key[0], target=key[1], relationType=key[2]))
+
+def _relation_endpoints(relations: List[Relation]) -> Set[str]:
+    return {relation.source for relation in relations} | {relation.target for relation in relations}
+
+def _lucene_escape(text: str) -> str:
+    return re.sub(r'([+\-!(){}\[\]^"~*?:\\/&|])', r'\\\1', text)
+
+def fuse_rankings(rankings: List[List[str]], top_k: int) -> Dict[str, float]:
+    """Reciprocal rank fusion of several best-first name rankings."""
+    fused: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, name in enumerate(ranking, start=1):
+            fused[name] = fused.get(name, 0.0) + 1.0 / (RRF_K + rank)
+    return dict(sorted(fused.items(), key=lambda item: item[1], reverse=True)[:top_k])
+
+def _scored_result(graph: KnowledgeGraph, scores: Dict[str, float]) -> SearchResult:
+    entities = sorted(
+        (_trusted(ScoredEntity, **entity.__dict__, score=scores[entity.name]) for entity in graph.entities),
+        key=lambda entity: entity.score,
+        reverse=True
+    )
+    return _trusted(SearchResult, entities=entities, relations=graph.relations, nextCursor=None, truncated=graph.truncated)
+
+def _quote_name(name: str) -> str:
+    if not isinstance(name, str) or not name:
+        raise ValueError("Entity and relation types must be non-empty strings")
+    return "`" + name.replace("`", "``") + "`"
+
+def _type_expression(type_names: Optional[List[str]]) -> str:
+    """Quoted type names joined into a Cypher label or relationship type expression.
+
+    Types are written into the query text rather than passed as parameters
+    so the planner can use label and relationship type scans.
+    """
+    return "|".join(_quote_name(name) for name in dict.fromkeys(type_names))
+
+def _lucene_phrase(text: str) -> str:
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+def _check_namespace(namespace: Optional[str]):
+    if namespace is not None and not NAMESPACE_PATTERN.match(namespace):
+        raise ValueError(f"Invalid namespace {namespace!r}: use 1-64 lowercase letters, digits or underscores")
+
+def _entity_size(entity: Entity) -> int:
+    return len(entity.name) + len(entity.type) + sum(len(o) for o in entity.observations) + 64
+
+def _relation_size(relation: Relation) -> int:
+    return len(relation.source) + len(relation.target) + len(relation.relationType) + 48
+
+def _graph_size(graph: KnowledgeGraph) -> int:
+    """Approximate the memory held by a cached graph from its string lengths."""
+    return sum(_entity_size(e) for e in graph.entities) + sum(_relation_size(r) for r in graph.relations)
+
+class _ResultMeter:
+    """Tracks how much of a budget a streamed graph result has used."""
+
+    def __init__(self, budget: Optional[QueryBudget]):
+        self.budget = budget
+        self.nodes = 0
+        self.relations = 0
+        self.bytes = 0
+        self.exceeded: Optional[str] = None
+
+    def admit(self, entity: Entity, relations: List[Relation]) -> bool:
+        """Count ``entity`` and its new ``relations`` unless that breaks a cap."""
+        if self.budget is None:
+            return True
+        nodes = self.nodes + 1
+        relation_count = self.relations + len(relations)
+        size = self.bytes + _entity_size(entity) + sum(_relation_size(r) for r in relations)
+        for reason, used, cap in (
+            ("nodes", nodes, self.budget.max_nodes),
+            ("relations", relation_count, self.budget.max_relations),
+            ("bytes", size, self.budget.max_bytes)
+        ):
+            if cap is not None and used > cap:
+                self.exceeded = reason
+                return False
+        self.nodes, self.relations, self.bytes = nodes, relation_count, size
+        return True
+
+    def limit(self) -> Optional[int]:
+        return getattr(self.budget, f"max_{self.exceeded}") if self.exceeded else None
+
+def _add_entity(
+    meter: _ResultMeter,
+    entity: Entity,
+    rows: List[Dict[str, Any]],
+    entities: List[Entity],
+    relations: List[Relation],
+    seen: Set[tuple]
+) -> bool:
+    """Add an entity row to a result within budget, or leave the result untouched."""
+    start = len(relations)
+    _add_relations(rows, seen, relations)
+    if meter.admit(entity, relations[start:]):
+        entities.append(entity)
+        return True
+    for relation in relations[start:]:
+        seen.discard((relation.source, relation.target, relation.relationType))
+    del relations[start:]
+    if not entities:
+        # Not even one entity fits, there is nothing to continue from
+        raise BudgetExceeded(meter.exceeded, meter.limit())
+    return False
+
+class RoutingStats:
+    """Queries per access mode and per cluster member that served them."""
+
+    def __init__(self):
+        self.queries = {"read": 0, "write": 0}
+        self.servers: Dict[str, Dict[str, int]] = {}
+
+    def record(self, mode: str, summary: Optional[neo4j.ResultSummary]):
+        self.queries[mode] += 1
+        address = str(summary.server.address) if summary is not None else "unknown"
+        self.servers.setdefault(address, {"read": 0, "write": 0})[mode] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {"queries": dict(self.queries), "servers": {address: dict(counts) for address, counts in self.servers.items()}}
+
 class Neo4jMemory:
-    def __init__(self, neo4j_driver):
+    def __init__(
+        self,
+        neo4j_driver,
+        executor: Optional[ThreadPoolExecutor] = None,
+        max_workers: int = 8,
+        fetch_size: int = 1000,
+        relation_chunk_size: int = 1000,
+        delete_chunk_size: int = DELETE_CHUNK_SIZE,
+        cache: Optional[GraphCache] = None,
+        observation_storage: str = "property",
+        embedder=None,
+        namespace: Optional[str] = None,
+        budget: Optional[QueryBudget] = None,
+        change_lag_ms: int = CHANGE_FEED_LAG_MS
+    ):
+        """Wrap a Neo4j driver.
+
+        An ``AsyncDriver`` is awaited directly on the event loop. A synchronous
+        ``Driver`` is still accepted (e.g. for the Flask/WSGI entry points) and
+        its blocking calls are pushed onto a thread pool so that concurrent
+        tool calls keep overlapping.
+
+        An optional ``GraphCache`` serves repeated reads from memory and is
+        invalidated by every write method for the entity names it touched.
+
+        ``observation_storage`` selects how observations are stored: as a list
+        property on the entity ("property") or as individually indexed
+        ``:Observation`` nodes ("node"), which keeps appends independent of the
+        number of existing observations.
+
+        With an ``embedder`` (see ``embedding.py``) every entity also keeps an
+        ``embedding`` in the ``memory_embedding`` vector index, refreshed by the
+        writes that change its text, and ``semantic_search`` is available.
+
+        With a ``namespace`` every query only sees and writes the entities of
+        that tenant, through a ``namespace`` property backed by composite
+        indexes, and ``scoped`` switches tenants per request. Without one the
+        whole graph is visible, which is also the only way to reach data
+        written before namespaces were enabled.
+
+        A ``budget`` sets the transaction timeout of every query and caps the
+        entities, relations and bytes of graph reads; ``limited`` applies one
+        per call. Capped reads are cut short with ``truncated`` set and, when
+        a node limit orders them by name, a ``nextCursor`` to continue from. A timeout raises
+        ``BudgetExceeded``.
+
+        Read-only queries are routed to followers and read replicas
+        (``RoutingControl.READ``) and carry the bookmarks of the driver's
+        query bookmark manager, so a read waits for every write this server
+        made before it. ``routing_stats`` counts queries per access mode and
+        per server.
+
+        Writes stamp what they change with the version of their transaction,
+        derived from the database clock, and ``read_changes_since`` reports
+        changes up to ``change_lag_ms`` before its own start.
+        """
+        if observation_storage not in OBSERVATION_STORAGE_MODES:
+            raise ValueError(f"Unknown observation storage: {observation_storage}")
+        _check_namespace(namespace)
         self.neo4j_driver = neo4j_driver
-        self.create_fulltext_index()
+        self.is_async = isinstance(neo4j_driver, neo4j.AsyncDriver)
+        self._owns_executor = False
+        self._executor = executor
+        if not self.is_async and self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="neo4j-memory")
+            self._owns_executor = True
+        self.fetch_size = fetch_size
+        self.relation_chunk_size = relation_chunk_size
+        self.delete_chunk_size = delete_chunk_size
+        self.cache = cache
+        self.observation_storage = observation_storage
+        self.embedder = embedder
+        self.namespace = namespace
+        self.budget = budget
+        self.change_lag_ms = change_lag_ms
+        self.query_metadata: Optional[Dict[str, Any]] = None
+        # Shared with the scoped copies, which reuse the schema bootstrap
+        self._schema = {"ready": False}
+        self.routing = RoutingStats()
 
-    def create_fulltext_index(self):
+    def scoped(self, namespace: str) -> "Neo4jMemory":
+        """A view of the same driver, cache and executor limited to ``namespace``."""
+        if self.namespace is None:
+            raise ValueError("Namespaces are not enabled, start the server with --namespace")
+        _check_namespace(namespace)
+        if namespace == self.namespace:
+            return self
+        view = copy.copy(self)
+        view.namespace = namespace
+        view._owns_executor = False
+        return view
+
+    def limited(self, budget: Optional[QueryBudget], metadata: Optional[Dict[str, Any]] = None) -> "Neo4jMemory":
+        """A view of this memory whose queries run under ``budget``.
+
+        ``metadata`` is attached to the transactions, e.g. to find them in
+        ``SHOW TRANSACTIONS`` and the query log.
+        """
+        view = copy.copy(self)
+        view.budget = budget
+        view.query_metadata = metadata
+        view._owns_executor = False
+        return view
+
+    def _transaction(self, query: str):
+        """Attach the timeout and metadata of the budget to ``query``."""
+        timeout = self.budget.timeout if self.budget is not None else None
+        if timeout is None and self.query_metadata is None:
+            return query
+        return neo4j.Query(query, metadata=self.query_metadata, timeout=timeout)
+
+    def _timed_out(self, error: neo4j.exceptions.Neo4jError) -> bool:
+        return self.budget is not None and "TransactionTimedOut" in (error.code or "")
+
+    def _scope(self, query: str, params: Optional[Dict[str, Any]]):
+        if self.namespace is None:
+            return query, params
+        for pattern, replacement in _NAMESPACE_SCOPES:
+            query = pattern.sub(replacement, query)
+        params = dict(params or {})
+        params["namespace"] = self.namespace
+        return query, params
+
+    def _cache_names(self, names: Iterable[str]) -> Iterable[str]:
+        if self.namespace is None:
+            return names
+        return [f"{self.namespace}\x00{name}" for name in names]
+
+    async def _run_query(self, query: str, params: Optional[Dict[str, Any]] = None, read: bool = False, **kwargs):
+        routing = neo4j.RoutingControl.READ if read else neo4j.RoutingControl.WRITE
+        if self.is_async:
+            result = await self.neo4j_driver.execute_query(query, params, routing_=routing, **kwargs)
+        else:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._executor,
+                functools.partial(self.neo4j_driver.execute_query, query, params, routing_=routing, **kwargs)
+            )
+        self.routing.record("read" if read else "write", result.summary)
+        return result
+
+    async def _execute_query(self, query: str, params: Optional[Dict[str, Any]] = None, read: bool = False, **kwargs):
+        # Schema bootstrap is idempotent, so a race between concurrent first calls is harmless
+        if not self._schema["ready"]:
+            await self.create_schema()
+        query, params = self._scope(query, params)
+        try:
+            return await self._run_query(self._transaction(query), params, read, **kwargs)
+        except neo4j.exceptions.Neo4jError as e:
+            if self._timed_out(e):
+                raise BudgetExceeded("timeout", self.budget.timeout) from e
+            raise
+
+    async def _stream_query(self, query: str, params: Optional[Dict[str, Any]] = None):
+        """Yield records one by one instead of collecting the whole result."""
+        if not self._schema["ready"]:
+            await self.create_schema()
+        query, params = self._scope(query, params)
+        try:
+            async with aclosing(self._stream_records(self._transaction(query), params)) as records:
+                async for record in records:
+                    yield record
+        except neo4j.exceptions.Neo4jError as e:
+            if self._timed_out(e):
+                raise BudgetExceeded("timeout", self.budget.timeout) from e
+            raise
+
+    def _read_session(self):
+        # Streams are only used for reads; the bookmarks keep them behind this server's writes
+        return self.neo4j_driver.session(
+            fetch_size=self.fetch_size,
+            default_access_mode=neo4j.READ_ACCESS,
+            bookmark_manager=self.neo4j_driver.execute_query_bookmark_manager
+        )
+
+    async def _stream_records(self, query, params: Optional[Dict[str, Any]]):
+        if self.is_async:
+            async with self._read_session() as session:
+                result = await session.run(query, params)
+                try:
+                    async for record in result:
+                        yield record
+                except GeneratorExit:
+                    # Closed early: consuming discards the rest, as closing the session would
+                    self.routing.record("read", await result.consume())
+                    raise
+                except BaseException:
+                    self.routing.record("read", None)
+                    raise
+                self.routing.record("read", await result.consume())
+            return
+
+        # Sync driver: pull one fetch_size batch at a time on the thread pool
+        loop = asyncio.get_running_loop()
+        session = self._read_session()
+        try:
+            result = await loop.run_in_executor(self._executor, session.run, query, params)
+            try:
+                while True:
+                    records = await loop.run_in_executor(self._executor, result.fetch, self.fetch_size)
+                    if not records:
+                        break
+                    for record in records:
+                        yield record
+            except GeneratorExit:
+                self.routing.record("read", await loop.run_in_executor(self._executor, result.consume))
+                raise
+            except BaseException:
+                self.routing.record("read", None)
+                raise
+            self.routing.record("read", await loop.run_in_executor(self._executor, result.consume))
+        finally:
+            await loop.run_in_executor(self._executor, session.close)
+
+    async def create_schema(self):
+        if self.namespace is None:
+            await self.create_name_constraint()
+            await self.create_fulltext_index()
+        else:
+            await self.create_namespace_indexes()
+        await self.create_version_indexes()
+        if self.observation_storage == "node":
+            await self.create_observation_indexes()
+        if self.embedder is not None:
+            await self.create_vector_index()
+        self._schema["ready"] = True
+
+    async def create_namespace_indexes(self):
+        # Names are unique per tenant; the composite indexes lead with the
+        # namespace so lookups and change scans only touch the tenant's entries.
+        # The name-only memory_name constraint would keep tenants from reusing
+        # names, so the composite constraint replaces it.
+        result = await self._run_query("SHOW CONSTRAINTS YIELD name WHERE name = 'memory_name' RETURN name", read=True)
+        if result.records:
+            await self._run_query("DROP CONSTRAINT memory_name IF EXISTS")
+            logger.warning("Dropped the memory_name constraint, names are now unique per namespace")
+        for query in (
+            "CREATE CONSTRAINT memory_namespace_name IF NOT EXISTS FOR (m:Memory) REQUIRE (m.namespace, m.name) IS UNIQUE",
+            "CREATE INDEX memory_namespace_version IF NOT EXISTS FOR (m:Memory) ON (m.namespace, m.version)",
+            "CREATE INDEX memory_namespace_relations_version IF NOT EXISTS FOR (m:Memory) ON (m.namespace, m.relationsVersion)",
+            "CREATE INDEX memory_tombstone_namespace_version IF NOT EXISTS FOR (t:MemoryTombstone) ON (t.namespace, t.version)",
+            "CREATE FULLTEXT INDEX namespaced_search IF NOT EXISTS FOR (m:Memory) ON EACH [m.name, m.type, m.observations, m.namespace]"
+        ):
+            await self._run_query(query)
+        logger.info("Created namespace constraint and indexes")
+
+    @property
+    def _search_index(self) -> str:
+        return "search" if self.namespace is None else "namespaced_search"
+
+    def _search_filter(self, filter_query: str, entity_types: Optional[List[str]] = None) -> str:
+        """Lucene query for ``filter_query``, limited to the namespace and entity types inside the index.
+
+        The type clause matches types containing the phrase, so the exact
+        label check still follows it in Cypher.
+        """
+        clauses = []
+        if self.namespace is not None:
+            clauses.append(f"+namespace:{self.namespace}")
+        if entity_types:
+            clauses.append("+type:(" + " OR ".join(_lucene_phrase(t) for t in dict.fromkeys(entity_types)) + ")")
+        if not clauses:
+            return filter_query
+        return " ".join(clauses) + f" +({filter_query})"
+
+    async def create_version_indexes(self):
+        # Range indexes behind read_changes_since; relation changes are found
+        # through their source entity since relationship types are dynamic
+        for query in (
+            "CREATE INDEX memory_version IF NOT EXISTS FOR (m:Memory) ON (m.version)",
+            "CREATE INDEX memory_relations_version IF NOT EXISTS FOR (m:Memory) ON (m.relationsVersion)",
+            "CREATE INDEX memory_tombstone_version IF NOT EXISTS FOR (t:MemoryTombstone) ON (t.version)"
+        ):
+            await self._run_query(query)
+        logger.info("Created change tracking indexes")
+
+    async def create_observation_indexes(self):
+        await self._run_query("""
+        CREATE CONSTRAINT observation_key IF NOT EXISTS FOR (o:Observation) REQUIRE o.key IS UNIQUE
+        """)
+        await self._run_query("""
+        CREATE FULLTEXT INDEX observation_search IF NOT EXISTS FOR (o:Observation) ON EACH [o.content]
+        """)
+        logger.info("Created Observation key constraint and fulltext index")
+
+    async def create_vector_index(self):
+        await self._run_query(f"""
+        CREATE VECTOR INDEX memory_embedding IF NOT EXISTS FOR (m:Memory) ON m.embedding
+        OPTIONS {{ indexConfig: {{
+            `vector.dimensions`: {int(self.embedder.dimensions)},
+            `vector.similarity_function`: 'cosine'
+        }} }}
+        """)
+        logger.info("Created Memory.embedding vector index")
+
+    @property
+    def _observations_expr(self) -> str:
+        """Cypher expression for the observation list of ``entity``."""
+        if self.observation_storage == "node":
+            return """COLLECT {
+                    MATCH (entity)-[:HAS_OBSERVATION]->(o:Observation)
+                    RETURN o.content ORDER BY o.created, o.pos
+                }"""
+        return "entity.observations"
+
+    async def create_name_constraint(self):
+        # Backs MERGE and every exact name lookup with an index seek
+        query = """
+        CREATE CONSTRAINT memory_name IF NOT EXISTS FOR (m:Memory) REQUIRE m.name IS UNIQUE
+        """
+        try:
+            await self._run_query(query)
+            logger.info("Created Memory.name uniqueness constraint")
+        except neo4j.exceptions.ClientError as e:
+            # Existing duplicate names prevent the constraint, lookups still work without it
+            logger.warning(f"Could not create Memory.name uniqueness constraint: {e}")
+
+    async def create_fulltext_index(self):
         try:
             # 创建全文搜索索引
             query = """
             CREATE FULLTEXT INDEX search IF NOT EXISTS FOR (m:Memory) ON EACH [m.name, m.type, m.observations];
             """
-            self.neo4j_driver.execute_query(query)
+            await self._run_query(query)
             logger.info("Created fulltext search index")
         except neo4j.exceptions.ClientError as e:
             if "An index with this name already exists" in str(e):
@@ -62,143 +675,977 @@ class Neo4jMemory:
             else:
                 raise e
 
-    async def load_graph(self, filter_query="*"):
-        query = """
-            CALL db.index.fulltext.queryNodes('search', $filter) yield node as entity, score
-            OPTIONAL MATCH (entity)-[r]-(other)
-            RETURN collect(distinct {
-                name: entity.name, 
-                type: entity.type, 
-                observations: entity.observations
-            }) as nodes,
-            collect({
-                source: startNode(r).name, 
-                target: endNode(r).name, 
-                relationType: type(r)
-            }) as relations
+    def _invalidate(self, names: Iterable[str], content_changed: bool = False):
+        if self.cache is not None:
+            self.cache.invalidate(self._cache_names(names), content_changed)
+
+    def cache_stats(self) -> Optional[Dict[str, int]]:
+        return self.cache.stats() if self.cache is not None else None
+
+    def routing_stats(self) -> Dict[str, Any]:
+        return self.routing.stats()
+
+    def pool_stats(self) -> Optional[Dict[str, Any]]:
+        return pool_stats(self.neo4j_driver)
+
+    async def close(self):
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+    async def load_graph(
+        self,
+        filter_query="*",
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        names: Optional[List[str]] = None,
+        top_k: Optional[int] = None,
+        min_score: Optional[float] = None,
+        entity_types: Optional[List[str]] = None,
+        relation_types: Optional[List[str]] = None
+    ):
+        """Load the entities matching ``filter_query`` with their relations.
+
+        When ``names`` is given the fulltext index is bypassed and entities are
+        looked up by exact name through the ``Memory.name`` constraint.
+
+        Without ``limit`` every match is returned. With ``limit`` entities are
+        returned in name order one page at a time and ``nextCursor`` is set
+        when more pages follow. Rows are streamed from the driver, one per
+        entity, so neither Neo4j nor this process materializes the full graph.
+
+        Fulltext searches return a ``SearchResult`` whose entities carry their
+        relevance score. ``min_score`` drops weak matches and ``top_k`` keeps
+        only the best ones, ordered by score; both apply before the
+        relationship expansion so only the winners' neighborhoods are read.
+
+        ``entity_types`` keeps only entities carrying one of these type labels
+        and ``relation_types`` only returns relations of these types. Both are
+        matched through label and relationship type scans; searches also
+        restrict the fulltext query to the types so Lucene ranks fewer hits.
+
+        With a cache configured, results are served from it until a write
+        touches one of their entities.
         """
-        
-        result = self.neo4j_driver.execute_query(query, {"filter": filter_query})
-        
-        if not result.records:
-            return KnowledgeGraph(entities=[], relations=[])
-        
-        record = result.records[0]
-        nodes = record.get('nodes')
-        rels = record.get('relations')
-        
-        entities = [
-            Entity(
-                name=node.get('name'),
-                type=node.get('type'),
-                observations=node.get('observations', [])
-            )
-            for node in nodes if node.get('name')
-        ]
-        
-        relations = [
-            Relation(
-                source=rel.get('source'),
-                target=rel.get('target'),
-                relationType=rel.get('relationType')
-            )
-            for rel in rels if rel.get('source') and rel.get('target') and rel.get('relationType')
-        ]
-        
+        args = (filter_query, limit, cursor, names, top_k, min_score, entity_types, relation_types)
+        if self.cache is None:
+            return await self._load_graph(*args)
+
+        caps = (self.budget.max_nodes, self.budget.max_relations, self.budget.max_bytes) if self.budget is not None else None
+        key = (
+            self.namespace, caps, filter_query, limit, cursor, tuple(names) if names is not None else None, top_k, min_score,
+            tuple(entity_types) if entity_types else None, tuple(relation_types) if relation_types else None
+        )
+        graph = self.cache.get(key)
+        if graph is not None:
+            return graph
+
+        generation = self.cache.generation
+        graph = await self._load_graph(*args)
+        touched = {e.name for e in graph.entities}
+        touched.update(r.source for r in graph.relations)
+        touched.update(r.target for r in graph.relations)
+        # Names that were not found must invalidate too once they get created
+        touched.update(names or ())
+        self.cache.put(key, graph, self._cache_names(touched), _graph_size(graph), by_name=names is not None, generation=generation)
+        return graph
+
+    async def _load_graph(
+        self,
+        filter_query="*",
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        names: Optional[List[str]] = None,
+        top_k: Optional[int] = None,
+        min_score: Optional[float] = None,
+        entity_types: Optional[List[str]] = None,
+        relation_types: Optional[List[str]] = None
+    ):
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be a positive integer")
+        if top_k is not None and top_k < 1:
+            raise ValueError("top_k must be a positive integer")
+        if top_k is not None and cursor:
+            raise ValueError("top_k results are ordered by score and cannot be combined with a cursor")
+        after = decode_cursor(cursor) if cursor else None
+        search = names is None and filter_query != "*"
+
+        budget = self.budget if self.budget is not None and self.budget.caps_results else None
+        max_nodes = budget.max_nodes if budget is not None else None
+        if max_nodes is not None:
+            limit = min(limit, max_nodes) if limit is not None else None
+            top_k = min(top_k, max_nodes) if top_k is not None else None
+        # Reads with a node limit are ordered by name so a cut short result can
+        # be continued; without one they are not sorted, which would read the whole graph
+        capped_page = top_k is None and names is None and limit is None and max_nodes is not None
+        if capped_page:
+            limit = max_nodes
+        ordered = top_k is None and names is None and limit is not None
+
+        type_filter = f"AND (entity:{_type_expression(entity_types)})" if entity_types else ""
+        relation_filter = f":{_type_expression(relation_types)}" if relation_types else ""
+
+        if names is not None:
+            match = "UNWIND $names AS lookup MATCH (entity:Memory { name: lookup }) WITH entity, null AS score"
+        elif filter_query == "*" and entity_types:
+            # Filter inside the MATCH so it is planned as a label scan
+            match = f"MATCH (entity:Memory) WHERE (entity:{_type_expression(entity_types)}) WITH entity, null AS score"
+            type_filter = ""
+        elif filter_query == "*":
+            match = "MATCH (entity:Memory) WITH entity, null AS score"
+        elif self.observation_storage == "node":
+            # Observation text lives in its own index and maps back to its entity
+            match = f"""CALL () {{
+                CALL db.index.fulltext.queryNodes('{self._search_index}', $filter) YIELD node, score
+                RETURN node AS entity, score
+                UNION ALL
+                CALL db.index.fulltext.queryNodes('observation_search', $observationFilter) YIELD node, score
+                MATCH (entity:Memory)-[:HAS_OBSERVATION]->(node)
+                RETURN entity, score
+            }}
+            WITH entity, max(score) AS score"""
+        elif top_k is not None and not entity_types:
+            # Let Lucene stop after the best hits
+            match = f"CALL db.index.fulltext.queryNodes('{self._search_index}', $filter, {{limit: $topK}}) YIELD node AS entity, score"
+        else:
+            match = f"CALL db.index.fulltext.queryNodes('{self._search_index}', $filter) YIELD node AS entity, score"
+
+        page = ""
+        order = ""
+        if top_k is not None:
+            page = "WITH entity, score ORDER BY score DESC LIMIT $topK"
+            order = "ORDER BY score DESC"
+        elif limit is not None:
+            # Fetch one extra entity to know whether another page follows
+            page = "WITH entity, score ORDER BY entity.name LIMIT $limit"
+            order = "ORDER BY name"
+
+        query = f"""
+            {match}
+            WHERE entity.name IS NOT NULL
+                AND ($after IS NULL OR entity.name > $after)
+                AND ($minScore IS NULL OR score >= $minScore)
+                {type_filter}
+            {page}
+            OPTIONAL MATCH (entity)-[r{relation_filter}]-(:Memory)
+            WITH entity, score, collect(r) AS rels
+            RETURN entity.name AS name,
+                entity.type AS type,
+                {self._observations_expr} AS observations,
+                [rel IN rels | {{
+                    source: startNode(rel).name,
+                    target: endNode(rel).name,
+                    relationType: type(rel)
+                }}] AS relations,
+                score
+            {order}
+        """
+        params = {
+            "filter": self._search_filter(filter_query, entity_types),
+            # Observation nodes carry no namespace; the entity MATCH scopes their hits
+            "observationFilter": filter_query,
+            "names": list(dict.fromkeys(names)) if names is not None else None,
+            "after": after,
+            "limit": limit + 1 if limit is not None else None,
+            "topK": top_k,
+            "minScore": min_score
+        }
+
+        entities = []
+        relations = []
+        seen_relations = set()
+        next_cursor = None
+        meter = _ResultMeter(budget)
+
+        async with aclosing(self._stream_query(query, params)) as records:
+            async for record in records:
+                if top_k is None and limit is not None and len(entities) == limit:
+                    next_cursor = encode_cursor(entities[-1].name)
+                    if capped_page:
+                        meter.exceeded = "nodes"
+                    break
+
+                fields = dict(
+                    name=record.get('name'),
+                    type=record.get('type'),
+                    observations=record.get('observations') or []
+                )
+                entity = _trusted(ScoredEntity, **fields, score=record.get('score')) if search else _trusted(Entity, **fields)
+                if not _add_entity(meter, entity, record.get('relations'), entities, relations, seen_relations):
+                    if ordered:
+                        next_cursor = encode_cursor(entities[-1].name)
+                    break
+
         logger.debug(f"Loaded entities: {entities}")
         logger.debug(f"Loaded relations: {relations}")
-        
-        return KnowledgeGraph(entities=entities, relations=relations)
+
+        if search:
+            return _trusted(SearchResult, entities=entities, relations=relations, nextCursor=next_cursor, truncated=meter.exceeded)
+        return _trusted(KnowledgeGraph, entities=entities, relations=relations, nextCursor=next_cursor, truncated=meter.exceeded)
 
     async def create_entities(self, entities: List[Entity]) -> List[Entity]:
+        return (await self.write_entities(entities)).entities
+
+    async def write_entities(self, entities: List[Entity]) -> EntityWriteSummary:
+        """Create or overwrite entities, skipping the ones that would not change.
+
+        Each entity stores a ``contentHash`` of its type and observations.
+        Entities whose stored hash matches are not written at all, so
+        re-asserting known entities costs one index lookup each instead of a
+        property rewrite, a transaction log entry and fulltext re-indexing.
+        Writes that change observations in place clear the hash.
+        """
+        if self.observation_storage == "node":
+            write = """
+            MERGE (e:Memory { name: entity.name })
+            FOREACH (previous IN CASE WHEN e.type <> entity.type AND e.type <> 'Memory' THEN [e.type] ELSE [] END | REMOVE e:$(previous))
+            SET e.type = entity.type, e.contentHash = entity.contentHash, e.version = v
+            SET e:$(entity.type)
+            WITH changed, e, entity
+            CALL (e, entity) {
+                OPTIONAL MATCH (e)-[:HAS_OBSERVATION]->(old:Observation)
+                WHERE NOT old.key IN [item IN entity.observations | item.key]
+                DETACH DELETE old
+            }
+            CALL (e, entity) {
+                UNWIND entity.observations as item
+                MERGE (o:Observation { key: item.key })
+                ON CREATE SET o.content = item.content, o.created = timestamp(), o.pos = item.pos
+                MERGE (e)-[:HAS_OBSERVATION]->(o)
+            }
+            """
+            entities_data = {
+                entity.name: {
+                    "name": entity.name,
+                    "type": entity.type,
+                    "observations": _observation_items(entity.name, entity.observations, self.namespace),
+                    "contentHash": content_hash(entity)
+                }
+                for entity in entities
+            }
+        else:
+            write = """
+            MERGE (e:Memory { name: entity.name })
+            FOREACH (previous IN CASE WHEN e.type <> entity.type AND e.type <> 'Memory' THEN [e.type] ELSE [] END | REMOVE e:$(previous))
+            SET e += entity {.type, .observations, .contentHash}, e.version = v
+            SET e:$(entity.type)
+            """
+            entities_data = {
+                entity.name: {**entity.model_dump(), "contentHash": content_hash(entity)}
+                for entity in entities
+            }
+
         query = """
         UNWIND $entities as entity
-        MERGE (e:Memory { name: entity.name })
-        SET e += entity {.type, .observations}
-        SET e:$(entity.type)
+        OPTIONAL MATCH (existing:Memory { name: entity.name })
+        WITH entity, existing
+        WHERE existing IS NULL OR existing.contentHash IS NULL OR existing.contentHash <> entity.contentHash
+        WITH collect(entity { .*, created: existing IS NULL }) as changed
+        WHERE size(changed) > 0
+        WITH """ + TRANSACTION_VERSION + """ as v, changed
+        UNWIND changed as entity
+        """ + write + """
+        WITH changed, count(*) as written
+        RETURN [c IN changed WHERE c.created | c.name] as created, [c IN changed WHERE NOT c.created | c.name] as updated
         """
-        
-        entities_data = [entity.model_dump() for entity in entities]
-        self.neo4j_driver.execute_query(query, {"entities": entities_data})
-        return entities
+
+        created: List[str] = []
+        updated: List[str] = []
+        try:
+            # Later duplicates of a name win, as they would with sequential MERGEs
+            result = await self._execute_query(query, {"entities": list(entities_data.values())})
+            if result.records:
+                created = result.records[0].get("created")
+                updated = result.records[0].get("updated")
+        except BaseException:
+            self._invalidate([entity.name for entity in entities], content_changed=True)
+            raise
+        changed = set(created) | set(updated)
+        if changed:
+            self._invalidate(changed, content_changed=True)
+        if self.embedder is not None:
+            await self._write_embeddings([entity.model_dump() for entity in entities if entity.name in changed])
+
+        return EntityWriteSummary(
+            entities=entities,
+            created=len(created),
+            updated=len(updated),
+            unchanged=len(entities_data) - len(changed),
+            created_names=created,
+            updated_names=updated
+        )
 
     async def create_relations(self, relations: List[Relation]) -> List[Relation]:
-        for relation in relations:
-            query = """
-            UNWIND $relations as relation
-            MATCH (from:Memory),(to:Memory)
-            WHERE from.name = relation.source
-            AND  to.name = relation.target
-            MERGE (from)-[r:$(relation.relationType)]->(to)
-            """
-            
-            self.neo4j_driver.execute_query(
-                query, 
-                {"relations": [relation.model_dump() for relation in relations]}
+        summary = await self.write_relations(relations)
+        return summary.relations
+
+    async def write_relations(self, relations: List[Relation], chunk_size: Optional[int] = None) -> RelationWriteSummary:
+        """MERGE relations with one UNWIND statement per chunk.
+
+        Rows are grouped by relationType so every statement carries a single
+        type parameter and reuses the same cached plan. Relations whose source
+        or target entity does not exist are reported as dropped.
+        """
+        chunk_size = chunk_size or self.relation_chunk_size
+        query = NEXT_VERSION + """
+        UNWIND $rows as row
+        MATCH (from:Memory { name: row.source })
+        MATCH (to:Memory { name: row.target })
+        MERGE (from)-[r:$($relationType)]->(to)
+        ON CREATE SET r.version = v, from.relationsVersion = v
+        RETURN collect(row.i) as written
+        """
+
+        by_type: Dict[str, List[Dict[str, Any]]] = {}
+        for i, relation in enumerate(relations):
+            by_type.setdefault(relation.relationType, []).append(
+                {"i": i, "source": relation.source, "target": relation.target}
             )
-        
-        return relations
 
-    async def add_observations(self, observations: List[ObservationAddition]) -> List[Dict[str, Any]]:
-        query = """
-        UNWIND $observations as obs  
-        MATCH (e:Memory { name: obs.entityName })
-        WITH e, [o in obs.contents WHERE NOT o IN e.observations] as new
-        SET e.observations = coalesce(e.observations,[]) + new
-        RETURN e.name as name, new
+        written = set()
+        created = 0
+        try:
+            for relation_type, rows in by_type.items():
+                for start in range(0, len(rows), chunk_size):
+                    result = await self._execute_query(
+                        query,
+                        {"rows": rows[start:start + chunk_size], "relationType": relation_type}
+                    )
+                    written.update(result.records[0].get("written"))
+                    created += result.summary.counters.relationships_created
+        finally:
+            self._invalidate(_relation_endpoints(relations))
+
+        summary = RelationWriteSummary(
+            relations=[relation for i, relation in enumerate(relations) if i in written],
+            created=created,
+            matched=len(written) - created,
+            dropped=[relation for i, relation in enumerate(relations) if i not in written]
+        )
+        logger.debug(f"Wrote relations: created={summary.created} matched={summary.matched} dropped={len(summary.dropped)}")
+        return summary
+
+    async def add_observations(self, observations: List[ObservationAddition], indexed: bool = False) -> List[Dict[str, Any]]:
+        """Add new observations, returning a row per existing entity in input order.
+
+        With ``indexed`` every row also carries the position of its input
+        under ``index``, which lets a caller that merged several requests hand
+        the rows back.
         """
+        if self.observation_storage == "node":
+            # Each append is a key lookup plus one node, whatever the observation count
+            query = NEXT_VERSION + """
+            UNWIND range(0, size($observations) - 1) as index
+            WITH v, index, $observations[index] as obs
+            MATCH (e:Memory { name: obs.entityName })
+            CALL (e, obs) {
+                UNWIND obs.contents as item
+                OPTIONAL MATCH (existing:Observation { key: item.key })
+                WITH e, item WHERE existing IS NULL
+                CREATE (e)-[:HAS_OBSERVATION]->(:Observation {
+                    key: item.key, content: item.content, created: timestamp(), pos: item.pos
+                })
+                RETURN collect(item.content) as new
+            }
+            SET e.version = CASE WHEN size(new) > 0 THEN v ELSE e.version END,
+                e.contentHash = CASE WHEN size(new) > 0 THEN null ELSE e.contentHash END
+            RETURN index, e.name as name, new
+            """
+            observations_data = [
+                {"entityName": obs.entityName, "contents": _observation_items(obs.entityName, obs.contents, self.namespace)}
+                for obs in observations
+            ]
+        else:
+            # Contents are grouped with the stored list instead of testing each
+            # one with IN, which scans the list; grouping is a hash aggregation
+            query = NEXT_VERSION + """
+            UNWIND range(0, size($observations) - 1) as index
+            WITH v, index, $observations[index] as obs
+            MATCH (e:Memory { name: obs.entityName })
+            CALL (e, obs) {
+                UNWIND [o IN coalesce(e.observations, []) | {content: o, pos: -1}]
+                    + [i IN range(0, size(obs.contents) - 1) | {content: obs.contents[i], pos: i}] as entry
+                WITH entry.content as content, min(entry.pos) as pos
+                WHERE pos >= 0
+                WITH content ORDER BY pos
+                RETURN collect(content) as new
+            }
+            SET e.observations = coalesce(e.observations, []) + new
+            SET e.version = CASE WHEN size(new) > 0 THEN v ELSE e.version END,
+                e.contentHash = CASE WHEN size(new) > 0 THEN null ELSE e.contentHash END
+            RETURN index, e.name as name, new
+            """
+            observations_data = [obs.model_dump() for obs in observations]
             
-        result = self.neo4j_driver.execute_query(
-            query, 
-            {"observations": [obs.model_dump() for obs in observations]}
-        )
+        try:
+            result = await self._execute_query(
+                query, 
+                {"observations": observations_data}
+            )
+        finally:
+            self._invalidate([obs.entityName for obs in observations], content_changed=True)
 
-        results = [{"entityName": record.get("name"), "addedObservations": record.get("new")} for record in result.records]
+        # Cypher doesn't promise UNWIND order in the output, the input index does
+        records = sorted(result.records, key=lambda record: record.get("index"))
+        results = [{"entityName": record.get("name"), "addedObservations": record.get("new")} for record in records]
+        await self.refresh_embeddings([r["entityName"] for r in results if r["addedObservations"]])
+        if indexed:
+            for record, row in zip(records, results):
+                row["index"] = record.get("index")
         return results
 
-    async def delete_entities(self, entity_names: List[str]) -> None:
-        query = """
+    async def count_entity_deletion(self, entity_names: List[str]) -> Dict[str, int]:
+        """What deleting ``entity_names`` would remove, read from the relationship degree store.
+
+        ``relationships`` leaves out the ``HAS_OBSERVATION`` links counted as
+        ``observations``, and counts a relation between two of the entities once.
+        """
+        names = list(dict.fromkeys(entity_names))
+        result = await self._execute_query("""
         UNWIND $entities as name
         MATCH (e:Memory { name: name })
-        DETACH DELETE e
+        RETURN count(e) as entities,
+            sum(COUNT { (e)-[]-() }) as degree,
+            sum(COUNT { (e)-[:HAS_OBSERVATION]->() }) as observations
+        """, {"entities": names}, read=True)
+        record = result.records[0] if result.records else None
+        if record is None or not record.get("entities"):
+            return {"entities": 0, "relationships": 0, "observations": 0}
+        observations = record.get("observations") or 0
+        relationships = (record.get("degree") or 0) - observations
+        if len(names) > 1:
+            # Relations between the entities were counted from both ends
+            result = await self._execute_query("""
+            UNWIND $entities as name
+            MATCH (e:Memory { name: name })-[]->(other:Memory)
+            WHERE other.name IN $entities AND other <> e
+            RETURN count(*) as shared
+            """, {"entities": names}, read=True)
+            relationships -= result.records[0].get("shared") if result.records else 0
+        return {"entities": record.get("entities"), "relationships": relationships, "observations": observations}
+
+    async def delete_entities(
+        self,
+        entity_names: List[str],
+        chunk_size: Optional[int] = None,
+        dry_run: bool = False,
+        progress: Optional[Callable[[int, int], Awaitable[None]]] = None
+    ) -> Dict[str, int]:
+        """Delete entities with their relations and observations in bounded transactions.
+
+        Relationships of the entities are deleted ``chunk_size`` at a time
+        first, so a hub with a huge number of relations never builds one huge
+        transaction, then the entities themselves ``chunk_size`` names per
+        transaction. The delete is therefore not atomic: an interrupted call
+        can leave entities with part of their relations removed, and running
+        it again finishes the job.
+
+        Returns the entities, relationships and observations that are (or,
+        with ``dry_run``, would be) removed. ``progress`` is awaited after
+        every transaction with the entities and relationships done so far
+        and their total.
         """
-        
-        self.neo4j_driver.execute_query(query, {"entities": entity_names})
+        names = list(dict.fromkeys(entity_names))
+        chunk_size = chunk_size or self.delete_chunk_size
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+        counts = await self.count_entity_deletion(names)
+        if dry_run or counts["entities"] == 0:
+            return counts
 
-    async def delete_observations(self, deletions: List[ObservationDeletion]) -> None:
-        query = """
-        UNWIND $deletions as d  
-        MATCH (e:Memory { name: d.entityName })
-        SET e.observations = [o in coalesce(e.observations,[]) WHERE NOT o IN d.observations]
+        total = counts["entities"] + counts["relationships"]
+        done = 0
+        # Relationships are detached first when one transaction would hold too many
+        # Observation links are deleted along but only relations are counted
+        detach = """
+        UNWIND $entities as name
+        MATCH (e:Memory { name: name })-[r]-()
+        WITH DISTINCT r
+        LIMIT $limit
+        WITH collect(r) as rels
+        WITH rels,
+            [r IN rels WHERE type(r) = 'HAS_OBSERVATION' | endNode(r)] as observations,
+            size([r IN rels WHERE type(r) <> 'HAS_OBSERVATION']) as relationships
+        FOREACH (r IN rels | DELETE r)
+        FOREACH (o IN observations | DETACH DELETE o)
+        RETURN size(rels) as deleted, relationships
+        """
+        # The tombstone of an entity also stands for all of its relations,
+        # which are counted before DETACH DELETE removes them
+        delete = NEXT_VERSION + """
+        UNWIND $entities as name
+        MATCH (e:Memory { name: name })
+        OPTIONAL MATCH (e)-[r]-() WHERE type(r) <> 'HAS_OBSERVATION'
+        WITH v, collect(DISTINCT e) as entities, collect(DISTINCT r) as rels
+        CALL (v, entities) {
+            UNWIND entities as e
+            OPTIONAL MATCH (e)-[:HAS_OBSERVATION]->(o:Observation)
+            WITH v, e, collect(o) as observations
+            CREATE (:MemoryTombstone { kind: 'entity', name: e.name, version: v })
+            DETACH DELETE e
+            FOREACH (o IN observations | DETACH DELETE o)
+        }
+        RETURN size(entities) as deleted, size(rels) as relationships
         """
-        self.neo4j_driver.execute_query(
-            query, 
-            {
-                "deletions": [deletion.model_dump() for deletion in deletions]
+
+        try:
+            if counts["relationships"] + counts["observations"] > chunk_size:
+                while True:
+                    result = await self._execute_query(detach, {"entities": names, "limit": chunk_size})
+                    record = result.records[0] if result.records else None
+                    deleted = record.get("deleted") if record else 0
+                    done += record.get("relationships") if record else 0
+                    logger.info(f"Deleted {done} of {total} relationships and entities")
+                    if progress is not None:
+                        await progress(min(done, total), total)
+                    if deleted < chunk_size:
+                        break
+            for start in range(0, len(names), chunk_size):
+                result = await self._execute_query(delete, {"entities": names[start:start + chunk_size]})
+                record = result.records[0] if result.records else None
+                done += record.get("deleted") + record.get("relationships") if record else 0
+                if progress is not None:
+                    await progress(min(done, total), total)
+        finally:
+            self._invalidate(names)
+        return counts
+
+    async def delete_observations(self, deletions: List[ObservationDeletion]) -> List[Dict[str, Any]]:
+        """Delete observations and return, per entity, the ones that were actually removed."""
+        if self.observation_storage == "node":
+            query = NEXT_VERSION + """
+            UNWIND $deletions as d
+            MATCH (e:Memory { name: d.entityName })
+            CALL (e, d) {
+                UNWIND d.keys as key
+                MATCH (e)-[:HAS_OBSERVATION]->(o:Observation { key: key })
+                WITH o, o.content as content
+                DETACH DELETE o
+                RETURN collect(content) as removed
             }
-        )
+            SET e.version = CASE WHEN size(removed) > 0 THEN v ELSE e.version END,
+                e.contentHash = CASE WHEN size(removed) > 0 THEN null ELSE e.contentHash END
+            RETURN e.name as name, removed
+            """
+            deletions_data = [
+                {
+                    "entityName": deletion.entityName,
+                    "keys": [observation_key(deletion.entityName, content, self.namespace) for content in deletion.observations]
+                }
+                for deletion in deletions
+            ]
+        else:
+            # Stored observations are grouped with the deleted ones, a hash
+            # aggregation, and put back in order; duplicates keep their places
+            query = NEXT_VERSION + """
+            UNWIND $deletions as d
+            MATCH (e:Memory { name: d.entityName })
+            CALL (e, d) {
+                WITH coalesce(e.observations, []) as current
+                UNWIND [o IN d.observations | {content: o, pos: -1}]
+                    + [i IN range(0, size(current) - 1) | {content: current[i], pos: i}] as entry
+                WITH entry.content as content, min(entry.pos) < 0 as deleted, collect(entry.pos) as positions
+                UNWIND positions as pos
+                WITH content, deleted, pos
+                WHERE pos >= 0
+                WITH content, deleted ORDER BY pos
+                WITH collect({content: content, deleted: deleted}) as entries
+                RETURN [entry IN entries WHERE NOT entry.deleted | entry.content] as kept,
+                    [entry IN entries WHERE entry.deleted | entry.content] as removed
+            }
+            SET e.observations = CASE WHEN size(removed) > 0 THEN kept ELSE e.observations END,
+                e.version = CASE WHEN size(removed) > 0 THEN v ELSE e.version END,
+                e.contentHash = CASE WHEN size(removed) > 0 THEN null ELSE e.contentHash END
+            RETURN e.name as name, removed
+            """
+            deletions_data = [deletion.model_dump() for deletion in deletions]
+        try:
+            result = await self._execute_query(
+                query, 
+                {
+                    "deletions": deletions_data
+                }
+            )
+        finally:
+            self._invalidate([deletion.entityName for deletion in deletions])
+
+        results = [{"entityName": record.get("name"), "deletedObservations": record.get("removed")} for record in result.records]
+        await self.refresh_embeddings([r["entityName"] for r in results if r["deletedObservations"]])
+        return results
 
     async def delete_relations(self, relations: List[Relation]) -> None:
-        query = """
+        query = NEXT_VERSION + """
         UNWIND $relations as relation
-        MATCH (source:Memory)-[r:$(relation.relationType)]->(target:Memory)
-        WHERE source.name = relation.source
-        AND target.name = relation.target
+        MATCH (source:Memory { name: relation.source })-[r:$(relation.relationType)]->(target:Memory { name: relation.target })
         DELETE r
+        CREATE (:MemoryTombstone {
+            kind: 'relation',
+            source: relation.source,
+            target: relation.target,
+            relationType: relation.relationType,
+            version: v
+        })
+        """
+        try:
+            await self._execute_query(
+                query, 
+                {"relations": [relation.model_dump() for relation in relations]}
+            )
+        finally:
+            self._invalidate(_relation_endpoints(relations))
+
+    async def _embed(self, texts: List[str]) -> List[List[float]]:
+        # Embedders may be CPU bound, keep them off the event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.embedder.embed, texts)
+
+    async def _store_embeddings(self, rows: List[Dict[str, Any]]):
+        """Embed and store ``rows`` of name/type/observations."""
+        vectors = await self._embed([entity_text(row["name"], row["type"], row["observations"]) for row in rows])
+        await self._execute_query("""
+        UNWIND $rows as row
+        MATCH (e:Memory { name: row.name })
+        CALL db.create.setNodeVectorProperty(e, 'embedding', row.embedding)
+        """, {"rows": [{"name": row["name"], "embedding": vector} for row, vector in zip(rows, vectors)]})
+
+    async def _write_embeddings(self, rows: List[Dict[str, Any]]):
+        # The write itself has already succeeded, so a failure is only logged and
+        # the embedding stays stale until the next write to the entity
+        if not rows:
+            return
+        try:
+            await self._store_embeddings(rows)
+        except Exception as e:
+            logger.warning(f"Could not update embeddings of {len(rows)} entities: {e}")
+
+    async def refresh_embeddings(self, names: List[str]):
+        """Re-embed ``names`` from their stored text."""
+        if self.embedder is None or not names:
+            return
+        result = await self._execute_query(f"""
+        UNWIND $names as lookup
+        MATCH (entity:Memory {{ name: lookup }})
+        RETURN entity.name as name, entity.type as type, {self._observations_expr} as observations
+        """, {"names": list(dict.fromkeys(names))})
+        await self._write_embeddings([record.data() for record in result.records])
+
+    async def backfill_embeddings(self, batch_size: int = 500) -> int:
+        """Embed every entity that has no embedding yet, ``batch_size`` at a time."""
+        if self.embedder is None:
+            raise ValueError("No embedder configured")
+        query = f"""
+        MATCH (entity:Memory) WHERE entity.embedding IS NULL AND entity.name IS NOT NULL
+        RETURN entity.name as name, entity.type as type, {self._observations_expr} as observations
+        LIMIT $batch
+        """
+        embedded = 0
+        while True:
+            result = await self._execute_query(query, {"batch": batch_size})
+            if not result.records:
+                break
+            rows = [record.data() for record in result.records]
+            await self._store_embeddings(rows)
+            embedded += len(rows)
+            logger.info(f"Embedded {embedded} entities")
+        return embedded
+
+    async def semantic_search(
+        self,
+        query: str,
+        top_k: int = 10,
+        min_score: Optional[float] = None,
+        fuse: bool = False
+    ) -> SearchResult:
+        """Find the ``top_k`` entities whose embedding is closest to ``query``.
+
+        Scores are cosine similarities and ``min_score`` applies to them. With
+        ``fuse`` the vector ranking is combined with the fulltext ranking by
+        reciprocal rank fusion and the fused value becomes the score.
+        """
+        if self.embedder is None:
+            raise ValueError("Semantic search is not enabled, start the server with --embedder")
+        [embedding] = await self._embed([query])
+        # The vector index spans all tenants, so a namespace over-fetches and filters
+        candidates = top_k if self.namespace is None else top_k * NAMESPACE_VECTOR_OVERFETCH
+        result = await self._execute_query("""
+        CALL db.index.vector.queryNodes('memory_embedding', $candidates, $embedding) YIELD node, score
+        WHERE ($minScore IS NULL OR score >= $minScore)
+            AND ($namespace IS NULL OR node.namespace = $namespace)
+        RETURN node.name as name, score
+        ORDER BY score DESC
+        LIMIT $topK
+        """, {"candidates": candidates, "topK": top_k, "embedding": embedding, "minScore": min_score, "namespace": self.namespace}, read=True)
+        scores = {record.get("name"): record.get("score") for record in result.records}
+
+        if fuse:
+            keyword = await self.search_nodes(_lucene_escape(query), top_k=top_k)
+            scores = fuse_rankings([list(scores), [entity.name for entity in keyword.entities]], top_k)
+
+        return _scored_result(await self.load_graph(names=list(scores)), scores)
+
+    async def iter_entities(self) -> AsyncIterator[Entity]:
+        """Stream every entity without loading the graph into memory."""
+        query = f"""
+        MATCH (entity:Memory)
+        WHERE entity.name IS NOT NULL
+        RETURN entity.name as name, entity.type as type, {self._observations_expr} as observations
+        """
+        async with aclosing(self._stream_query(query)) as records:
+            async for record in records:
+                yield _trusted(
+                    Entity,
+                    name=record.get("name"),
+                    type=record.get("type"),
+                    observations=record.get("observations") or []
+                )
+
+    async def iter_relations(self) -> AsyncIterator[Relation]:
+        """Stream every relation between two entities."""
+        query = """
+        MATCH (source:Memory)-[r]->(target:Memory)
+        RETURN source.name as source, target.name as target, type(r) as relationType
+        """
+        async with aclosing(self._stream_query(query)) as records:
+            async for record in records:
+                yield _trusted(
+                    Relation,
+                    source=record.get("source"),
+                    target=record.get("target"),
+                    relationType=record.get("relationType")
+                )
+
+    async def migrate_observations(self, batch_size: int = 1000) -> int:
+        """Move list-property observations onto ``:Observation`` nodes.
+
+        Runs one transaction per ``batch_size`` entities and can be
+        interrupted and restarted; returns the number of migrated entities.
+        """
+        await self.create_observation_indexes()
+        read_query = """
+        MATCH (e:Memory) WHERE e.observations IS NOT NULL AND e.name IS NOT NULL
+        RETURN e.name as name, e.observations as observations
+        LIMIT $batch
+        """
+        write_query = """
+        UNWIND $entities as entity
+        MATCH (e:Memory { name: entity.name })
+        CALL (e, entity) {
+            UNWIND entity.observations as item
+            MERGE (o:Observation { key: item.key })
+            ON CREATE SET o.content = item.content, o.created = timestamp(), o.pos = item.pos
+            MERGE (e)-[:HAS_OBSERVATION]->(o)
+        }
+        REMOVE e.observations
+        """
+        migrated = 0
+        while True:
+            result = await self._execute_query(read_query, {"batch": batch_size})
+            if not result.records:
+                break
+            entities_data = [
+                {
+                    "name": record.get("name"),
+                    "observations": _observation_items(record.get("name"), record.get("observations"), self.namespace)
+                }
+                for record in result.records
+            ]
+            await self._execute_query(write_query, {"entities": entities_data})
+            migrated += len(entities_data)
+            logger.info(f"Migrated observations of {migrated} entities")
+
+        if self.cache is not None:
+            self.cache.clear()
+        return migrated
+
+    async def expand_nodes(
+        self,
+        names: List[str],
+        max_depth: int = 2,
+        fan_out: Union[int, List[int]] = 25,
+        relation_types: Optional[List[str]] = None,
+        max_nodes: int = 200,
+        entity_types: Optional[List[str]] = None
+    ) -> KnowledgeGraph:
+        """Breadth-first neighborhood of ``names`` in a single query.
+
+        Each hop follows at most ``fan_out`` new neighbors per frontier node
+        (a list gives one cap per hop), only across ``relation_types`` and
+        into entities of ``entity_types`` when given, and stops adding nodes
+        once ``max_nodes`` are collected. The result holds the visited
+        entities and the relations among them.
+        """
+        if not 1 <= max_depth <= MAX_EXPAND_DEPTH:
+            raise ValueError(f"max_depth must be between 1 and {MAX_EXPAND_DEPTH}")
+        if max_nodes < 1:
+            raise ValueError("max_nodes must be a positive integer")
+        budget = self.budget if self.budget is not None and self.budget.caps_results else None
+        if budget is not None and budget.max_nodes is not None:
+            max_nodes = min(max_nodes, budget.max_nodes)
+        fan_outs = fan_out if isinstance(fan_out, list) else [fan_out] * max_depth
+        if len(fan_outs) != max_depth or any(f < 1 for f in fan_outs):
+            raise ValueError("fan_out must be a positive integer or one positive integer per hop")
+
+        relation_filter = f":{_type_expression(relation_types)}" if relation_types else ""
+        type_filter = f"(next:{_type_expression(entity_types)}) AND" if entity_types else ""
+
+        # The traversal is unrolled per hop so every hop can cap its own fan-out
+        hops = "".join(f"""
+            CALL (frontier, visited) {{
+                UNWIND frontier AS node
+                CALL (node, visited) {{
+                    MATCH (node)-[r{relation_filter}]-(next:Memory)
+                    WHERE {type_filter} NOT next IN visited
+                    RETURN DISTINCT next
+                    LIMIT $fanOut{hop}
+                }}
+                RETURN collect(DISTINCT next) AS found
+            }}
+            WITH visited, found[..($maxNodes - size(visited))] AS found
+            WITH visited + found AS visited, found AS frontier
+        """ for hop in range(max_depth))
+
+        query = f"""
+            UNWIND $names AS lookup
+            MATCH (seed:Memory {{ name: lookup }})
+            WITH collect(DISTINCT seed)[..$maxNodes] AS seeds
+            WITH seeds AS visited, seeds AS frontier
+            {hops}
+            UNWIND visited AS entity
+            OPTIONAL MATCH (entity)-[r{relation_filter}]-(other:Memory)
+            WHERE other IN visited
+            WITH entity, collect(r) AS rels
+            RETURN entity.name AS name,
+                entity.type AS type,
+                {self._observations_expr} AS observations,
+                [rel IN rels | {{
+                    source: startNode(rel).name,
+                    target: endNode(rel).name,
+                    relationType: type(rel)
+                }}] AS relations
+        """
+        params = {
+            "names": list(dict.fromkeys(names)),
+            "maxNodes": max_nodes,
+            **{f"fanOut{hop}": cap for hop, cap in enumerate(fan_outs)}
+        }
+
+        entities = []
+        relations = []
+        seen_relations = set()
+        meter = _ResultMeter(budget)
+        async with aclosing(self._stream_query(query, params)) as records:
+            async for record in records:
+                entity = _trusted(
+                    Entity,
+                    name=record.get('name'),
+                    type=record.get('type'),
+                    observations=record.get('observations') or []
+                )
+                if not _add_entity(meter, entity, record.get('relations'), entities, relations, seen_relations):
+                    break
+
+        return _trusted(KnowledgeGraph, entities=entities, relations=relations, nextCursor=None, truncated=meter.exceeded)
+
+    async def read_changes_since(self, version: int = 0) -> ChangeSet:
+        """Entities, relations and tombstones written after ``version``.
+
+        The returned ``version`` trails the database clock by
+        ``change_lag_ms``, so passing it to the next call never skips a write
+        whose transaction started earlier but committed later, as long as it
+        ran for less than the lag; items written within the lag are repeated
+        and are meant to be applied idempotently in version order. Version 0
+        returns the whole graph, including data written before versioning.
+        An entity tombstone also removes every relation of that entity.
+        """
+        result = await self._execute_query("RETURN timestamp() as now", read=True)
+        current = max(version, (result.records[0].get("now") - self.change_lag_ms) * 1000 - 1)
+
+        if version > 0:
+            entities_query = f"""
+            MATCH (entity:Memory) WHERE entity.version > $since
+            RETURN entity.name as name, entity.type as type, {self._observations_expr} as observations, entity.version as version
+            """
+            relations_query = """
+            MATCH (source:Memory) WHERE source.relationsVersion > $since
+            MATCH (source)-[r]->(target:Memory) WHERE r.version > $since
+            RETURN source.name as source, target.name as target, type(r) as relationType, r.version as version
+            """
+        else:
+            entities_query = f"""
+            MATCH (entity:Memory) WHERE entity.name IS NOT NULL
+            RETURN entity.name as name, entity.type as type, {self._observations_expr} as observations, entity.version as version
+            """
+            relations_query = """
+            MATCH (source:Memory)-[r]->(target:Memory)
+            RETURN source.name as source, target.name as target, type(r) as relationType, r.version as version
+            """
+        tombstones_query = """
+        MATCH (t:MemoryTombstone) WHERE t.version > $since
+        RETURN t { .kind, .version, .name, .source, .target, .relationType } as tombstone
+        ORDER BY t.version
         """
-        self.neo4j_driver.execute_query(
-            query, 
-            {"relations": [relation.model_dump() for relation in relations]}
+        params = {"since": version}
+
+        entities = []
+        async with aclosing(self._stream_query(entities_query, params)) as records:
+            async for record in records:
+                entities.append(_trusted(
+                    VersionedEntity,
+                    name=record.get("name"),
+                    type=record.get("type"),
+                    observations=record.get("observations") or [],
+                    version=record.get("version")
+                ))
+        relations = []
+        async with aclosing(self._stream_query(relations_query, params)) as records:
+            async for record in records:
+                relations.append(_trusted(VersionedRelation, **record.data()))
+        tombstones = []
+        if version > 0:
+            async with aclosing(self._stream_query(tombstones_query, params)) as records:
+                async for record in records:
+                    tombstones.append(_trusted(Tombstone, **record.get("tombstone")))
+
+        return _trusted(ChangeSet, version=current, entities=entities, relations=relations, tombstones=tombstones)
+
+    async def prune_tombstones(self, before_version: int) -> int:
+        """Delete tombstones up to ``before_version`` once every mirror has synced past it."""
+        result = await self._execute_query(
+            "MATCH (t:MemoryTombstone) WHERE t.version <= $before DELETE t",
+            {"before": before_version}
         )
+        return result.summary.counters.nodes_deleted
 
-    async def read_graph(self) -> KnowledgeGraph:
-        return await self.load_graph()
+    async def read_graph(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        entity_types: Optional[List[str]] = None,
+        relation_types: Optional[List[str]] = None
+    ) -> KnowledgeGraph:
+        return await self.load_graph(limit=limit, cursor=cursor, entity_types=entity_types, relation_types=relation_types)
 
-    async def search_nodes(self, query: str) -> KnowledgeGraph:
-        return await self.load_graph(query)
+    async def search_nodes(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        top_k: Optional[int] = None,
+        min_score: Optional[float] = None,
+        entity_types: Optional[List[str]] = None,
+        relation_types: Optional[List[str]] = None
+    ) -> SearchResult:
+        return await self.load_graph(
+            query,
+            limit=limit,
+            cursor=cursor,
+            top_k=top_k,
+            min_score=min_score,
+            entity_types=entity_types,
+            relation_types=relation_types
+        )
 
     async def find_nodes(self, names: List[str]) -> KnowledgeGraph:
-        return await self.load_graph("name: (" + " ".join(names) + ")")
+        return await self.load_graph(names=names)
 
 # Flask app initialization
 app = Flask(__name__)
@@ -211,13 +1658,17 @@ def health_check():
     return jsonify({
         "status": "ok",
         "service": "mcp-neo4j-memory",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "cache": memory.cache_stats() if memory is not None else None,
+        "journal": getattr(memory, "journal_stats", lambda: None)(),
+        "routing": getattr(memory, "routing_stats", lambda: None)(),
+        "pool": getattr(memory, "pool_stats", lambda: None)()
     })
 
 # Register handlers
 @server.list_tools()
 async def handle_list_tools() -> List[types.Tool]:
-    return [
+    tools = [
         types.Tool(
             name="create_entities",
             description="Create multiple new entities in the knowledge graph",
@@ -300,7 +1751,8 @@ async def handle_list_tools() -> List[types.Tool]:
                     "entityNames": {
                         "type": "array",
                         "items": {"type": "string", "description": "An array of entity names to delete"}
-                    }
+                    },
+                    "dryRun": {"type": "boolean", "description": "Only count the entities, relationships and observations that would be deleted"}
                 },
                 "required": ["entityNames"]
             }
@@ -354,19 +1806,51 @@ async def handle_list_tools() -> List[types.Tool]:
         ),
         types.Tool(
             name="read_graph",
-            description="Read the entire knowledge graph",
+            description="Read the entire knowledge graph, optionally one page at a time",
             inputSchema={
                 "type": "object",
-                "properties": {}
+                "properties": {
+                    "limit": {"type": "integer", "minimum": 1, "description": "Maximum number of entities to return in this page"},
+                    "cursor": {"type": "string", "description": "The nextCursor returned by the previous page"},
+                    "types": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Only return entities of these types"
+                    },
+                    "relationTypes": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Only return relations of these types"
+                    },
+                    "format": {
+                        "type": "string",
+                        "enum": list(GRAPH_FORMATS),
+                        "description": "rows (default) returns entity and relation objects, columnar returns columns indexing into tables of names and types"
+                    }
+                }
             }
         ),
         types.Tool(
             name="search_nodes",
-            description="Search for nodes in the knowledge graph based on a query",
+            description="Search for nodes in the knowledge graph based on a query. Each entity is returned with its relevance score",
             inputSchema={
                 "type": "object",
                 "properties": {
-                    "query": {"type": "string", "description": "The search query to match against entity names, types, and observation content"}
+                    "query": {"type": "string", "description": "The search query to match against entity names, types, and observation content"},
+                    "limit": {"type": "integer", "minimum": 1, "description": "Maximum number of entities to return in this page"},
+                    "cursor": {"type": "string", "description": "The nextCursor returned by the previous page"},
+                    "topK": {"type": "integer", "minimum": 1, "description": "Return only the k most relevant entities, ordered by score"},
+                    "minScore": {"type": "number", "description": "Drop entities whose relevance score is below this threshold"},
+                    "types": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Only return entities of these types"
+                    },
+                    "relationTypes": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Only return relations of these types"
+                    }
                 },
                 "required": ["query"]
             }
@@ -384,61 +1868,251 @@ async def handle_list_tools() -> List[types.Tool]:
                 },
                 "required": ["names"]
             }
+        ),
+        types.Tool(
+            name="expand_nodes",
+            description="Explore the neighborhood of entities up to a number of hops, returning the reached entities and the relations among them",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "names": {
+                        "type": "array",
+                        "items": {"type": "string", "description": "An array of entity names to start from"}
+                    },
+                    "maxDepth": {"type": "integer", "minimum": 1, "maximum": MAX_EXPAND_DEPTH, "description": "Number of hops to follow (default 2)"},
+                    "fanOut": {
+                        "anyOf": [
+                            {"type": "integer", "minimum": 1},
+                            {"type": "array", "items": {"type": "integer", "minimum": 1}}
+                        ],
+                        "description": "Maximum new neighbors followed per entity on each hop, or one limit per hop (default 25)"
+                    },
+                    "relationTypes": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Only follow relations of these types"
+                    },
+                    "types": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Only reach entities of these types"
+                    },
+                    "maxNodes": {"type": "integer", "minimum": 1, "description": "Maximum number of entities returned (default 200)"}
+                },
+                "required": ["names"]
+            }
+        ),
+        types.Tool(
+            name="semantic_search",
+            description="Find the entities closest in meaning to a query, even when they share no keywords with it. Each entity is returned with its similarity score",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {"type": "string", "description": "Natural language description of what to find"},
+                    "topK": {"type": "integer", "minimum": 1, "description": "Number of entities to return (default 10)"},
+                    "minScore": {"type": "number", "description": "Drop entities whose cosine similarity is below this threshold"},
+                    "fuse": {"type": "boolean", "description": "Combine the ranking with the keyword search of search_nodes"}
+                },
+                "required": ["query"]
+            }
+        ),
+        types.Tool(
+            name="read_changes_since",
+            description="Return the entities, relations and deletions written after a graph version, to keep a mirror of the graph in sync",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "version": {"type": "integer", "minimum": 0, "description": "The version returned by the previous call, 0 for a full sync"}
+                },
+                "required": ["version"]
+            }
         )
     ]
+    if bulk_root is not None:
+        tools += [
+            types.Tool(
+                name="import_graph",
+                description="Import entities and relations from an NDJSON file in the server's bulk directory, resuming an interrupted import",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "path": {"type": "string", "description": "Path of the NDJSON file with entity and relation lines, relative to the bulk directory"},
+                        "chunkSize": {"type": "integer", "minimum": 1, "description": "Lines written per transaction"},
+                        "resume": {"type": "boolean", "description": "Continue from the last checkpoint if one exists (default true)"}
+                    },
+                    "required": ["path"]
+                }
+            ),
+            types.Tool(
+                name="export_graph",
+                description="Export the entire knowledge graph to an NDJSON file in the server's bulk directory",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "path": {"type": "string", "description": "Path of the NDJSON file to write, relative to the bulk directory"}
+                    },
+                    "required": ["path"]
+                }
+            )
+        ]
+    if memory is not None and memory.namespace is not None:
+        for tool in tools:
+            tool.inputSchema["properties"]["namespace"] = {
+                "type": "string",
+                "description": f"Tenant namespace to work in (default {memory.namespace})"
+            }
+    return tools
+
+def _progress_reporter() -> Optional[Callable[[int, int], Awaitable[None]]]:
+    """Send MCP progress notifications for the current tool call, if the client asked for them."""
+    try:
+        context = server.request_context
+    except LookupError:
+        return None
+    token = context.meta.progressToken if context.meta is not None else None
+    if token is None:
+        return None
+
+    async def report(done: int, total: int):
+        await context.session.send_progress_notification(token, done, total)
+    return report
+
+def _bulk_path(path: str) -> str:
+    """Resolve a bulk tool ``path`` inside ``bulk_root``, rejecting anything that ends up outside it."""
+    if bulk_root is None:
+        raise ValueError("Bulk import and export are disabled, start the server with --bulk-dir to enable them")
+    root = os.path.realpath(bulk_root)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if resolved == root or os.path.commonpath([root, resolved]) != root:
+        raise ValueError(f"Path is outside the bulk directory: {path}")
+    return resolved
+
+def _text_result(value: Any) -> List[types.TextContent]:
+    return [types.TextContent(type="text", text=encoder.encode(value))]
 
 @server.call_tool()
 async def handle_call_tool(
     name: str, arguments: Dict[str, Any] | None
 ) -> List[types.TextContent | types.ImageContent]:
     try:
-        if not arguments:
+        if not arguments and name != "read_graph":
             raise ValueError(f"No arguments provided for tool: {name}")
+        arguments = arguments or {}
+        target = memory
+        if arguments.get("namespace") is not None:
+            target = memory.scoped(arguments["namespace"])
+        budget = tool_budgets.get(name, default_budget)
+        if budget is not None:
+            target = target.limited(budget, {"tool": name})
 
         if name == "create_entities":
             entities = [Entity(**entity) for entity in arguments.get("entities", [])]
-            result = await memory.create_entities(entities)
-            return [types.TextContent(type="text", text=json.dumps([e.model_dump() for e in result], indent=2))]
+            result = await target.write_entities(entities)
+            return _text_result(result.model_dump(exclude_none=True))
             
         elif name == "create_relations":
             relations = [Relation(**relation) for relation in arguments.get("relations", [])]
-            result = await memory.create_relations(relations)
-            return [types.TextContent(type="text", text=json.dumps([r.model_dump() for r in result], indent=2))]
+            result = await target.write_relations(relations)
+            return _text_result(result.model_dump(exclude_none=True))
             
         elif name == "add_observations":
             observations = [ObservationAddition(**obs) for obs in arguments.get("observations", [])]
-            result = await memory.add_observations(observations)
-            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+            result = await target.add_observations(observations)
+            return _text_result(result)
             
         elif name == "delete_entities":
-            await memory.delete_entities(arguments.get("entityNames", []))
-            return [types.TextContent(type="text", text="Entities deleted successfully")]
+            result = await target.delete_entities(
+                arguments.get("entityNames", []),
+                dry_run=arguments.get("dryRun", False),
+                progress=_progress_reporter()
+            )
+            return _text_result({**result, "dryRun": arguments.get("dryRun", False)})
             
         elif name == "delete_observations":
             deletions = [ObservationDeletion(**deletion) for deletion in arguments.get("deletions", [])]
-            await memory.delete_observations(deletions)
-            return [types.TextContent(type="text", text="Observations deleted successfully")]
+            result = await target.delete_observations(deletions)
+            return _text_result(result)
             
         elif name == "delete_relations":
             relations = [Relation(**relation) for relation in arguments.get("relations", [])]
-            await memory.delete_relations(relations)
+            result = await target.delete_relations(relations)
+            if result is not None:
+                # Journaled, not deleted yet
+                return _text_result(result)
             return [types.TextContent(type="text", text="Relations deleted successfully")]
             
         elif name == "read_graph":
-            result = await memory.read_graph()
-            return [types.TextContent(type="text", text=json.dumps(result.model_dump(), indent=2))]
+            result = await target.read_graph(
+                arguments.get("limit"),
+                arguments.get("cursor"),
+                arguments.get("types"),
+                arguments.get("relationTypes")
+            )
+            if arguments.get("format", "rows") == "columnar":
+                return _text_result(to_columnar(dump_result(result)))
+            return _text_result(dump_result(result))
             
         elif name == "search_nodes":
-            result = await memory.search_nodes(arguments.get("query", ""))
-            return [types.TextContent(type="text", text=json.dumps(result.model_dump(), indent=2))]
+            result = await target.search_nodes(
+                arguments.get("query", ""),
+                arguments.get("limit"),
+                arguments.get("cursor"),
+                arguments.get("topK"),
+                arguments.get("minScore"),
+                arguments.get("types"),
+                arguments.get("relationTypes")
+            )
+            return _text_result(dump_result(result))
             
         elif name == "find_nodes":
-            result = await memory.find_nodes(arguments.get("names", []))
-            return [types.TextContent(type="text", text=json.dumps(result.model_dump(), indent=2))]
+            result = await target.find_nodes(arguments.get("names", []))
+            return _text_result(dump_result(result))
+            
+        elif name == "expand_nodes":
+            result = await target.expand_nodes(
+                arguments.get("names", []),
+                arguments.get("maxDepth", 2),
+                arguments.get("fanOut", 25),
+                arguments.get("relationTypes"),
+                arguments.get("maxNodes", 200),
+                arguments.get("types")
+            )
+            return _text_result(dump_result(result))
+
+        elif name == "semantic_search":
+            result = await target.semantic_search(
+                arguments.get("query", ""),
+                arguments.get("topK", 10),
+                arguments.get("minScore"),
+                arguments.get("fuse", False)
+            )
+            return _text_result(dump_result(result))
+
+        elif name == "read_changes_since":
+            result = await target.read_changes_since(arguments.get("version", 0))
+            return _text_result(dump_result(result))
+
+        elif name == "import_graph":
+            from .bulk import import_graph
+            result = await import_graph(
+                target,
+                _bulk_path(arguments["path"]),
+                arguments.get("chunkSize", 1000),
+                arguments.get("resume", True)
+            )
+            return _text_result(result)
+
+        elif name == "export_graph":
+            from .bulk import export_graph
+            result = await export_graph(target, _bulk_path(arguments["path"]))
+            return _text_result(result)
             
         else:
             raise ValueError(f"Unknown tool: {name}")
             
+    except BudgetExceeded as e:
+        logger.warning(f"Tool call {name} exceeded its budget: {e}")
+        return _text_result(e.to_dict())
     except Exception as e:
         logger.error(f"Error handling tool call: {e}")
         return [types.TextContent(type="text", text=f"Error: {str(e)}")]
@@ -467,30 +2141,122 @@ def mcp_endpoint():
 
 # Global memory instance
 memory = None
+encoder = ResultEncoder()
+# Per-call limits; tools without their own entry use the default
+default_budget: Optional[QueryBudget] = None
+tool_budgets: Dict[str, QueryBudget] = {}
+# Directory the import_graph and export_graph tools are confined to; None disables them
+bulk_root: Optional[str] = None
 
-# Main function to be called from __init__.py
-async def main(neo4j_uri, neo4j_user, neo4j_password):
-    """Main entry point for the server."""
+def init_flask_memory(neo4j_uri, neo4j_user, neo4j_password, pool: Optional[PoolConfig] = None) -> "Neo4jMemory":
+    """Set up ``memory`` for the Flask app, with a blocking driver, in the process that serves it.
+
+    Drivers don't survive a fork, so WSGI servers call this in every worker.
+    """
     global memory
+    pool = pool or PoolConfig.from_env()
+    neo4j_driver = create_driver(neo4j_uri, (neo4j_user, neo4j_password), pool, sync=True)
+    neo4j_driver.verify_connectivity()
+    warm_up_sync(neo4j_driver, pool.warm_connections)
+    logger.info(f"Connected to Neo4j at {neo4j_uri}")
+    memory = Neo4jMemory(neo4j_driver)
+    return memory
+
+# Main function to be called from __init__.py
+async def main(
+    neo4j_uri,
+    neo4j_user,
+    neo4j_password,
+    sync_driver: bool = False,
+    cache_entries: int = 0,
+    cache_bytes: int = 64 * 1024 * 1024,
+    cache_ttl: float = 300.0,
+    observation_storage: str = "property",
+    encoder_backend: str = "auto",
+    compact: bool = False,
+    embedder=None,
+    batch_window: float = 0.0,
+    batch_max_items: int = 1000,
+    namespace: Optional[str] = None,
+    query_timeout: Optional[float] = None,
+    tool_timeouts: Optional[Dict[str, float]] = None,
+    max_nodes: Optional[int] = None,
+    max_relations: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    backend: str = "neo4j",
+    snapshot_path: Optional[str] = None,
+    delete_chunk_size: int = DELETE_CHUNK_SIZE,
+    journal_path: Optional[str] = None,
+    journal_batch_size: int = 500,
+    pool: Optional[PoolConfig] = None,
+    bulk_dir: Optional[str] = None
+):
+    """Main entry point for the server.
+
+    ``pool`` defaults to the pool settings of the NEO4J_* environment variables.
+    """
+    global memory, encoder, default_budget, tool_budgets, bulk_root
     
-    logger.info(f"Starting Neo4j Memory MCP Server with URI: {neo4j_uri}")
-    
-    # Connect to Neo4j
-    try:
-        neo4j_driver = GraphDatabase.driver(
-            neo4j_uri,
-            auth=(neo4j_user, neo4j_password)
-        )
+    neo4j_driver = None
+    if backend == "memory":
+        from .inmemory import InMemoryGraphMemory
+        if namespace is not None:
+            raise ValueError("Namespaces are not supported by the in-memory backend")
+        logger.info(f"Starting Neo4j Memory MCP Server with the in-memory backend, snapshot: {snapshot_path}")
+        memory = InMemoryGraphMemory(snapshot_path, embedder=embedder)
+    else:
+        logger.info(f"Starting Neo4j Memory MCP Server with URI: {neo4j_uri}")
 
-        # Verify connection
-        neo4j_driver.verify_connectivity()
-        logger.info(f"Connected to Neo4j at {neo4j_uri}")
-    except Exception as e:
-        logger.error(f"Failed to connect to Neo4j: {e}")
-        raise
+        # Connect to Neo4j; a blocking driver is offloaded to a thread pool by Neo4jMemory
+        pool = pool or PoolConfig.from_env()
+        neo4j_driver = create_driver(neo4j_uri, (neo4j_user, neo4j_password), pool, sync=sync_driver)
+        try:
+            if sync_driver:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, neo4j_driver.verify_connectivity)
+                await loop.run_in_executor(None, warm_up_sync, neo4j_driver, pool.warm_connections)
+            else:
+                await neo4j_driver.verify_connectivity()
+                await warm_up(neo4j_driver, pool.warm_connections)
 
-    # Initialize memory
-    memory = Neo4jMemory(neo4j_driver)
+            logger.info(f"Connected to Neo4j at {neo4j_uri}")
+        except Exception as e:
+            if journal_path is None:
+                logger.error(f"Failed to connect to Neo4j: {e}")
+                raise
+            # Writes wait in the journal until the database is reachable
+            logger.warning(f"Failed to connect to Neo4j, journaling writes to {journal_path} until it is available: {e}")
+
+        # Initialize memory
+        cache = GraphCache(cache_entries, cache_bytes, cache_ttl) if cache_entries > 0 and cache_ttl > 0 else None
+        memory = Neo4jMemory(
+            neo4j_driver,
+            cache=cache,
+            observation_storage=observation_storage,
+            embedder=embedder,
+            namespace=namespace,
+            delete_chunk_size=delete_chunk_size
+        )
+    if batch_window > 0:
+        memory = WriteBatcher(memory, batch_window, batch_max_items)
+    if journal_path is not None:
+        from .journal import WriteJournal
+        logger.info(f"Journaling writes to {journal_path}")
+        memory = WriteJournal(memory, journal_path, journal_batch_size)
+        memory.start()
+
+    budget = QueryBudget(timeout=query_timeout, max_nodes=max_nodes, max_relations=max_relations, max_bytes=max_bytes)
+    if budget.timeout is not None or budget.caps_results:
+        default_budget = budget
+    tool_budgets = {
+        tool: budget.model_copy(update={"timeout": timeout})
+        for tool, timeout in (tool_timeouts or {}).items()
+    }
+    if bulk_dir is not None:
+        bulk_root = os.path.realpath(bulk_dir)
+        logger.info(f"Bulk import and export confined to {bulk_root}")
+    encoder = ResultEncoder(encoder_backend, compact)
+    logger.info(f"Encoding results with {encoder.backend}{' (compact)' if compact else ''}")
     
     # Start the server
     try:
@@ -505,7 +2271,13 @@ async def main(neo4j_uri, neo4j_user, neo4j_password):
         logger.error(f"Error running server: {e}")
         raise
     finally:
-        neo4j_driver.close()
+        await memory.close()
+        # The in-memory backend has no driver
+        if neo4j_driver is not None:
+            if sync_driver:
+                neo4j_driver.close()
+            else:
+                await neo4j_driver.close()
         logger.info("Server shut down")
 
 # For running the Flask app directly
@@ -0,0 +1,134 @@
+import asyncio
+import pytest
+from mcp_neo4j_memory.batching import WriteBatcher
+from mcp_neo4j_memory.server import Entity, EntityWriteSummary, ObservationAddition
+
+
+class RecordingMemory:
+    """Records every call; entity names starting with "bad" make a call fail."""
+
+    def __init__(self, existing=()):
+        self.calls = []
+        self.existing = set(existing)
+
+    async def write_entities(self, entities):
+        self.calls.append(("write_entities", [e.name for e in entities]))
+        if any(e.name.startswith("bad") for e in entities):
+            raise ValueError("invalid entity")
+        created = [e.name for e in entities if e.name not in self.existing]
+        self.existing.update(e.name for e in entities)
+        return EntityWriteSummary(
+            entities=entities,
+            created=len(created),
+            unchanged=len(entities) - len(created),
+            created_names=created
+        )
+
+    async def add_observations(self, observations, indexed=False):
+        self.calls.append(("add_observations", [o.entityName for o in observations]))
+        rows = [
+            {"entityName": o.entityName, "addedObservations": o.contents, **({"index": i} if indexed else {})}
+            for i, o in enumerate(observations) if o.entityName in self.existing
+        ]
+        # The database is free to return rows in any order
+        return rows[::-1]
+
+    async def read_graph(self):
+        return "graph"
+
+    async def close(self):
+        self.calls.append(("close", []))
+
+
+def entity(name):
+    return Entity(name=name, type="Test", observations=[])
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_one_call():
+    memory = RecordingMemory()
+    batcher = WriteBatcher(memory, window=0.01)
+
+    results = await asyncio.gather(
+        batcher.create_entities([entity("a"), entity("b")]),
+        batcher.create_entities([entity("c")])
+    )
+    assert [[e.name for e in result] for result in results] == [["a", "b"], ["c"]]
+    assert memory.calls == [("write_entities", ["a", "b", "c"])]
+    assert batcher.batch_stats() == {"requests": 2, "batches": 1, "fallbacks": 0}
+
+    first, second = await asyncio.gather(
+        batcher.write_entities([entity("a"), entity("d")]),
+        batcher.write_entities([entity("e")])
+    )
+    assert (first.created, first.unchanged, first.created_names) == (1, 1, ["d"])
+    assert (second.created, second.unchanged) == (1, 0)
+    assert "created_names" not in first.model_dump()
+    assert await batcher.read_graph() == "graph"
+
+
+@pytest.mark.asyncio
+async def test_earlier_writes_of_a_name_are_superseded():
+    memory = RecordingMemory()
+    batcher = WriteBatcher(memory, window=0.01)
+
+    first, second = await asyncio.gather(
+        batcher.write_entities([entity("a"), entity("b")]),
+        batcher.write_entities([entity("a")])
+    )
+    assert memory.calls == [("write_entities", ["a", "b", "a"])]
+    assert (first.created, first.superseded, first.created_names) == (1, 1, ["b"])
+    assert (second.created, second.superseded, second.created_names) == (1, None, ["a"])
+
+
+@pytest.mark.asyncio
+async def test_observation_results_are_split_per_caller():
+    memory = RecordingMemory(existing={"a", "b"})
+    batcher = WriteBatcher(memory, window=0.01)
+
+    first, second, third = await asyncio.gather(
+        batcher.add_observations([ObservationAddition(entityName="a", contents=["1"])]),
+        batcher.add_observations([
+            ObservationAddition(entityName="missing", contents=["2"]),
+            ObservationAddition(entityName="a", contents=["3"])
+        ]),
+        batcher.add_observations([ObservationAddition(entityName="b", contents=["4"])])
+    )
+    assert first == [{"entityName": "a", "addedObservations": ["1"]}]
+    assert second == [{"entityName": "a", "addedObservations": ["3"]}]
+    assert third == [{"entityName": "b", "addedObservations": ["4"]}]
+    assert len(memory.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_replayed_per_request():
+    memory = RecordingMemory()
+    batcher = WriteBatcher(memory, window=0.01)
+
+    good, bad = await asyncio.gather(
+        batcher.create_entities([entity("a")]),
+        batcher.create_entities([entity("bad")]),
+        return_exceptions=True
+    )
+    assert [e.name for e in good] == ["a"]
+    assert isinstance(bad, ValueError)
+    assert memory.calls == [
+        ("write_entities", ["a", "bad"]),
+        ("write_entities", ["a"]),
+        ("write_entities", ["bad"])
+    ]
+
+
+@pytest.mark.asyncio
+async def test_size_bound_and_close_flush():
+    memory = RecordingMemory()
+    batcher = WriteBatcher(memory, window=60, max_items=2)
+
+    # Reaching max_items commits without waiting for the window
+    await asyncio.wait_for(batcher.create_entities([entity("a"), entity("b")]), 1)
+
+    pending = asyncio.ensure_future(batcher.create_entities([entity("c")]))
+    await asyncio.sleep(0)
+    await batcher.close()
+    assert [e.name for e in await pending] == ["c"]
+    assert memory.calls[-1] == ("close", [])
@@ -0,0 +1,147 @@
+import json
+import pytest
+from mcp_neo4j_memory.bulk import export_graph, import_graph, load_checkpoint, parse_line, read_ndjson, relation_line
+from mcp_neo4j_memory import server
+from mcp_neo4j_memory.server import Entity, Relation, RelationWriteSummary
+
+
+class RecordingMemory:
+    """Collects the chunks written by import_graph, optionally failing after some."""
+
+    def __init__(self, fail_after=None):
+        self.entity_chunks = []
+        self.relation_chunks = []
+        self.fail_after = fail_after
+        self.names = set()
+
+    async def create_entities(self, entities):
+        if self.fail_after is not None and len(self.entity_chunks) == self.fail_after:
+            raise RuntimeError("connection lost")
+        self.entity_chunks.append([e.name for e in entities])
+        self.names.update(e.name for e in entities)
+        return entities
+
+    async def write_relations(self, relations, chunk_size=None):
+        self.relation_chunks.append([(r.source, r.target) for r in relations])
+        written = [r for r in relations if r.source in self.names and r.target in self.names]
+        dropped = [r for r in relations if r not in written]
+        return RelationWriteSummary(relations=written, created=len(written), dropped=dropped)
+
+
+def write_lines(path, items):
+    path.write_text("".join(json.dumps(item) + "\n" for item in items))
+
+
+def test_parse_json_memory_lines():
+    entity = parse_line('{"type": "entity", "name": "Alice", "entityType": "Person", "observations": ["x"]}')
+    assert entity == Entity(name="Alice", type="Person", observations=["x"])
+
+    relation = parse_line('{"type": "relation", "from": "Alice", "to": "Bob", "relationType": "KNOWS"}')
+    assert relation == Relation(source="Alice", target="Bob", relationType="KNOWS")
+    assert parse_line(relation_line(relation)) == relation
+
+    assert parse_line("   ") is None
+    with pytest.raises(ValueError):
+        parse_line('{"type": "unknown"}')
+
+
+@pytest.mark.parametrize("line", [
+    '[1]',
+    '"x"',
+    '{"type": "entity", "name": "Alice", "observations": []}',
+    '{"type": "entity", "name": "Alice", "entityType": "", "observations": []}',
+    '{"type": "relation", "from": "Alice", "relationType": "KNOWS"}',
+    '{"type": "relation", "from": "Alice", "to": 7, "relationType": "KNOWS"}',
+])
+def test_invalid_lines_are_rejected(tmp_path, line):
+    with pytest.raises(ValueError):
+        parse_line(line)
+
+    path = tmp_path / "memory.jsonl"
+    path.write_text('{"type": "entity", "name": "A", "entityType": "T", "observations": []}\n' + line + "\n")
+    with pytest.raises(ValueError, match="invalid line 2"):
+        list(read_ndjson(str(path)))
+
+
+def test_bulk_paths_stay_in_the_bulk_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "bulk_root", None)
+    with pytest.raises(ValueError, match="--bulk-dir"):
+        server._bulk_path("memory.jsonl")
+
+    monkeypatch.setattr(server, "bulk_root", str(tmp_path))
+    assert server._bulk_path("exports/memory.jsonl") == str(tmp_path.resolve() / "exports" / "memory.jsonl")
+    for path in ["../memory.jsonl", "/etc/passwd", "exports/../../memory.jsonl", "."]:
+        with pytest.raises(ValueError, match="outside the bulk directory"):
+            server._bulk_path(path)
+    (tmp_path / "escape").symlink_to("/tmp")
+    with pytest.raises(ValueError, match="outside the bulk directory"):
+        server._bulk_path("escape/memory.jsonl")
+
+
+def test_read_ndjson_from_offset(tmp_path):
+    path = tmp_path / "memory.jsonl"
+    write_lines(path, [
+        {"type": "entity", "name": "A", "entityType": "T", "observations": []},
+        {"type": "entity", "name": "B", "entityType": "T", "observations": []}
+    ])
+
+    offset, first = next(read_ndjson(str(path)))
+    assert first.name == "A"
+    assert [item.name for _, item in read_ndjson(str(path), offset)] == ["B"]
+
+
+@pytest.mark.asyncio
+async def test_import_resumes_from_checkpoint(tmp_path):
+    path = tmp_path / "memory.jsonl"
+    write_lines(path, [
+        {"type": "entity", "name": f"E{i}", "entityType": "T", "observations": []} for i in range(5)
+    ] + [
+        {"type": "relation", "from": "E0", "to": "E1", "relationType": "R"}
+    ])
+
+    failing = RecordingMemory(fail_after=1)
+    failing.names.update({"E0", "E1"})
+    with pytest.raises(RuntimeError):
+        await import_graph(failing, str(path), chunk_size=2)
+    assert failing.entity_chunks == [["E0", "E1"]]
+    assert load_checkpoint(str(path))["entities"] == 2
+
+    memory = RecordingMemory()
+    memory.names.update({"E0", "E1"})
+    result = await import_graph(memory, str(path), chunk_size=2)
+    assert memory.entity_chunks == [["E2", "E3"], ["E4"]]
+    assert memory.relation_chunks == [[("E0", "E1")]]
+    assert result == {"entities": 5, "relations": 1, "dropped": 0}
+    assert not (tmp_path / "memory.jsonl.checkpoint").exists()
+
+
+@pytest.mark.asyncio
+async def test_relations_before_their_entities_are_written_last(tmp_path):
+    path = tmp_path / "memory.jsonl"
+    write_lines(path, [
+        {"type": "relation", "from": "A", "to": "B", "relationType": "KNOWS"},
+        {"type": "relation", "from": "A", "to": "Nobody", "relationType": "KNOWS"},
+        {"type": "entity", "name": "A", "entityType": "T", "observations": []},
+        {"type": "entity", "name": "B", "entityType": "T", "observations": []},
+    ])
+
+    memory = RecordingMemory()
+    result = await import_graph(memory, str(path), chunk_size=2)
+    assert result == {"entities": 2, "relations": 1, "dropped": 1}
+    assert memory.relation_chunks[-1] == [("A", "B"), ("A", "Nobody")]
+    assert not (tmp_path / "memory.jsonl.deferred").exists()
+
+
+@pytest.mark.asyncio
+async def test_export_writes_in_batches(tmp_path):
+    class Graph:
+        async def iter_entities(self):
+            for name in "ABC":
+                yield Entity(name=name, type="T", observations=[])
+
+        async def iter_relations(self):
+            yield Relation(source="A", target="B", relationType="KNOWS")
+
+    path = tmp_path / "memory.jsonl"
+    assert await export_graph(Graph(), str(path), batch_size=2) == {"entities": 3, "relations": 1}
+    assert [item.name if isinstance(item, Entity) else item.target for _, item in read_ndjson(str(path))] == ["A", "B", "C", "B"]
@@ -0,0 +1,82 @@
+from mcp_neo4j_memory.cache import GraphCache
+
+
+def test_hit_and_miss_counters():
+    cache = GraphCache()
+    assert cache.get("a") is None
+    cache.put("a", "graph", ["Alice"], size=10)
+    assert cache.get("a") == "graph"
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+    assert stats["bytes"] == 10
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = GraphCache(max_entries=2, max_bytes=100)
+    cache.put("a", 1, ["A"], size=10)
+    cache.put("b", 2, ["B"], size=10)
+    cache.get("a")
+    cache.put("c", 3, ["C"], size=10)
+
+    # "b" was least recently used
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    cache.put("d", 4, ["D"], size=95)
+    assert cache.stats()["bytes"] <= 100
+    assert cache.stats()["evictions"] == 3
+
+    # Entries larger than the whole budget are never stored
+    cache.put("e", 5, ["E"], size=101)
+    assert cache.get("e") is None
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("mcp_neo4j_memory.cache.time.monotonic", lambda: now[0])
+
+    cache = GraphCache(ttl=5)
+    cache.put("a", 1, ["A"], size=1)
+    now[0] += 4
+    assert cache.get("a") == 1
+    now[0] += 2
+    assert cache.get("a") is None
+
+    # None never expires, 0 never stores
+    forever = GraphCache(ttl=None)
+    forever.put("a", 1, ["A"], size=1)
+    now[0] += 10 ** 9
+    assert forever.get("a") == 1
+    disabled = GraphCache(ttl=0)
+    disabled.put("a", 1, ["A"], size=1)
+    assert disabled.get("a") is None
+    assert disabled.stats()["entries"] == 0
+
+
+def test_invalidate_by_name():
+    cache = GraphCache()
+    cache.put("find-alice", 1, ["Alice"], size=1, by_name=True)
+    cache.put("find-bob", 2, ["Bob"], size=1, by_name=True)
+    cache.put("search-coffee", 3, ["Carol"], size=1)
+
+    cache.invalidate(["Alice"])
+    assert cache.get("find-alice") is None
+    assert cache.get("find-bob") == 2
+    assert cache.get("search-coffee") == 3
+
+    # New content may match any search, but not name lookups of other entities
+    cache.invalidate(["Dave"], content_changed=True)
+    assert cache.get("search-coffee") is None
+    assert cache.get("find-bob") == 2
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_put_skipped_after_concurrent_invalidation():
+    cache = GraphCache()
+    generation = cache.generation
+    cache.invalidate(["Alice"])
+    cache.put("find-alice", 1, ["Alice"], size=1, generation=generation)
+    assert cache.get("find-alice") is None
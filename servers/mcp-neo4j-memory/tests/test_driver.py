@@ -0,0 +1,52 @@
+import argparse
+from pathlib import Path
+import pytest
+from mcp_neo4j_memory import driver
+from mcp_neo4j_memory.driver import PoolConfig, add_pool_arguments, create_driver, pool_stats
+
+
+def parse(*argv):
+    parser = argparse.ArgumentParser()
+    add_pool_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def test_flags_override_the_environment():
+    environ = {
+        "NEO4J_MAX_CONNECTION_POOL_SIZE": "50",
+        "NEO4J_CONNECTION_ACQUISITION_TIMEOUT": "5",
+        "NEO4J_KEEP_ALIVE": "false",
+        "NEO4J_WARM_CONNECTIONS": "4",
+    }
+    config = PoolConfig.from_args(parse("--max-connection-pool-size", "20", "--keep-alive"), environ)
+    assert config == PoolConfig(max_connection_pool_size=20, connection_acquisition_timeout=5.0, keep_alive=True, warm_connections=4)
+    assert config.driver_options() == {"max_connection_pool_size": 20, "connection_acquisition_timeout": 5.0, "keep_alive": True}
+    assert PoolConfig.from_args(parse(), {}) == PoolConfig()
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_report_the_configured_pool():
+    driver = create_driver("bolt://localhost:7687", ("neo4j", "password"), PoolConfig(max_connection_pool_size=7, max_connection_lifetime=60))
+    try:
+        stats = pool_stats(driver)
+        assert stats["maxConnectionPoolSize"] == 7
+        assert stats["maxConnectionLifetime"] == 60
+        assert stats["servers"] == {}
+    finally:
+        await driver.close()
+    assert pool_stats(object()) is None
+
+
+# Copies of the factory for the cypher server and the deploy images
+COPIES = [
+    "servers/mcp-neo4j-cypher/src/mcp_neo4j_cypher/driver.py",
+    "deploy/mcp-neo4j-memory/src/driver.py",
+    "deploy/mcp-neo4j-cypher/src/driver.py",
+]
+
+
+@pytest.mark.parametrize("copy", COPIES)
+def test_copies_match_the_factory(copy):
+    root = Path(driver.__file__).resolve().parents[4]
+    original = Path(driver.__file__).read_text(encoding="utf-8")
+    assert (root / copy).read_text(encoding="utf-8") == original, f"{copy} differs, copy src/mcp_neo4j_memory/driver.py over it"
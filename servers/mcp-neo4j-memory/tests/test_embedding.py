@@ -0,0 +1,34 @@
+import math
+import pytest
+from mcp_neo4j_memory.embedding import HashingEmbedder, entity_text, load_embedder
+
+
+def cosine(a, b):
+    return sum(x * y for x, y in zip(a, b))
+
+
+def test_hashing_embedder_is_deterministic_and_normalized():
+    embedder = HashingEmbedder(64)
+    [first] = embedder.embed(["Alice drinks coffee"])
+    [second] = HashingEmbedder(64).embed(["Alice drinks coffee"])
+    assert first == second
+    assert len(first) == 64
+    assert math.isclose(sum(v * v for v in first), 1.0)
+    assert HashingEmbedder(64).embed([""]) == [[0.0] * 64]
+
+
+def test_related_texts_are_closer():
+    embedder = HashingEmbedder(256)
+    query, related, unrelated = embedder.embed([
+        "coffees brewed in Italy",
+        entity_text("Espresso", "Beverage", ["Italian coffee brewed under pressure"]),
+        entity_text("Kubernetes", "Software", ["Container orchestration"])
+    ])
+    assert cosine(query, related) > cosine(query, unrelated)
+
+
+def test_load_embedder():
+    assert load_embedder("hashing", 32).dimensions == 32
+    assert load_embedder("mcp_neo4j_memory.embedding:HashingEmbedder", 16).dimensions == 16
+    with pytest.raises(ValueError):
+        load_embedder("sentence-transformers")
@@ -0,0 +1,62 @@
+import json
+import pytest
+from mcp_neo4j_memory.encoding import ResultEncoder, from_columnar, to_columnar
+from mcp_neo4j_memory.server import Entity, KnowledgeGraph, Relation, ScoredEntity, SearchResult, _trusted, dump_result
+
+
+def sample_graph():
+    return KnowledgeGraph(
+        entities=[
+            Entity(name="Alice", type="Person", observations=["Likes tea", "Café owner"]),
+            Entity(name="Bob", type="Person", observations=[])
+        ],
+        relations=[
+            Relation(source="Alice", target="Bob", relationType="KNOWS"),
+            Relation(source="Bob", target="Carol", relationType="KNOWS")
+        ],
+        nextCursor="abc"
+    ).model_dump()
+
+
+@pytest.mark.parametrize("backend", ["auto", "json", "orjson", "msgspec"])
+@pytest.mark.parametrize("compact", [False, True])
+def test_encoders_round_trip(backend, compact):
+    if backend in ("orjson", "msgspec"):
+        pytest.importorskip(backend)
+    encoder = ResultEncoder(backend, compact)
+    text = encoder.encode(sample_graph())
+    assert json.loads(text) == sample_graph()
+    assert ("\n" in text) != compact
+
+
+def test_unknown_encoder():
+    with pytest.raises(ValueError):
+        ResultEncoder("yaml")
+
+
+def test_columnar_interns_names_and_types():
+    columnar = to_columnar(sample_graph())
+    assert columnar["names"] == ["Alice", "Bob", "Carol"]
+    assert columnar["types"] == ["Person"]
+    assert columnar["relationTypes"] == ["KNOWS"]
+    assert columnar["relations"]["source"] == [0, 1]
+    assert columnar["relations"]["target"] == [1, 2]
+    assert from_columnar(columnar) == sample_graph()
+
+
+def test_trusted_results_dump_like_validated_ones():
+    validated = SearchResult(
+        entities=[ScoredEntity(name="Alice", type="Person", observations=["Likes tea"], score=1.5)],
+        relations=[Relation(source="Alice", target="Bob", relationType="KNOWS")],
+        nextCursor="abc"
+    )
+    trusted = _trusted(
+        SearchResult,
+        entities=[_trusted(ScoredEntity, name="Alice", type="Person", observations=["Likes tea"], score=1.5)],
+        relations=[_trusted(Relation, source="Alice", target="Bob", relationType="KNOWS")],
+        nextCursor="abc",
+        truncated=None
+    )
+    assert trusted == validated
+    assert dump_result(trusted) == trusted.model_dump() == validated.model_dump()
+    assert trusted.entities[0].name == "Alice"
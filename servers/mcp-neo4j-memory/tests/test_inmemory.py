@@ -0,0 +1,152 @@
+import pytest
+from mcp_neo4j_memory.embedding import HashingEmbedder
+from mcp_neo4j_memory.inmemory import InMemoryGraphMemory
+from mcp_neo4j_memory.server import (
+    BudgetExceeded,
+    Entity,
+    ObservationAddition,
+    ObservationDeletion,
+    QueryBudget,
+    Relation,
+)
+
+
+async def populated(**kwargs):
+    memory = InMemoryGraphMemory(**kwargs)
+    await memory.create_entities([
+        Entity(name="Alice", type="Person", observations=["Likes coffee", "Works at Acme"]),
+        Entity(name="Bob", type="Person", observations=["Likes tea"]),
+        Entity(name="Acme", type="Company", observations=["Makes anvils"]),
+    ])
+    await memory.create_relations([
+        Relation(source="Alice", target="Acme", relationType="WORKS_AT"),
+        Relation(source="Alice", target="Bob", relationType="KNOWS"),
+    ])
+    return memory
+
+
+@pytest.mark.asyncio
+async def test_writes_and_reads():
+    memory = await populated()
+
+    graph = await memory.read_graph()
+    assert {e.name for e in graph.entities} == {"Alice", "Bob", "Acme"}
+    assert len(graph.relations) == 2
+
+    summary = await memory.write_relations([Relation(source="Alice", target="Nobody", relationType="KNOWS")])
+    assert [r.target for r in summary.dropped] == ["Nobody"]
+
+    summary = await memory.write_entities([Entity(name="Bob", type="Person", observations=["Likes tea"])])
+    assert (summary.created, summary.updated, summary.unchanged) == (0, 0, 1)
+
+    [added] = await memory.add_observations([ObservationAddition(entityName="Bob", contents=["Likes tea", "Plays chess"])])
+    assert added["addedObservations"] == ["Plays chess"]
+    [deleted] = await memory.delete_observations([ObservationDeletion(entityName="Bob", observations=["Likes tea", "Sings"])])
+    assert deleted["deletedObservations"] == ["Likes tea"]
+    [bob] = (await memory.find_nodes(["Bob"])).entities
+    assert bob.observations == ["Plays chess"]
+
+    assert await memory.delete_entities(["Acme"], dry_run=True) == {"entities": 1, "relationships": 1, "observations": 0}
+    reports = []
+    async def progress(done, total):
+        reports.append((done, total))
+    await memory.delete_entities(["Acme"], progress=progress)
+    assert reports == [(2, 2)]
+    graph = await memory.read_graph()
+    assert {e.name for e in graph.entities} == {"Alice", "Bob"}
+    assert [r.relationType for r in graph.relations] == ["KNOWS"]
+    assert not (await memory.search_nodes("anvils")).entities
+    assert not (await memory.search_nodes("anv*")).entities
+    assert [e.name for e in (await memory.search_nodes("pla*")).entities] == ["Bob"]
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_and_pages():
+    memory = await populated()
+
+    result = await memory.search_nodes("coffee")
+    assert [e.name for e in result.entities] == ["Alice"]
+    assert result.entities[0].score > 0
+
+    result = await memory.search_nodes("lik*", top_k=5)
+    assert {e.name for e in result.entities} == {"Alice", "Bob"}
+
+    first = await memory.read_graph(limit=2)
+    assert [e.name for e in first.entities] == ["Acme", "Alice"]
+    rest = await memory.read_graph(limit=2, cursor=first.nextCursor)
+    assert [e.name for e in rest.entities] == ["Bob"]
+    assert rest.nextCursor is None
+
+
+@pytest.mark.asyncio
+async def test_expand_and_budget():
+    memory = await populated()
+
+    graph = await memory.expand_nodes(["Acme"], max_depth=2)
+    assert {e.name for e in graph.entities} == {"Acme", "Alice", "Bob"}
+    graph = await memory.expand_nodes(["Acme"], max_depth=2, relation_types=["WORKS_AT"])
+    assert {e.name for e in graph.entities} == {"Acme", "Alice"}
+
+    limited = memory.limited(QueryBudget(max_nodes=1))
+    graph = await limited.read_graph()
+    assert graph.truncated == "nodes" and len(graph.entities) == 1
+    # Without a node cap the read is not ordered and cannot be continued
+    await memory.create_relations([Relation(source="Bob", target="Acme", relationType="VISITS")])
+    graph = await memory.limited(QueryBudget(max_relations=2)).read_graph()
+    assert graph.truncated == "relations" and graph.nextCursor is None
+    with pytest.raises(BudgetExceeded):
+        await memory.limited(QueryBudget(max_bytes=1)).read_graph()
+
+
+@pytest.mark.asyncio
+async def test_change_feed():
+    memory = await populated()
+    start = (await memory.read_changes_since(0)).version
+
+    await memory.add_observations([ObservationAddition(entityName="Bob", contents=["Plays chess"])])
+    await memory.delete_relations([Relation(source="Alice", target="Bob", relationType="KNOWS")])
+    changes = await memory.read_changes_since(start)
+    assert [e.name for e in changes.entities] == ["Bob"]
+    assert [t.kind for t in changes.tombstones] == ["relation"]
+    assert await memory.prune_tombstones(changes.version) == 1
+
+
+@pytest.mark.asyncio
+async def test_semantic_search():
+    memory = await populated(embedder=HashingEmbedder())
+
+    result = await memory.semantic_search("coffee drinker", top_k=1)
+    assert [e.name for e in result.entities] == ["Alice"]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "memory.json")
+    memory = await populated(snapshot_path=path, embedder=HashingEmbedder())
+    await memory.delete_entities(["Bob"])
+    await memory.close()
+
+    restored = InMemoryGraphMemory(snapshot_path=path, embedder=HashingEmbedder())
+    graph = await restored.read_graph()
+    assert {e.name for e in graph.entities} == {"Alice", "Acme"}
+    assert [r.relationType for r in graph.relations] == ["WORKS_AT"]
+    assert (await restored.search_nodes("anvils")).entities[0].name == "Acme"
+    changes = await restored.read_changes_since(1)
+    assert [t.name for t in changes.tombstones] == ["Bob"]
+    # Embeddings are restored too, so no backfill is needed
+    assert (await restored.semantic_search("coffee drinker", top_k=1)).entities[0].name == "Alice"
+
+
+@pytest.mark.asyncio
+async def test_type_filters():
+    memory = await populated()
+    await memory.write_entities([Entity(name="Bob", type="Robot", observations=["Likes tea"])])
+
+    graph = await memory.read_graph(entity_types=["Person"])
+    assert [e.name for e in graph.entities] == ["Alice"]
+    result = await memory.search_nodes("lik*", entity_types=["Robot"])
+    assert [e.name for e in result.entities] == ["Bob"]
+    graph = await memory.read_graph(relation_types=["KNOWS"])
+    assert [r.relationType for r in graph.relations] == ["KNOWS"]
+    graph = await memory.expand_nodes(["Alice"], max_depth=1, entity_types=["Company"])
+    assert {e.name for e in graph.entities} == {"Alice", "Acme"}
@@ -0,0 +1,234 @@
+import json
+import sqlite3
+import pytest
+from neo4j.exceptions import AuthError, ServiceUnavailable
+from mcp_neo4j_memory import server
+from mcp_neo4j_memory.inmemory import InMemoryGraphMemory
+from mcp_neo4j_memory.journal import JOURNALED_WRITES, WriteJournal
+from mcp_neo4j_memory.server import Entity, ObservationAddition, ObservationDeletion, QueryBudget, Relation
+
+
+class FlakyMemory:
+    """An in-memory backend whose writes are recorded and fail while ``down`` is set."""
+
+    def __init__(self):
+        self.memory = InMemoryGraphMemory()
+        self.down = False
+        self.failure = ServiceUnavailable("database unavailable")
+        self.calls = []
+
+    def __getattr__(self, name):
+        method = getattr(self.memory, name)
+        if name not in JOURNALED_WRITES:
+            return method
+
+        async def write(items, *args, **kwargs):
+            self.calls.append((name, len(items)))
+            if self.down:
+                raise self.failure
+            if any(getattr(item, "name", "").startswith("bad") for item in items):
+                raise ValueError("invalid entity")
+            return await method(items, *args, **kwargs)
+        return write
+
+
+class TenantMemory:
+    """One in-memory graph per namespace, switched by ``scoped`` like ``Neo4jMemory``."""
+
+    def __init__(self, tenants, namespace):
+        self.tenants = tenants
+        self.namespace = namespace
+        self.memory = tenants.setdefault(namespace, InMemoryGraphMemory())
+
+    def __getattr__(self, name):
+        return getattr(self.memory, name)
+
+    def scoped(self, namespace):
+        return TenantMemory(self.tenants, namespace)
+
+    def limited(self, budget, metadata=None):
+        view = TenantMemory(self.tenants, self.namespace)
+        view.memory = self.memory.limited(budget, metadata)
+        return view
+
+
+def journal_at(tmp_path, memory):
+    return WriteJournal(memory, str(tmp_path / "journal.db"), retry_delay=60)
+
+
+@pytest.mark.asyncio
+async def test_writes_are_acknowledged_while_the_database_is_down(tmp_path):
+    memory = FlakyMemory()
+    await memory.memory.create_entities([Entity(name="Bob", type="Person", observations=["Likes tea"])])
+    memory.down = True
+    journal = journal_at(tmp_path, memory)
+
+    summary = await journal.write_entities([Entity(name="Alice", type="Person", observations=["Likes coffee"])])
+    assert summary.journaled == 1 and summary.created == 0
+    [added] = await journal.add_observations([ObservationAddition(entityName="Bob", contents=["Plays chess", "Plays chess"])])
+    assert added == {"entityName": "Bob", "queuedObservations": ["Plays chess"], "journaled": 2}
+    await journal.write_relations([Relation(source="Alice", target="Bob", relationType="KNOWS")])
+    await journal.delete_observations([ObservationDeletion(entityName="Bob", observations=["Likes tea"])])
+
+    # Reads merge what has not reached the database yet
+    graph = await journal.read_graph()
+    assert {e.name: e.observations for e in graph.entities} == {"Alice": ["Likes coffee"], "Bob": ["Plays chess"]}
+    assert [r.relationType for r in graph.relations] == ["KNOWS"]
+    assert [e.name for e in (await journal.search_nodes("coffee")).entities] == ["Alice"]
+    assert [e.name for e in (await journal.find_nodes(["Alice"])).entities] == ["Alice"]
+
+    with pytest.raises(ServiceUnavailable):
+        await journal.flush()
+    assert journal.journal_stats()["pending"] == 4
+
+    memory.down = False
+    await journal.flush()
+    assert journal.journal_stats()["pending"] == 0
+    graph = await memory.memory.read_graph()
+    assert {e.name: e.observations for e in graph.entities} == {"Alice": ["Likes coffee"], "Bob": ["Plays chess"]}
+    assert [r.relationType for r in graph.relations] == ["KNOWS"]
+    await journal.close()
+
+
+@pytest.mark.asyncio
+async def test_consecutive_writes_replay_as_one_call_in_order(tmp_path):
+    memory = FlakyMemory()
+    memory.down = True
+    journal = journal_at(tmp_path, memory)
+
+    await journal.create_entities([Entity(name="a", type="Test", observations=[])])
+    await journal.create_entities([Entity(name="b", type="Test", observations=[])])
+    await journal.delete_entities(["a"])
+    await journal.create_entities([Entity(name="a", type="Test", observations=["again"])])
+    assert {e.name for e in (await journal.read_graph()).entities} == {"a", "b"}
+
+    memory.down = False
+    memory.calls.clear()
+    await journal.flush()
+    assert memory.calls == [("write_entities", 2), ("delete_entities", 1), ("write_entities", 1)]
+    [a] = (await memory.memory.find_nodes(["a"])).entities
+    assert a.observations == ["again"]
+    await journal.close()
+
+
+@pytest.mark.asyncio
+async def test_pending_writes_survive_a_restart(tmp_path):
+    memory = FlakyMemory()
+    memory.down = True
+    journal = journal_at(tmp_path, memory)
+    await journal.create_entities([Entity(name="Alice", type="Person", observations=[])])
+    await journal.delete_relations([Relation(source="Alice", target="Bob", relationType="KNOWS")])
+    await journal.close()
+
+    memory.down = False
+    restarted = journal_at(tmp_path, memory)
+    assert restarted.journal_stats()["pending"] == 2
+    await restarted.flush()
+    assert [e.name for e in (await memory.memory.read_graph()).entities] == ["Alice"]
+    summary = await restarted.write_entities([Entity(name="Carol", type="Person", observations=[])])
+    assert summary.journaled == 3
+    await restarted.close()
+
+
+@pytest.mark.asyncio
+async def test_rejected_writes_do_not_block_the_journal(tmp_path):
+    memory = FlakyMemory()
+    memory.down = True
+    journal = journal_at(tmp_path, memory)
+    await journal.create_entities([Entity(name="good", type="Test", observations=[])])
+    await journal.create_entities([Entity(name="bad", type="Test", observations=[])])
+    await journal.create_entities([Entity(name="fine", type="Test", observations=[])])
+
+    memory.down = False
+    await journal.flush()
+    assert {e.name for e in (await memory.memory.read_graph()).entities} == {"good", "fine"}
+    assert journal.journal_stats()["failed"] == 1
+    await journal.close()
+
+    with sqlite3.connect(str(tmp_path / "journal.db")) as connection:
+        assert connection.execute("SELECT op, error FROM failed").fetchall() == [("write_entities", "invalid entity")]
+
+
+@pytest.mark.asyncio
+async def test_unknown_entries_are_kept_in_the_failed_table(tmp_path):
+    memory = FlakyMemory()
+    memory.down = True
+    journal = journal_at(tmp_path, memory)
+    await journal.create_entities([Entity(name="Alice", type="Person", observations=[])])
+    await journal.close()
+
+    # Entries left by a version with an operation or item fields this one doesn't know
+    with sqlite3.connect(str(tmp_path / "journal.db")) as connection:
+        connection.execute("INSERT INTO journal (namespace, op, payload, created) VALUES (NULL, 'rename_entity', '[]', 0)")
+        connection.execute("INSERT INTO journal (namespace, op, payload, created) VALUES (NULL, 'write_relations', '[{\"from\": \"Alice\"}]', 0)")
+
+    memory.down = False
+    restarted = journal_at(tmp_path, memory)
+    assert restarted.journal_stats()["pending"] == 1
+    await restarted.flush()
+    assert [e.name for e in (await memory.memory.read_graph()).entities] == ["Alice"]
+    await restarted.close()
+
+    with sqlite3.connect(str(tmp_path / "journal.db")) as connection:
+        rows = connection.execute("SELECT op, error FROM failed ORDER BY seq").fetchall()
+    assert [op for op, _ in rows] == ["rename_entity", "write_relations"]
+    assert rows[0][1] == "unknown operation rename_entity"
+    assert rows[1][1].startswith("invalid payload")
+
+
+@pytest.mark.asyncio
+async def test_search_adds_local_entities_up_to_top_k(tmp_path):
+    memory = FlakyMemory()
+    await memory.memory.create_entities([Entity(name="Alice", type="Person", observations=["Likes coffee"])])
+    memory.down = True
+    journal = journal_at(tmp_path, memory)
+    await journal.create_entities([Entity(name="Cora", type="Person", observations=["Likes coffee"])])
+
+    assert [e.name for e in (await journal.search_nodes("coffee", top_k=1)).entities] == ["Alice"]
+    assert [e.name for e in (await journal.search_nodes("coffee", top_k=2)).entities] == ["Alice", "Cora"]
+    await journal.close()
+
+
+@pytest.mark.asyncio
+async def test_rejected_credentials_keep_the_entries(tmp_path):
+    memory = FlakyMemory()
+    memory.down = True
+    memory.failure = AuthError("The client is unauthorized due to authentication failure.")
+    journal = journal_at(tmp_path, memory)
+    await journal.create_entities([Entity(name="Alice", type="Person", observations=[])])
+    deleted = await journal.delete_relations([Relation(source="Alice", target="Bob", relationType="KNOWS")])
+    assert deleted == {"queuedRelations": 1, "journaled": 2}
+
+    with pytest.raises(AuthError):
+        await journal.flush()
+    assert journal.journal_stats()["pending"] == 2 and journal.journal_stats()["failed"] == 0
+
+    memory.down = False
+    await journal.flush()
+    assert [e.name for e in (await memory.memory.read_graph()).entities] == ["Alice"]
+    await journal.close()
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_with_budget_and_namespace(tmp_path, monkeypatch):
+    journal = journal_at(tmp_path, TenantMemory({}, "main"))
+    monkeypatch.setattr(server, "memory", journal)
+    monkeypatch.setattr(server, "default_budget", QueryBudget(timeout=5, max_nodes=10))
+
+    async def call(name, arguments):
+        [content] = await server.handle_call_tool(name, arguments)
+        assert not content.text.startswith("Error"), content.text
+        return json.loads(content.text)
+
+    # Both views are copies of the journal, made per call
+    await call("create_entities", {"entities": [{"name": "Alice", "type": "Person", "observations": []}]})
+    await call("create_entities", {"entities": [{"name": "Bob", "type": "Person", "observations": []}], "namespace": "other"})
+    assert [e["name"] for e in (await call("read_graph", {}))["entities"]] == ["Alice"]
+    assert [e["name"] for e in (await call("read_graph", {"namespace": "other"}))["entities"]] == ["Bob"]
+
+    deleted = await call("delete_relations", {"relations": [{"source": "Alice", "target": "Bob", "relationType": "KNOWS"}]})
+    assert deleted == {"queuedRelations": 1, "journaled": 3}
+
+    await journal.flush()
+    assert [e.name for e in (await journal.memory.scoped("other").read_graph()).entities] == ["Bob"]
+    await journal.close()
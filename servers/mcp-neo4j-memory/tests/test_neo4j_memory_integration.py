@@ -1,8 +1,17 @@
 import os
 import pytest
+import pytest_asyncio
 import asyncio
-from neo4j import GraphDatabase
-from mcp_neo4j_memory.server import Neo4jMemory, Entity, Relation, ObservationAddition, ObservationDeletion
+from concurrent.futures import ThreadPoolExecutor
+from neo4j import AsyncGraphDatabase, GraphDatabase
+from mcp_neo4j_memory.server import (
+    Neo4jMemory, Entity, Relation, ObservationAddition, ObservationDeletion, QueryBudget, BudgetExceeded,
+    encode_cursor, decode_cursor
+)
+from mcp_neo4j_memory.cache import GraphCache
+from mcp_neo4j_memory.embedding import HashingEmbedder
+from mcp_neo4j_memory.bulk import export_graph, import_graph
+from mcp_neo4j_memory.driver import PoolConfig, create_driver, pool_stats, warm_up
 
 @pytest.fixture(scope="function")
 def neo4j_driver():
@@ -23,13 +32,40 @@ def neo4j_driver():
     
     # Clean up test data after tests
     driver.execute_query("MATCH (n:Memory) DETACH DELETE n")
+    driver.execute_query("MATCH (n:MemoryTombstone) DELETE n")
     
     driver.close()
 
 @pytest.fixture(scope="function")
-def memory(neo4j_driver):
+def executor():
+    """Thread pool the sync-driver memories run their queries on."""
+    executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="neo4j-memory-test")
+    yield executor
+    executor.shutdown()
+
+@pytest.fixture(scope="function")
+def memory(neo4j_driver, executor):
     """Create a Neo4jMemory instance with the Neo4j driver."""
-    return Neo4jMemory(neo4j_driver)
+    return Neo4jMemory(neo4j_driver, executor=executor)
+
+@pytest.fixture(scope="function")
+def node_memory(neo4j_driver, executor):
+    """Create a Neo4jMemory instance that stores observations as nodes."""
+    yield Neo4jMemory(neo4j_driver, observation_storage="node", executor=executor)
+    neo4j_driver.execute_query("MATCH (o:Observation) DETACH DELETE o")
+
+@pytest_asyncio.fixture(scope="function")
+async def async_memory(neo4j_driver):
+    """Create a Neo4jMemory instance backed by the async Neo4j driver."""
+    uri = os.environ.get("NEO4J_URI", "neo4j://localhost:7687")
+    user = os.environ.get("NEO4J_USERNAME", "neo4j")
+    password = os.environ.get("NEO4J_PASSWORD", "password")
+
+    driver = AsyncGraphDatabase.driver(uri, auth=(user, password))
+    memory = Neo4jMemory(driver)
+    yield memory
+    await memory.close()
+    await driver.close()
 
 @pytest.mark.asyncio
 async def test_create_and_read_entities(memory):
@@ -125,7 +161,8 @@ async def test_delete_observations(memory):
         ObservationDeletion(entityName="Dave", observations=["Observation 2"])
     ]
     
-    await memory.delete_observations(observation_deletions)
+    result = await memory.delete_observations(observation_deletions)
+    assert result == [{"entityName": "Dave", "deletedObservations": ["Observation 2"]}]
     
     # Read the graph
     graph = await memory.read_graph()
@@ -224,4 +261,522 @@ async def test_find_nodes(memory):
     entity_names = [e.name for e in result.entities]
     assert "Kevin" in entity_names
     assert "Laura" in entity_names
-    assert "Mike" not in entity_names 
\ No newline at end of file
+    assert "Mike" not in entity_names 
+
+@pytest.mark.asyncio
+async def test_async_driver_concurrent_calls(async_memory):
+    assert async_memory.is_async
+
+    await async_memory.create_entities([
+        Entity(name=f"Node{i}", type="Person", observations=[f"Observation {i}"])
+        for i in range(10)
+    ])
+
+    # Concurrent reads share the event loop instead of blocking it
+    results = await asyncio.gather(*[async_memory.find_nodes([f"Node{i}"]) for i in range(10)])
+
+    for i, graph in enumerate(results):
+        assert f"Node{i}" in [e.name for e in graph.entities]
+
+@pytest.mark.asyncio
+async def test_sync_driver_runs_on_thread_pool(memory):
+    assert not memory.is_async
+
+    await memory.create_entities([Entity(name="Olivia", type="Person", observations=[])])
+    graphs = await asyncio.gather(memory.read_graph(), memory.read_graph())
+
+    for graph in graphs:
+        assert "Olivia" in [e.name for e in graph.entities]
+
+@pytest.mark.asyncio
+async def test_read_graph_pagination(memory):
+    await memory.create_entities([
+        Entity(name=f"Page{i:02d}", type="Person", observations=[]) for i in range(5)
+    ])
+    await memory.create_relations([Relation(source="Page00", target="Page04", relationType="KNOWS")])
+
+    names = []
+    cursor = None
+    pages = 0
+    while True:
+        graph = await memory.read_graph(limit=2, cursor=cursor)
+        assert len(graph.entities) <= 2
+        names.extend(e.name for e in graph.entities)
+        pages += 1
+        cursor = graph.nextCursor
+        if cursor is None:
+            break
+
+    assert names == [f"Page{i:02d}" for i in range(5)]
+    assert pages == 3
+
+    # The relation is returned with each page holding one of its endpoints
+    first_page = await memory.read_graph(limit=2)
+    assert [(r.source, r.target) for r in first_page.relations] == [("Page00", "Page04")]
+
+@pytest.mark.asyncio
+async def test_search_nodes_pagination(memory):
+    await memory.create_entities([
+        Entity(name=f"Tea{i}", type="Beverage", observations=["Likes tea"]) for i in range(3)
+    ])
+
+    first = await memory.search_nodes("tea", limit=2)
+    assert len(first.entities) == 2
+    assert first.nextCursor is not None
+
+    second = await memory.search_nodes("tea", limit=2, cursor=first.nextCursor)
+    assert [e.name for e in second.entities] == ["Tea2"]
+    assert second.nextCursor is None
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor("Alice Smith")) == "Alice Smith"
+
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+@pytest.mark.asyncio
+async def test_write_relations_reports_counts(memory):
+    await memory.create_entities([
+        Entity(name="Paul", type="Person", observations=[]),
+        Entity(name="Quinn", type="Person", observations=[]),
+        Entity(name="Rita", type="Person", observations=[])
+    ])
+    await memory.create_relations([Relation(source="Paul", target="Quinn", relationType="KNOWS")])
+
+    summary = await memory.write_relations([
+        Relation(source="Paul", target="Quinn", relationType="KNOWS"),
+        Relation(source="Paul", target="Rita", relationType="KNOWS"),
+        Relation(source="Quinn", target="Rita", relationType="WORKS_WITH"),
+        Relation(source="Paul", target="Nobody", relationType="KNOWS")
+    ], chunk_size=1)
+
+    assert summary.created == 2
+    assert summary.matched == 1
+    assert [(r.source, r.target) for r in summary.dropped] == [("Paul", "Nobody")]
+    assert len(summary.relations) == 3
+
+    graph = await memory.read_graph()
+    assert len(graph.relations) == 3
+
+@pytest.mark.asyncio
+async def test_find_nodes_exact_match(memory):
+    await memory.create_entities([
+        Entity(name="Ann Lee", type="Person", observations=[]),
+        Entity(name="Ann Smith", type="Person", observations=[]),
+        Entity(name="Lee", type="Person", observations=[])
+    ])
+
+    # Multi-word names are matched as a whole instead of as OR'd terms
+    result = await memory.find_nodes(["Ann Lee", "Ann Lee"])
+    assert [e.name for e in result.entities] == ["Ann Lee"]
+
+@pytest.mark.asyncio
+async def test_name_uniqueness_constraint(memory, neo4j_driver):
+    await memory.create_entities([Entity(name="Sam", type="Person", observations=[])])
+
+    records, _, _ = neo4j_driver.execute_query("SHOW CONSTRAINTS YIELD name WHERE name = 'memory_name' RETURN name")
+    assert len(records) == 1
+
+@pytest.mark.asyncio
+async def test_cached_reads_invalidated_by_writes(neo4j_driver, executor):
+    memory = Neo4jMemory(neo4j_driver, cache=GraphCache(), executor=executor)
+    await memory.create_entities([Entity(name="Tom", type="Person", observations=["Plays chess"])])
+
+    first = await memory.find_nodes(["Tom"])
+    second = await memory.find_nodes(["Tom"])
+    assert second is first
+    assert memory.cache_stats()["hits"] == 1
+
+    await memory.add_observations([ObservationAddition(entityName="Tom", contents=["Plays go"])])
+    updated = await memory.find_nodes(["Tom"])
+    assert "Plays go" in updated.entities[0].observations
+
+    # A name that was missing is invalidated when it gets created
+    assert (await memory.find_nodes(["Uma"])).entities == []
+    await memory.create_entities([Entity(name="Uma", type="Person", observations=[])])
+    assert [e.name for e in (await memory.find_nodes(["Uma"])).entities] == ["Uma"]
+
+@pytest.mark.asyncio
+async def test_export_and_import_round_trip(memory, neo4j_driver, tmp_path):
+    await memory.create_entities([
+        Entity(name="Vera", type="Person", observations=["Writes poems"]),
+        Entity(name="Walt", type="Person", observations=[])
+    ])
+    await memory.create_relations([Relation(source="Vera", target="Walt", relationType="KNOWS")])
+
+    path = str(tmp_path / "memory.jsonl")
+    assert await export_graph(memory, path) == {"entities": 2, "relations": 1}
+
+    neo4j_driver.execute_query("MATCH (n:Memory) DETACH DELETE n")
+    result = await import_graph(memory, path, chunk_size=1)
+    assert result == {"entities": 2, "relations": 1, "dropped": 0}
+
+    graph = await memory.read_graph()
+    assert sorted(e.name for e in graph.entities) == ["Vera", "Walt"]
+    assert [(r.source, r.target) for r in graph.relations] == [("Vera", "Walt")]
+
+@pytest.mark.asyncio
+async def test_observation_nodes(node_memory, neo4j_driver):
+    await node_memory.create_entities([
+        Entity(name="Xena", type="Person", observations=["Rides horses", "Rides horses"])
+    ])
+
+    result = await node_memory.add_observations([
+        ObservationAddition(entityName="Xena", contents=["Rides horses", "Speaks Greek"])
+    ])
+    assert result == [{"entityName": "Xena", "addedObservations": ["Speaks Greek"]}]
+
+    graph = await node_memory.find_nodes(["Xena"])
+    assert graph.entities[0].observations == ["Rides horses", "Speaks Greek"]
+
+    # Observation text is searchable through its own index
+    assert [e.name for e in (await node_memory.search_nodes("greek")).entities] == ["Xena"]
+
+    await node_memory.delete_observations([ObservationDeletion(entityName="Xena", observations=["Rides horses"])])
+    assert (await node_memory.find_nodes(["Xena"])).entities[0].observations == ["Speaks Greek"]
+
+    await node_memory.delete_entities(["Xena"])
+    records, _, _ = neo4j_driver.execute_query("MATCH (o:Observation) RETURN count(o) AS count")
+    assert records[0]["count"] == 0
+
+@pytest.mark.asyncio
+async def test_migrate_observations(memory, neo4j_driver, executor):
+    await memory.create_entities([
+        Entity(name="Yuri", type="Person", observations=["Flies planes", "Likes tea"]),
+        Entity(name="Zoe", type="Person", observations=[])
+    ])
+
+    node_memory = Neo4jMemory(neo4j_driver, observation_storage="node", executor=executor)
+    assert await node_memory.migrate_observations(batch_size=1) == 2
+
+    graph = await node_memory.find_nodes(["Yuri"])
+    assert graph.entities[0].observations == ["Flies planes", "Likes tea"]
+    records, _, _ = neo4j_driver.execute_query("MATCH (e:Memory) WHERE e.observations IS NOT NULL RETURN count(e) AS count")
+    assert records[0]["count"] == 0
+    neo4j_driver.execute_query("MATCH (o:Observation) DETACH DELETE o")
+
+@pytest.mark.asyncio
+async def test_search_nodes_top_k(memory):
+    await memory.create_entities([
+        Entity(name="Espresso", type="Beverage", observations=["Strong coffee", "Coffee from Italy", "Coffee shot"]),
+        Entity(name="Latte", type="Beverage", observations=["Coffee with milk"]),
+        Entity(name="Green Tea", type="Beverage", observations=["Tea from Japan"])
+    ])
+
+    result = await memory.search_nodes("coffee", top_k=1)
+    assert [e.name for e in result.entities] == ["Espresso"]
+    assert result.entities[0].score > 0
+
+    everything = await memory.search_nodes("coffee")
+    scores = {e.name: e.score for e in everything.entities}
+    assert set(scores) == {"Espresso", "Latte"}
+
+    # A threshold between the two scores keeps only the stronger match
+    threshold = (scores["Espresso"] + scores["Latte"]) / 2
+    filtered = await memory.search_nodes("coffee", min_score=threshold)
+    assert [e.name for e in filtered.entities] == ["Espresso"]
+
+    with pytest.raises(ValueError):
+        await memory.search_nodes("coffee", top_k=1, cursor=encode_cursor("Espresso"))
+
+@pytest.mark.asyncio
+async def test_expand_nodes(memory):
+    await memory.create_entities([
+        Entity(name=f"Hop{i}", type="Place", observations=[]) for i in range(4)
+    ] + [
+        Entity(name=f"Leaf{i}", type="Place", observations=[]) for i in range(5)
+    ])
+    await memory.create_relations([
+        Relation(source="Hop0", target="Hop1", relationType="ROAD"),
+        Relation(source="Hop1", target="Hop2", relationType="ROAD"),
+        Relation(source="Hop2", target="Hop3", relationType="ROAD"),
+        Relation(source="Hop0", target="Hop2", relationType="RAIL")
+    ] + [
+        Relation(source="Hop1", target=f"Leaf{i}", relationType="PATH") for i in range(5)
+    ])
+
+    two_hops = await memory.expand_nodes(["Hop0"], max_depth=2, relation_types=["ROAD"])
+    assert sorted(e.name for e in two_hops.entities) == ["Hop0", "Hop1", "Hop2"]
+    assert sorted((r.source, r.target) for r in two_hops.relations) == [("Hop0", "Hop1"), ("Hop1", "Hop2")]
+
+    # The fan-out cap bounds how many leaves the second hop follows
+    capped = await memory.expand_nodes(["Hop0"], max_depth=2, fan_out=[1, 2], relation_types=["ROAD", "PATH"])
+    assert len(capped.entities) <= 4
+
+    budget = await memory.expand_nodes(["Hop0"], max_depth=3, max_nodes=3)
+    assert len(budget.entities) == 3
+    assert "Hop0" in [e.name for e in budget.entities]
+
+    with pytest.raises(ValueError):
+        await memory.expand_nodes(["Hop0"], max_depth=2, fan_out=[1])
+
+@pytest.mark.asyncio
+async def test_delete_hub_in_chunks(memory):
+    await memory.create_entities(
+        [Entity(name="Hub", type="Hub", observations=["Center"])]
+        + [Entity(name=f"Spoke{i}", type="Spoke", observations=[]) for i in range(25)]
+    )
+    await memory.create_relations([Relation(source="Hub", target=f"Spoke{i}", relationType="LINKS") for i in range(25)])
+
+    planned = await memory.delete_entities(["Hub", "Nobody"], dry_run=True)
+    assert planned == {"entities": 1, "relationships": 25, "observations": 0}
+    assert [e.name for e in (await memory.find_nodes(["Hub"])).entities] == ["Hub"]
+
+    reports = []
+    async def progress(done, total):
+        reports.append((done, total))
+
+    deleted = await memory.delete_entities(["Hub"], chunk_size=10, progress=progress)
+    assert deleted == planned
+    assert [done for done, _ in reports] == [10, 20, 25, 26]
+    assert not (await memory.find_nodes(["Hub"])).entities
+    assert len((await memory.find_nodes(["Spoke0", "Spoke24"])).entities) == 2
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [1, 100])
+async def test_delete_progress_reaches_total(node_memory, chunk_size):
+    await node_memory.create_entities([
+        Entity(name="Ada", type="Person", observations=["Counts"]),
+        Entity(name="Bea", type="Person", observations=["Reads", "Writes"]),
+        Entity(name="Cyd", type="Person", observations=[])
+    ])
+    await node_memory.create_relations([
+        Relation(source="Ada", target="Bea", relationType="KNOWS"),
+        Relation(source="Bea", target="Cyd", relationType="KNOWS"),
+        Relation(source="Ada", target="Cyd", relationType="KNOWS")
+    ])
+
+    reports = []
+    async def progress(done, total):
+        reports.append((done, total))
+
+    # The relation between the two deleted entities is counted once, observation links not at all
+    deleted = await node_memory.delete_entities(["Ada", "Bea"], chunk_size=chunk_size, progress=progress)
+    assert deleted == {"entities": 2, "relationships": 3, "observations": 3}
+    assert reports[-1] == (5, 5)
+    assert [done for done, _ in reports] == sorted(done for done, _ in reports)
+
+@pytest.mark.asyncio
+async def test_large_observation_lists(memory):
+    contents = [f"Fact {i}" for i in range(2000)]
+    await memory.create_entities([Entity(name="Archive", type="Store", observations=contents)])
+
+    [added] = await memory.add_observations([
+        ObservationAddition(entityName="Archive", contents=["Fact 5", "Fact new", "Fact new", "Fact 1999", "Fact newer"])
+    ])
+    assert added["addedObservations"] == ["Fact new", "Fact newer"]
+
+    [deleted] = await memory.delete_observations([
+        ObservationDeletion(entityName="Archive", observations=["Fact 0", "Fact 1500", "Fact missing"])
+    ])
+    assert deleted["deletedObservations"] == ["Fact 0", "Fact 1500"]
+
+    [archive] = (await memory.find_nodes(["Archive"])).entities
+    assert archive.observations == [c for c in contents if c not in ("Fact 0", "Fact 1500")] + ["Fact new", "Fact newer"]
+
+@pytest.mark.asyncio
+async def test_type_filters(memory):
+    await memory.create_entities([
+        Entity(name="Ada", type="Person", observations=["Writes programs"]),
+        Entity(name="Analytical Engine", type="Machine", observations=["Runs programs"]),
+        Entity(name="Babbage", type="Person", observations=["Designs machines"])
+    ])
+    await memory.create_relations([
+        Relation(source="Ada", target="Analytical Engine", relationType="PROGRAMS"),
+        Relation(source="Ada", target="Babbage", relationType="KNOWS")
+    ])
+
+    people = await memory.read_graph(entity_types=["Person"])
+    assert sorted(e.name for e in people.entities) == ["Ada", "Babbage"]
+
+    result = await memory.search_nodes("programs", entity_types=["Machine"], top_k=5)
+    assert [e.name for e in result.entities] == ["Analytical Engine"]
+
+    known = await memory.search_nodes("Ada", relation_types=["KNOWS"])
+    assert [r.relationType for r in known.relations] == ["KNOWS"]
+
+    reached = await memory.expand_nodes(["Ada"], max_depth=1, entity_types=["Machine"])
+    assert sorted(e.name for e in reached.entities) == ["Ada", "Analytical Engine"]
+
+    # Changing the type moves the entity to its new label
+    await memory.create_entities([Entity(name="Babbage", type="Inventor", observations=["Designs machines"])])
+    people = await memory.read_graph(entity_types=["Person"])
+    assert [e.name for e in people.entities] == ["Ada"]
+
+@pytest.mark.asyncio
+async def test_read_changes_since(neo4j_driver, executor):
+    # Without the lag only this test's own writes are reported
+    memory = Neo4jMemory(neo4j_driver, executor=executor, change_lag_ms=0)
+    await memory.create_entities([
+        Entity(name="Ann", type="Person", observations=["Reads"]),
+        Entity(name="Ben", type="Person", observations=[]),
+        Entity(name="Cal", type="Person", observations=[])
+    ])
+    full = await memory.read_changes_since(0)
+    assert {"Ann", "Ben", "Cal"} <= {e.name for e in full.entities}
+    since = full.version
+
+    await memory.add_observations([ObservationAddition(entityName="Ann", contents=["Writes"])])
+    await memory.create_relations([Relation(source="Ann", target="Ben", relationType="KNOWS")])
+    await memory.delete_entities(["Cal"])
+
+    changes = await memory.read_changes_since(since)
+    assert changes.version > since
+    assert [e.name for e in changes.entities] == ["Ann"]
+    assert changes.entities[0].observations == ["Reads", "Writes"]
+    assert [(r.source, r.target, r.relationType) for r in changes.relations] == [("Ann", "Ben", "KNOWS")]
+    assert [(t.kind, t.name) for t in changes.tombstones] == [("entity", "Cal")]
+
+    await memory.delete_relations([Relation(source="Ann", target="Ben", relationType="KNOWS")])
+    latest = await memory.read_changes_since(changes.version)
+    assert latest.entities == [] and latest.relations == []
+    assert [(t.kind, t.source, t.target) for t in latest.tombstones] == [("relation", "Ann", "Ben")]
+
+    assert await memory.prune_tombstones(latest.version) >= 2
+    assert (await memory.read_changes_since(since)).tombstones == []
+
+@pytest.mark.asyncio
+async def test_semantic_search(neo4j_driver):
+    memory = Neo4jMemory(neo4j_driver, embedder=HashingEmbedder(128))
+    await memory.create_entities([
+        Entity(name="Espresso", type="Beverage", observations=["Italian coffee brewed under pressure"]),
+        Entity(name="Kubernetes", type="Software", observations=["Container orchestration"])
+    ])
+    await memory.add_observations([ObservationAddition(entityName="Kubernetes", contents=["Schedules pods"])])
+
+    result = await memory.semantic_search("coffees from Italy", top_k=1)
+    assert [e.name for e in result.entities] == ["Espresso"]
+    assert 0 < result.entities[0].score <= 1
+
+    fused = await memory.semantic_search("pods (scheduling)?", top_k=2, fuse=True)
+    assert fused.entities[0].name == "Kubernetes"
+    assert fused.entities[0].score >= fused.entities[-1].score
+
+    # Entities written before the embedder was enabled are embedded by the backfill
+    neo4j_driver.execute_query("MATCH (m:Memory) REMOVE m.embedding")
+    assert await memory.backfill_embeddings(batch_size=1) >= 2
+    await memory.close()
+
+@pytest.mark.asyncio
+async def test_write_entities_skips_unchanged(memory):
+    first = await memory.write_entities([
+        Entity(name="Dora", type="Person", observations=["Explorer"]),
+        Entity(name="Eli", type="Person", observations=[])
+    ])
+    assert (first.created, first.updated, first.unchanged) == (2, 0, 0)
+    version = (await memory.read_changes_since(0)).version
+
+    again = await memory.write_entities([
+        Entity(name="Dora", type="Person", observations=["Explorer"]),
+        Entity(name="Eli", type="Person", observations=["Sailor"])
+    ])
+    assert (again.created, again.updated, again.unchanged) == (0, 1, 1)
+    changes = await memory.read_changes_since(version)
+    assert [e.name for e in changes.entities] == ["Eli"]
+
+    # An in-place observation change clears the hash, so re-asserting the old content is written again
+    await memory.add_observations([ObservationAddition(entityName="Dora", contents=["Map reader"])])
+    reset = await memory.write_entities([Entity(name="Dora", type="Person", observations=["Explorer"])])
+    assert reset.updated == 1
+    graph = await memory.find_nodes(["Dora"])
+    assert graph.entities[0].observations == ["Explorer"]
+
+@pytest.mark.asyncio
+async def test_namespaces_are_isolated(neo4j_driver):
+    # Tenants reuse entity names, so the namespaced schema replaces the name-only constraint
+    neo4j_driver.execute_query("CREATE CONSTRAINT memory_name IF NOT EXISTS FOR (m:Memory) REQUIRE m.name IS UNIQUE")
+    memory = Neo4jMemory(neo4j_driver, namespace="team_a")
+    team_b = memory.scoped("team_b")
+
+    await memory.create_entities([Entity(name="Roadmap", type="Document", observations=["Ship search"])])
+    await team_b.create_entities([
+        Entity(name="Roadmap", type="Document", observations=["Ship billing"]),
+        Entity(name="Budget", type="Document", observations=[])
+    ])
+    await team_b.create_relations([Relation(source="Roadmap", target="Budget", relationType="DEPENDS_ON")])
+
+    graph = await memory.read_graph()
+    assert [(e.name, e.observations) for e in graph.entities] == [("Roadmap", ["Ship search"])]
+    assert graph.relations == []
+    assert [e.name for e in (await memory.search_nodes("billing")).entities] == []
+    assert [e.name for e in (await team_b.search_nodes("billing")).entities] == ["Roadmap"]
+
+    await team_b.delete_entities(["Roadmap"])
+    assert [e.name for e in (await memory.find_nodes(["Roadmap"])).entities] == ["Roadmap"]
+    assert [t.name for t in (await memory.read_changes_since(1)).tombstones] == []
+
+    with pytest.raises(ValueError):
+        memory.scoped("Team B")
+    await memory.close()
+
+@pytest.mark.asyncio
+async def test_namespaces_with_observation_nodes(neo4j_driver, executor):
+    neo4j_driver.execute_query("DROP CONSTRAINT memory_name IF EXISTS")
+    memory = Neo4jMemory(neo4j_driver, namespace="team_a", observation_storage="node", executor=executor)
+    team_b = memory.scoped("team_b")
+
+    await memory.create_entities([Entity(name="Roadmap", type="Document", observations=["Ship search"])])
+    await team_b.create_entities([Entity(name="Roadmap", type="Document", observations=["Ship billing"])])
+
+    # Observation text is found through its own index, but only for the tenant's entities
+    assert [e.name for e in (await memory.search_nodes("search")).entities] == ["Roadmap"]
+    assert [e.name for e in (await memory.search_nodes("billing")).entities] == []
+    [roadmap] = (await team_b.search_nodes("billing")).entities
+    assert roadmap.observations == ["Ship billing"]
+    neo4j_driver.execute_query("MATCH (o:Observation) DETACH DELETE o")
+
+@pytest.mark.asyncio
+async def test_budget_truncates_with_continuation(memory):
+    await memory.create_entities([
+        Entity(name=f"Budget{i}", type="Item", observations=["x" * 100]) for i in range(5)
+    ])
+    await memory.create_relations([
+        Relation(source=f"Budget{i}", target=f"Budget{(i + 1) % 5}", relationType="NEXT") for i in range(5)
+    ])
+
+    limited = memory.limited(QueryBudget(max_nodes=2), {"tool": "read_graph"})
+    first = await limited.read_graph()
+    assert [e.name for e in first.entities] == ["Budget0", "Budget1"]
+    assert first.truncated == "nodes" and first.nextCursor
+
+    second = await limited.read_graph(cursor=first.nextCursor)
+    assert [e.name for e in second.entities] == ["Budget2", "Budget3"]
+
+    by_relations = await memory.limited(QueryBudget(max_relations=2)).read_graph()
+    assert by_relations.truncated == "relations"
+    assert len(by_relations.relations) <= 2
+
+    with pytest.raises(BudgetExceeded) as exceeded:
+        await memory.limited(QueryBudget(max_bytes=10)).find_nodes(["Budget0"])
+    assert exceeded.value.to_dict()["error"]["reason"] == "bytes"
+
+    # The unlimited memory is unaffected by the views
+    assert len((await memory.read_graph()).entities) == 5
+
+@pytest.mark.asyncio
+async def test_reads_are_routed_for_reading(memory):
+    await memory.create_entities([Entity(name="Routed", type="Item", observations=["routed read"])])
+    writes = memory.routing_stats()["queries"]["write"]
+
+    # Reads see the write before them through the driver's bookmarks
+    [entity] = (await memory.find_nodes(["Routed"])).entities
+    assert entity.observations == ["routed read"]
+    await memory.read_changes_since(0)
+
+    stats = memory.routing_stats()
+    assert stats["queries"]["read"] >= 3
+    assert stats["queries"]["write"] == writes
+    assert sum(counts["read"] for counts in stats["servers"].values()) == stats["queries"]["read"]
+
+@pytest.mark.asyncio
+async def test_warm_up_opens_pooled_connections(neo4j_driver):
+    uri = os.environ.get("NEO4J_URI", "neo4j://localhost:7687")
+    auth = (os.environ.get("NEO4J_USERNAME", "neo4j"), os.environ.get("NEO4J_PASSWORD", "password"))
+    driver = create_driver(uri, auth, PoolConfig(max_connection_pool_size=10))
+    try:
+        await warm_up(driver, 4)
+        stats = pool_stats(driver)
+        assert sum(server["idle"] for server in stats["servers"].values()) >= 4
+        assert stats["maxConnectionPoolSize"] == 10
+    finally:
+        await driver.close()
@@ -44,30 +44,15 @@ def run_memory_service():
     
     sys.path.insert(0, os.path.join(os.getcwd(), 'servers/mcp-neo4j-memory/src'))
     
+    # Get Neo4j connection details from environment variables
+    neo4j_uri = os.environ.get('NEO4J_URI')
+    neo4j_user = os.environ.get('NEO4J_USER')
+    neo4j_password = os.environ.get('NEO4J_PASSWORD')
+
     try:
-        from mcp_neo4j_memory.server import main, app, memory, Neo4jMemory
-        from neo4j import GraphDatabase
-        
-        # Get Neo4j connection details from environment variables
-        neo4j_uri = os.environ.get('NEO4J_URI')
-        neo4j_user = os.environ.get('NEO4J_USER')
-        neo4j_password = os.environ.get('NEO4J_PASSWORD')
-        
+        # The driver is created in each Gunicorn worker, drivers don't survive a fork
         logger.info(f"Memory service connecting to Neo4j at {neo4j_uri}")
         
-        # Connect to Neo4j
-        neo4j_driver = GraphDatabase.driver(
-            neo4j_uri,
-            auth=(neo4j_user, neo4j_password)
-        )
-        
-        # Verify connection
-        neo4j_driver.verify_connectivity()
-        logger.info(f"Memory service connected to Neo4j at {neo4j_uri}")
-        
-        # Initialize memory
-        globals()['memory'] = Neo4jMemory(neo4j_driver)
-        
         # Run the Flask app with Gunicorn
         logger.info(f"Starting Memory Flask web server with Gunicorn on port {memory_port}")
         
@@ -82,7 +67,10 @@ import os
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.join(current_dir, 'servers/mcp-neo4j-memory/src'))
 
-from mcp_neo4j_memory.server import app as application
+from mcp_neo4j_memory.server import app as application, init_flask_memory
+
+# One driver per worker, with the pool settings of the NEO4J_* environment variables
+init_flask_memory(os.environ['NEO4J_URI'], os.environ['NEO4J_USER'], os.environ['NEO4J_PASSWORD'])
 """)
         
         # Start Gunicorn
@@ -93,7 +81,8 @@ from mcp_neo4j_memory.server import app as application
             "--timeout", "120",
             "memory_wsgi:application"
         ]
-        subprocess.run(cmd)
+        if subprocess.run(cmd).returncode != 0:
+            raise RuntimeError("Gunicorn exited with an error, see the worker logs")
         
     except Exception as e:
         logger.error(f"Error running memory service: {e}")
@@ -123,20 +112,15 @@ def run_cypher_service():
     
     sys.path.insert(0, os.path.join(os.getcwd(), 'servers/mcp-neo4j-cypher/src'))
     
+    # Get Neo4j connection details from environment variables
+    neo4j_uri = os.environ.get('NEO4J_URI')
+    neo4j_username = os.environ.get('NEO4J_USER')
+    neo4j_password = os.environ.get('NEO4J_PASSWORD')
+
     try:
-        from mcp_neo4j_cypher.server import main, app, db, neo4jDatabase
-        
-        # Get Neo4j connection details from environment variables
-        neo4j_uri = os.environ.get('NEO4J_URI')
-        neo4j_username = os.environ.get('NEO4J_USER')
-        neo4j_password = os.environ.get('NEO4J_PASSWORD')
-        
+        # The driver is created in each Gunicorn worker, drivers don't survive a fork
         logger.info(f"Cypher service connecting to Neo4j at {neo4j_uri}")
         
-        # Connect to Neo4j
-        globals()['db'] = neo4jDatabase(neo4j_uri, neo4j_username, neo4j_password)
-        logger.info(f"Cypher service connected to Neo4j at {neo4j_uri}")
-        
         # Run the Flask app with Gunicorn
         logger.info(f"Starting Cypher Flask web server with Gunicorn on port {cypher_port}")
         
@@ -151,7 +135,11 @@ import os
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.join(current_dir, 'servers/mcp-neo4j-cypher/src'))
 
+from mcp_neo4j_cypher import server
 from mcp_neo4j_cypher.server import app as application
+
+# One driver per worker, with the pool settings of the NEO4J_* environment variables
+server.db = server.neo4jDatabase(os.environ['NEO4J_URI'], os.environ['NEO4J_USER'], os.environ['NEO4J_PASSWORD'])
 """)
         
         # Start Gunicorn
@@ -162,7 +150,8 @@ from mcp_neo4j_cypher.server import app as application
             "--timeout", "120",
             "cypher_wsgi:application"
         ]
-        subprocess.run(cmd)
+        if subprocess.run(cmd).returncode != 0:
+            raise RuntimeError("Gunicorn exited with an error, see the worker logs")
         
     except Exception as e:
         logger.error(f"Error running cypher service: {e}")
@@ -9,7 +9,8 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.join(current_dir, 'servers/mcp-neo4j-memory/src'))
 
 # Import the server module
-from mcp_neo4j_memory.server import main, app
+from mcp_neo4j_memory.server import main, app, init_flask_memory
+from mcp_neo4j_memory.driver import PoolConfig
 
 # Configure logging
 logging.basicConfig(
@@ -30,24 +31,11 @@ is_railway = 'PORT' in os.environ
 
 if __name__ == "__main__":
     try:
+        # Connection pool settings come from the NEO4J_* environment variables
+        pool = PoolConfig.from_env()
         if is_railway:
-            # Initialize the memory instance
-            from mcp_neo4j_memory.server import memory, Neo4jMemory
-            from neo4j import GraphDatabase
-            
-            # Connect to Neo4j
-            neo4j_driver = GraphDatabase.driver(
-                neo4j_uri,
-                auth=(neo4j_user, neo4j_password)
-            )
-            
-            # Verify connection
-            neo4j_driver.verify_connectivity()
-            logger.info(f"Connected to Neo4j at {neo4j_uri}")
-            
-            # Initialize memory
-            from mcp_neo4j_memory.server import memory
-            globals()['memory'] = Neo4jMemory(neo4j_driver)
+            # Connect to Neo4j and initialize the memory instance the Flask app uses
+            init_flask_memory(neo4j_uri, neo4j_user, neo4j_password, pool)
             
             # Run the Flask app
             port = int(os.environ.get('PORT', 5000))
@@ -55,7 +43,7 @@ if __name__ == "__main__":
             app.run(host='0.0.0.0', port=port)
         else:
             # Run the MCP server over stdio
-            asyncio.run(main(neo4j_uri, neo4j_user, neo4j_password))
+            asyncio.run(main(neo4j_uri, neo4j_user, neo4j_password, pool=pool))
     except KeyboardInterrupt:
         logger.info("Server interrupted, shutting down...")
     except Exception as e: